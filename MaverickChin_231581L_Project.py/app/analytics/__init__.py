@@ -0,0 +1,15 @@
+from app.analytics.utilisation import (
+    UtilisationReport,
+    compute_utilisation,
+    compute_utilisation_from_rows,
+    datetime_range_for_days,
+    load_utilisation,
+)
+
+__all__ = [
+    "UtilisationReport",
+    "compute_utilisation",
+    "compute_utilisation_from_rows",
+    "datetime_range_for_days",
+    "load_utilisation",
+]
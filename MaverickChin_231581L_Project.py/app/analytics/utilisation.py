@@ -0,0 +1,198 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from itertools import chain
+
+import numpy as np
+from app.lookups.enums import AppointmentStatusEnum
+from app.repositories import AppointmentRepository
+from sqlalchemy.orm import Session
+
+# Statuses whose slot counts as booked: a missed appointment still held the time
+BOOKED_STATUSES = (
+    AppointmentStatusEnum.SCHEDULED,
+    AppointmentStatusEnum.COMPLETED,
+    AppointmentStatusEnum.MISSED,
+)
+WORKING_HOURS = (time(9), time(17))
+WORKING_WEEKDAYS = (0, 1, 2, 3, 4)  # Monday to Friday
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+@dataclass(frozen=True)
+class UtilisationReport:
+    """
+    Booked time of every doctor with at least one booking in [first_day, last_day].
+
+    Arrays are indexed by doctor (in doctor_profile_ids order) and/or by day
+    (first_day + i).
+    """
+
+    first_day: date
+    last_day: date
+    doctor_profile_ids: np.ndarray  # (doctors,)
+    booked_minutes: np.ndarray  # (doctors, days) all booked minutes
+    working_booked_minutes: np.ndarray  # (doctors,) booked within working hours
+    working_minutes: int  # working hours available to one doctor in the range
+    heatmap_minutes: np.ndarray  # (7, 24) booked minutes by weekday and hour
+
+    @property
+    def utilisation(self) -> np.ndarray:
+        """Share of each doctor's working hours that was booked, 0 to 1."""
+        if self.working_minutes == 0:
+            return np.zeros(len(self.doctor_profile_ids))
+        return self.working_booked_minutes / self.working_minutes
+
+    @property
+    def days(self) -> np.ndarray:
+        return np.arange(
+            np.datetime64(self.first_day, "D"),
+            np.datetime64(self.last_day, "D") + 1,
+        )
+
+
+def compute_utilisation(
+    doctor_profile_ids: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    status_ids: np.ndarray,
+    first_day: date,
+    last_day: date,
+) -> UtilisationReport:
+    """
+    Compute a UtilisationReport from one array entry per appointment.
+
+    starts/ends are datetime64 (any unit). Booked time is attributed to the day
+    an appointment starts. Appointments outside the range or not in
+    BOOKED_STATUSES are ignored.
+    """
+    if last_day < first_day:
+        raise ValueError("last_day must not be before first_day.")
+
+    first = np.datetime64(first_day, "D")
+    day_count = (np.datetime64(last_day, "D") - first).astype(int) + 1
+    starts = starts.astype("datetime64[m]")
+    ends = ends.astype("datetime64[m]")
+
+    start_day = starts.astype("datetime64[D]")
+    day_index = (start_day - first).astype(np.int64)
+    keep = (
+        np.isin(status_ids, [int(s) for s in BOOKED_STATUSES])
+        & (day_index >= 0)
+        & (day_index < day_count)
+        & (ends > starts)
+    )
+    starts, ends = starts[keep], ends[keep]
+    start_day, day_index = start_day[keep], day_index[keep]
+    doctor_ids, doctor_index = np.unique(doctor_profile_ids[keep], return_inverse=True)
+
+    duration = (ends - starts).astype(np.int64)
+    start_minute = (starts - start_day).astype(np.int64)
+    end_minute = start_minute + duration
+    # 1970-01-01 was a Thursday; shift so Monday is 0
+    weekday = (start_day.astype(np.int64) + 3) % 7
+
+    booked = np.bincount(
+        doctor_index * day_count + day_index,
+        weights=duration,
+        minlength=len(doctor_ids) * day_count,
+    ).reshape(len(doctor_ids), day_count)
+
+    work_start, work_end = (t.hour * 60 + t.minute for t in WORKING_HOURS)
+    in_working_hours = np.clip(
+        np.minimum(end_minute, work_end) - np.maximum(start_minute, work_start),
+        0,
+        None,
+    ) * np.isin(weekday, WORKING_WEEKDAYS)
+    working_booked = np.bincount(
+        doctor_index, weights=in_working_hours, minlength=len(doctor_ids)
+    )
+
+    return UtilisationReport(
+        first_day=first_day,
+        last_day=last_day,
+        doctor_profile_ids=doctor_ids,
+        booked_minutes=booked.astype(np.int64),
+        working_booked_minutes=working_booked.astype(np.int64),
+        working_minutes=_count_working_days(first_day, day_count)
+        * (work_end - work_start),
+        heatmap_minutes=_week_heatmap(
+            weekday * MINUTES_PER_DAY + start_minute, duration
+        ),
+    )
+
+
+def compute_utilisation_from_rows(
+    rows: Iterable[tuple[int, int, int, int]],
+    first_day: date,
+    last_day: date,
+) -> UtilisationReport:
+    """
+    compute_utilisation over (doctor_profile_id, start, end, status_id) rows,
+    with start and end in minutes since 1970-01-01 (see list_booking_rows).
+    """
+    columns = np.fromiter(chain.from_iterable(rows), dtype=np.int64).reshape(-1, 4)
+    return compute_utilisation(
+        columns[:, 0],
+        columns[:, 1].astype("datetime64[m]"),
+        columns[:, 2].astype("datetime64[m]"),
+        columns[:, 3],
+        first_day,
+        last_day,
+    )
+
+
+def datetime_range_for_days(
+    first_day: date, last_day: date
+) -> tuple[datetime, datetime]:
+    """[first_day 00:00, day after last_day 00:00), for querying start times."""
+    return (
+        datetime.combine(first_day, time.min),
+        datetime.combine(last_day + timedelta(days=1), time.min),
+    )
+
+
+def _count_working_days(first_day: date, day_count: int) -> int:
+    weekdays = (np.arange(day_count) + first_day.weekday()) % 7
+    return int(np.isin(weekdays, WORKING_WEEKDAYS).sum())
+
+
+def _week_heatmap(start_minute_of_week: np.ndarray, duration: np.ndarray) -> np.ndarray:
+    """Booked minutes per (weekday, hour), via a difference array over the week."""
+    end_minute_of_week = start_minute_of_week + duration
+    # Time past Sunday midnight wraps round to Monday
+    wraps = end_minute_of_week > MINUTES_PER_WEEK
+    starts = np.concatenate([start_minute_of_week, np.zeros(wraps.sum(), np.int64)])
+    ends = np.concatenate(
+        [
+            np.minimum(end_minute_of_week, MINUTES_PER_WEEK),
+            end_minute_of_week[wraps] - MINUTES_PER_WEEK,
+        ]
+    )
+    occupancy = np.bincount(starts, minlength=MINUTES_PER_WEEK + 1) - np.bincount(
+        ends, minlength=MINUTES_PER_WEEK + 1
+    )
+    return np.cumsum(occupancy[:-1]).reshape(7, 24, 60).sum(axis=2)
+
+
+def load_utilisation(
+    session: Session,
+    appointment_repo: AppointmentRepository,
+    first_day: date,
+    last_day: date,
+    *,
+    include_archived: bool = False,
+) -> UtilisationReport:
+    """
+    Fetch bookings in [first_day, last_day] and compute their UtilisationReport.
+
+    :param include_archived: Also count archived appointments.
+    """
+    rows = appointment_repo.list_booking_rows(
+        session,
+        datetime_range_for_days(first_day, last_day),
+        include_archived=include_archived,
+    )
+    return compute_utilisation_from_rows(rows, first_day, last_day)
@@ -0,0 +1,13 @@
+from app.api.routes import ROUTES
+from app.api.server import ApiError, ApiRequest, ApiServer, Route
+from app.api.sessions import ApiSession, TokenSessions
+
+__all__ = [
+    "ApiServer",
+    "ApiRequest",
+    "ApiError",
+    "Route",
+    "ROUTES",
+    "ApiSession",
+    "TokenSessions",
+]
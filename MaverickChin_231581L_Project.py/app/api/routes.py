@@ -0,0 +1,566 @@
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+from typing import Any, TypeVar
+
+from app.api.server import ApiError, ApiRequest, Route
+from app.api.sessions import ApiSession
+from app.core.config import AppConfig
+from app.database.models import Appointment, AppointmentRequest, Profile
+from app.lookups.enums import (
+    AppointmentRequestStatusEnum,
+    AppointmentStatusEnum,
+    BaseEnum,
+    ProfileTypeEnum,
+    SexEnum,
+)
+from app.repositories.appointment_request_repository import AppointmentRequestLoad
+from sqlalchemy.orm import Session
+
+PATIENT = frozenset({ProfileTypeEnum.PATIENT})
+DOCTOR = frozenset({ProfileTypeEnum.DOCTOR})
+RECEPTIONIST = frozenset({ProfileTypeEnum.RECEPTIONIST})
+ANY_PROFILE = frozenset(ProfileTypeEnum)
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_CLAIM_BATCH_SIZE = 50
+
+E = TypeVar("E", bound=BaseEnum)
+
+_TYPE_NAMES = {int: "an integer", str: "a string"}
+
+
+# -------------------------------------------------------------------------
+# SESSIONS
+# -------------------------------------------------------------------------
+def login(request: ApiRequest) -> dict[str, Any]:
+    """Body: username, password, profile_type (e.g. "patient")."""
+    username = _required(request.body, "username", str)
+    password = _required(request.body, "password", str)
+    profile_type = _enum(ProfileTypeEnum, _required(request.body, "profile_type", str))
+    server = request.server
+    with server.db.session_scope() as session:
+        user = server.repos.user.get_by_username(session, username)
+        if (
+            user is None
+            or not user.is_in_service
+            or not server.services.user.validate_password(
+                session, user.user_id, password
+            )
+        ):
+            raise ApiError(HTTPStatus.UNAUTHORIZED, "Incorrect username or password.")
+        profile = server.repos.profile.get_first(
+            session,
+            conditions=[
+                Profile.person_id == user.person_id,
+                Profile.profile_type_id == profile_type,
+                Profile.is_in_service,
+            ],
+        )
+        if profile is None:
+            raise ApiError(
+                HTTPStatus.FORBIDDEN,
+                f"No active {profile_type.display} profile for {username}.",
+            )
+        api_session = ApiSession(
+            user.user_id, user.person_id, profile.profile_id, profile_type
+        )
+    return {
+        "token": server.sessions.create(api_session),
+        "profile_id": api_session.profile_id,
+        "profile_type": profile_type.name.lower(),
+    }
+
+
+def logout(request: ApiRequest) -> dict[str, Any]:
+    assert request.token is not None
+    request.server.sessions.remove(request.token)
+    return {}
+
+
+# -------------------------------------------------------------------------
+# USERS AND PROFILES
+# -------------------------------------------------------------------------
+def register_patient(request: ApiRequest) -> dict[str, Any]:
+    """
+    Body: username, password, first_name, last_name, date_of_birth,
+    primary_email, primary_phone_number, primary_home_address, and optionally
+    sex and medication_allergies.
+    """
+    body = request.body
+    services = request.server.services
+    with request.server.db.session_scope() as session:
+        user = services.user.create_user_and_person(
+            session,
+            username=_required(body, "username", str),
+            plain_password=_required(body, "password", str),
+            first_name=_required(body, "first_name", str),
+            last_name=_required(body, "last_name", str),
+            date_of_birth=_date(_required(body, "date_of_birth", str)),
+            primary_email=_required(body, "primary_email", str),
+            primary_phone_number=_required(body, "primary_phone_number", str),
+            primary_home_address=_required(body, "primary_home_address", str),
+            sex=_enum(SexEnum, _optional(body, "sex", str) or "unknown"),
+        )
+        patient_profile = services.patient.create_patient_profile(
+            session,
+            user.person_id,
+            medication_allergies=_optional(body, "medication_allergies", str),
+        )
+        return {"user_id": user.user_id, "profile_id": patient_profile.profile_id}
+
+
+def get_me(request: ApiRequest) -> dict[str, Any]:
+    assert request.session is not None
+    with request.server.db.session_scope() as session:
+        person = request.server.repos.person.get(session, request.session.person_id)
+        if person is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, "Person no longer exists.")
+        return {
+            "profile_id": request.profile_id,
+            "profile_type": request.session.profile_type.name.lower(),
+            "first_name": person.first_name,
+            "last_name": person.last_name,
+            "date_of_birth": person.date_of_birth,
+            "primary_email": person.primary_email,
+            "primary_phone_number": person.primary_phone_number,
+            "primary_home_address": person.primary_home_address,
+        }
+
+
+def update_my_profile(request: ApiRequest) -> dict[str, Any]:
+    """
+    Body: medication_allergies (patients) or office_phone_number (doctors);
+    null clears it.
+    """
+    assert request.session is not None
+    services = request.server.services
+    with request.server.db.session_scope() as session:
+        if request.session.profile_type == ProfileTypeEnum.PATIENT:
+            patient = services.patient.update_profile_information(
+                session,
+                request.profile_id,
+                _optional(request.body, "medication_allergies", str),
+            )
+            return {"medication_allergies": patient.medication_allergies}
+        doctor = services.doctor.update_profile_information(
+            session,
+            request.profile_id,
+            _optional(request.body, "office_phone_number", str),
+        )
+        return {"office_phone_number": doctor.office_phone_number}
+
+
+# -------------------------------------------------------------------------
+# REFERENCE DATA
+# -------------------------------------------------------------------------
+def list_specialties(request: ApiRequest) -> list[dict[str, Any]]:
+    return [
+        {"specialty_id": specialty_id, "name": name}
+        for specialty_id, name in request.server.lookup_cache.get_all_specialties(
+            in_service_only=True
+        )
+    ]
+
+
+def list_specialty_doctors(request: ApiRequest) -> list[dict[str, Any]]:
+    return [
+        {
+            "doctor_profile_id": doctor.doctor_profile_id,
+            "full_name": doctor.full_name,
+            "office_phone_number": doctor.office_phone_number,
+        }
+        for doctor in request.server.lookup_cache.get_doctors_for_specialty(
+            request.params["specialty_id"]
+        )
+    ]
+
+
+# -------------------------------------------------------------------------
+# APPOINTMENT REQUESTS
+# -------------------------------------------------------------------------
+def create_appointment_request(request: ApiRequest) -> dict[str, Any]:
+    """
+    Body: specialty_id, reason, and optionally preferred_doctor_profile_id and
+    preferred_datetime.
+    """
+    body = request.body
+    server = request.server
+    specialty_id = _required(body, "specialty_id", int)
+    if not server.lookup_cache.is_specialty_in_service(specialty_id):
+        raise ValueError(f"Specialty id {specialty_id} is not in service.")
+    preferred_doctor_profile_id = _optional(body, "preferred_doctor_profile_id", int)
+    if preferred_doctor_profile_id is not None:
+        _check_doctor_practises(request, preferred_doctor_profile_id, specialty_id)
+    preferred_datetime = _optional(body, "preferred_datetime", str)
+    if preferred_datetime is not None:
+        preferred_datetime = _datetime(preferred_datetime)
+        if preferred_datetime <= datetime.now():
+            raise ValueError("preferred_datetime must be in the future.")
+
+    with server.db.session_scope() as session:
+        appointment_request = server.services.appointment.create_appointment_request(
+            session,
+            request.profile_id,
+            specialty_id,
+            _required(body, "reason", str),
+            preferred_doctor_profile_id=preferred_doctor_profile_id,
+            preferred_datetime=preferred_datetime,
+        )
+        assert appointment_request is not None
+        return _appointment_request_json(appointment_request)
+
+
+def list_my_appointment_requests(request: ApiRequest) -> list[dict[str, Any]]:
+    """Query: status (e.g. "pending"), archived (true to include), offset, limit."""
+    offset, limit = _page(request)
+    status = request.query.get("status")
+    with request.server.db.session_scope() as session:
+        appointment_requests = (
+            request.server.repos.appointment_request.list_by_patient_profile_id(
+                session,
+                request.profile_id,
+                only_include_status_ids=(
+                    [_enum(AppointmentRequestStatusEnum, status)] if status else None
+                ),
+                order_by_created_datetime_desc=True,
+                offset=offset,
+                limit=limit,
+                include_archived=_flag(request, "archived"),
+            )
+        )
+        return [_appointment_request_json(r) for r in appointment_requests]
+
+
+def get_appointment_request(request: ApiRequest) -> dict[str, Any]:
+    with request.server.db.session_scope() as session:
+        return _appointment_request_json(_get_appointment_request(request, session))
+
+
+def cancel_appointment_request(request: ApiRequest) -> dict[str, Any]:
+    with request.server.db.session_scope() as session:
+        appointment_request = _get_appointment_request(request, session)
+        appointment_request = (
+            request.server.services.appointment.update_appointment_request_cancelled(
+                session, appointment_request.appointment_request_id
+            )
+        )
+        return _appointment_request_json(appointment_request)
+
+
+def claim_appointment_requests(request: ApiRequest) -> list[dict[str, Any]]:
+    """Body: optionally batch_size. Returns the receptionist's claimed batch."""
+    specialty_id = request.params["specialty_id"]
+    batch_size = _optional(request.body, "batch_size", int) or 10
+    if not 1 <= batch_size <= MAX_CLAIM_BATCH_SIZE:
+        raise ValueError(f"batch_size must be from 1 to {MAX_CLAIM_BATCH_SIZE}.")
+    with request.server.db.session_scope() as session:
+        batch = request.server.services.appointment.claim_appointment_requests(
+            session,
+            specialty_id,
+            request.profile_id,
+            batch_size,
+            lease=timedelta(minutes=AppConfig.appointment_request_claim_lease_minutes),
+        )
+        return [_appointment_request_json(r) for r in batch]
+
+
+def approve_appointment_request(request: ApiRequest) -> dict[str, Any]:
+    """
+    Body: doctor_profile_id, start_datetime, end_datetime, room_name, and
+    optionally reason (default: the request's) and handling_notes.
+    Creates the appointment and approves the request in one transaction.
+    """
+    body = request.body
+    server = request.server
+    doctor_profile_id = _required(body, "doctor_profile_id", int)
+    start_datetime = _datetime(_required(body, "start_datetime", str))
+    end_datetime = _datetime(_required(body, "end_datetime", str))
+    if end_datetime <= start_datetime:
+        raise ValueError("end_datetime must be after start_datetime.")
+    room_name = _required(body, "room_name", str)
+
+    with server.db.session_scope() as session:
+        appointment_request = _get_appointment_request(request, session)
+        _check_doctor_practises(
+            request, doctor_profile_id, appointment_request.specialty_id
+        )
+        appointment = server.services.appointment.create_appointment(
+            session,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+            patient_profile_id=appointment_request.patient_profile_id,
+            doctor_profile_id=doctor_profile_id,
+            specialty_id=appointment_request.specialty_id,
+            room_name=room_name,
+            reason=_optional(body, "reason", str) or appointment_request.reason,
+            created_by_profile_id=request.profile_id,
+        )
+        # Fails, rolling back the appointment, if the request was handled since
+        appointment_request = (
+            server.services.appointment.update_appointment_request_approved(
+                session,
+                appointment_request.appointment_request_id,
+                appointment.appointment_id,
+                handled_by_profile_id=request.profile_id,
+                handling_notes=_optional(body, "handling_notes", str),
+            )
+        )
+        return {
+            "appointment_request": _appointment_request_json(appointment_request),
+            "appointment": _appointment_json(appointment),
+        }
+
+
+def reject_appointment_request(request: ApiRequest) -> dict[str, Any]:
+    """Body: handling_notes."""
+    handling_notes = _required(request.body, "handling_notes", str)
+    with request.server.db.session_scope() as session:
+        appointment_request = _get_appointment_request(request, session)
+        appointment_request = (
+            request.server.services.appointment.update_appointment_request_rejected(
+                session,
+                appointment_request.appointment_request_id,
+                request.profile_id,
+                handling_notes,
+            )
+        )
+        return _appointment_request_json(appointment_request)
+
+
+# -------------------------------------------------------------------------
+# APPOINTMENTS
+# -------------------------------------------------------------------------
+def list_my_appointments(request: ApiRequest) -> list[dict[str, Any]]:
+    """Query: status (e.g. "scheduled"), archived (true to include), offset, limit."""
+    assert request.session is not None
+    offset, limit = _page(request)
+    status = request.query.get("status")
+    repo = request.server.repos.appointment
+    list_appointments = (
+        repo.list_by_patient_profile_id
+        if request.session.profile_type == ProfileTypeEnum.PATIENT
+        else repo.list_by_doctor_profile_id
+    )
+    with request.server.db.session_scope() as session:
+        appointments = list_appointments(
+            session,
+            request.profile_id,
+            only_include_status_ids=(
+                [_enum(AppointmentStatusEnum, status)] if status else None
+            ),
+            order_by_created_datetime_desc=True,
+            offset=offset,
+            limit=limit,
+            include_archived=_flag(request, "archived"),
+        )
+        return [_appointment_json(a) for a in appointments]
+
+
+def complete_appointment(request: ApiRequest) -> dict[str, Any]:
+    appointment_id = request.params["appointment_id"]
+    with request.server.db.session_scope() as session:
+        appointment = request.server.repos.appointment.get(
+            session,
+            appointment_id,
+            conditions=[Appointment.doctor_profile_id == request.profile_id],
+        )
+        if appointment is None:
+            raise ApiError(
+                HTTPStatus.NOT_FOUND, f"Appointment id {appointment_id} not found."
+            )
+        appointment = request.server.services.appointment.update_appointment_completed(
+            session, appointment_id
+        )
+        return _appointment_json(appointment)
+
+
+ROUTES = [
+    Route("POST", "/login", login, None),
+    Route("POST", "/logout", logout, ANY_PROFILE),
+    Route("POST", "/patients", register_patient, None, HTTPStatus.CREATED),
+    Route("GET", "/me", get_me, ANY_PROFILE),
+    Route("PUT", "/me/profile", update_my_profile, PATIENT | DOCTOR),
+    Route("GET", "/specialties", list_specialties, ANY_PROFILE),
+    Route(
+        "GET",
+        "/specialties/{specialty_id}/doctors",
+        list_specialty_doctors,
+        ANY_PROFILE,
+    ),
+    Route(
+        "POST",
+        "/specialties/{specialty_id}/claims",
+        claim_appointment_requests,
+        RECEPTIONIST,
+    ),
+    Route(
+        "POST",
+        "/appointment-requests",
+        create_appointment_request,
+        PATIENT,
+        HTTPStatus.CREATED,
+    ),
+    Route("GET", "/appointment-requests", list_my_appointment_requests, PATIENT),
+    Route(
+        "GET",
+        "/appointment-requests/{appointment_request_id}",
+        get_appointment_request,
+        PATIENT | RECEPTIONIST,
+    ),
+    Route(
+        "POST",
+        "/appointment-requests/{appointment_request_id}/cancel",
+        cancel_appointment_request,
+        PATIENT,
+    ),
+    Route(
+        "POST",
+        "/appointment-requests/{appointment_request_id}/approve",
+        approve_appointment_request,
+        RECEPTIONIST,
+    ),
+    Route(
+        "POST",
+        "/appointment-requests/{appointment_request_id}/reject",
+        reject_appointment_request,
+        RECEPTIONIST,
+    ),
+    Route("GET", "/appointments", list_my_appointments, PATIENT | DOCTOR),
+    Route(
+        "POST",
+        "/appointments/{appointment_id}/complete",
+        complete_appointment,
+        DOCTOR,
+    ),
+]
+
+
+# -------------------------------------------------------------------------
+# HELPERS
+# -------------------------------------------------------------------------
+def _get_appointment_request(
+    request: ApiRequest, session: Session
+) -> AppointmentRequest:
+    """The request in the path, which patients may only see if it is theirs."""
+    assert request.session is not None
+    appointment_request_id = request.params["appointment_request_id"]
+    conditions = []
+    if request.session.profile_type == ProfileTypeEnum.PATIENT:
+        conditions.append(AppointmentRequest.patient_profile_id == request.profile_id)
+    appointment_request = request.server.repos.appointment_request.get(
+        session,
+        appointment_request_id,
+        conditions=conditions,
+        loaders=[AppointmentRequestLoad.SPECIALTY],
+    )
+    if appointment_request is None:
+        raise ApiError(
+            HTTPStatus.NOT_FOUND,
+            f"Appointment request id {appointment_request_id} not found.",
+        )
+    return appointment_request
+
+
+def _check_doctor_practises(
+    request: ApiRequest, doctor_profile_id: int, specialty_id: int
+) -> None:
+    doctors = request.server.lookup_cache.get_doctors_for_specialty(specialty_id)
+    if all(d.doctor_profile_id != doctor_profile_id for d in doctors):
+        raise ValueError(
+            f"Doctor profile id {doctor_profile_id} does not practise "
+            f"specialty id {specialty_id}."
+        )
+
+
+def _appointment_request_json(r: AppointmentRequest) -> dict[str, Any]:
+    return {
+        "appointment_request_id": r.appointment_request_id,
+        "patient_profile_id": r.patient_profile_id,
+        "specialty_id": r.specialty_id,
+        "reason": r.reason,
+        "preferred_doctor_profile_id": r.preferred_doctor_profile_id,
+        "preferred_datetime": r.preferred_datetime,
+        "created_datetime": r.created_datetime,
+        "status": r.status_enum.name.lower(),
+        "appointment_id": r.appointment_id,
+        "handled_datetime": r.handled_datetime,
+        "handling_notes": r.handling_notes,
+        "version_id": r.version_id,
+    }
+
+
+def _appointment_json(a: Appointment) -> dict[str, Any]:
+    return {
+        "appointment_id": a.appointment_id,
+        "patient_profile_id": a.patient_profile_id,
+        "doctor_profile_id": a.doctor_profile_id,
+        "specialty_id": a.specialty_id,
+        "start_datetime": a.start_datetime,
+        "end_datetime": a.end_datetime,
+        "room_name": a.room_name,
+        "reason": a.reason,
+        "status": AppointmentStatusEnum(a.appointment_status_id).name.lower(),
+        "version_id": a.version_id,
+    }
+
+
+def _required(body: dict[str, Any], key: str, kind: type) -> Any:
+    value = body.get(key)
+    if value is None:
+        raise ValueError(f"{key} is required.")
+    return _check_type(key, value, kind)
+
+
+def _optional(body: dict[str, Any], key: str, kind: type) -> Any:
+    value = body.get(key)
+    return None if value is None else _check_type(key, value, kind)
+
+
+def _check_type(key: str, value: Any, kind: type) -> Any:
+    # bool is an int, but never a valid ID
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise ValueError(f"{key} must be {_TYPE_NAMES[kind]}.")
+    if kind is str and not value.strip():
+        raise ValueError(f"{key} must not be blank.")
+    return value
+
+
+def _enum(enum: type[E], name: str) -> E:
+    try:
+        return enum[name.upper()]
+    except KeyError:
+        choices = ", ".join(member.name.lower() for member in enum)
+        raise ValueError(f"Unknown {name!r}; expected one of {choices}.") from None
+
+
+def _date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{value!r} is not a YYYY-MM-DD date.") from None
+
+
+def _datetime(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{value!r} is not a YYYY-MM-DDTHH:MM datetime.") from None
+
+
+def _flag(request: ApiRequest, key: str) -> bool:
+    value = request.query.get(key, "false").lower()
+    if value not in ("true", "false"):
+        raise ValueError(f"{key} must be true or false.")
+    return value == "true"
+
+
+def _page(request: ApiRequest) -> tuple[int, int]:
+    try:
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("offset and limit must be integers.") from None
+    if offset < 0 or not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"offset must be >= 0 and limit from 1 to {MAX_PAGE_SIZE}.")
+    return offset, limit
@@ -0,0 +1,226 @@
+import json
+import re
+import traceback
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlsplit
+
+from app.api.sessions import ApiSession, TokenSessions
+from app.core.app import Repos, Services
+from app.core.change_monitor import ChangeMonitor
+from app.core.config import AppConfig
+from app.core.data_cache import DataCache
+from app.core.lookup_cache import LookupCache
+from app.database.engine import Database
+from app.lookups.enums import ProfileTypeEnum
+from app.services import StaleDataError
+
+MAX_BODY_BYTES = 1 << 20
+
+
+class ApiError(ValueError):
+    """An error to return to the client with an HTTP status."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class ApiRequest:
+    server: "ApiServer"
+    params: dict[str, int]
+    query: dict[str, str]
+    body: dict[str, Any]
+    token: str | None = None
+    session: ApiSession | None = None
+
+    @property
+    def profile_id(self) -> int:
+        assert self.session is not None
+        return self.session.profile_id
+
+
+@dataclass(frozen=True)
+class Route:
+    method: str
+    # Path with {name} placeholders for integer IDs
+    path: str
+    handler: Callable[[ApiRequest], Any]
+    # Profile types allowed to call the route; None for no login needed
+    profile_types: frozenset[ProfileTypeEnum] | None
+    status: HTTPStatus = HTTPStatus.OK
+    pattern: re.Pattern = field(init=False, compare=False)
+
+    def __post_init__(self):
+        regex = re.sub(r"\{(\w+)\}", r"(?P<\1>\\d+)", self.path)
+        object.__setattr__(self, "pattern", re.compile(f"^{regex}$"))
+
+
+class ApiServer(ThreadingHTTPServer):
+    """
+    JSON over HTTP front end to the services, for thin clients.
+
+    One process holds the connection pool and the same lookup and query
+    caches as App, shared by every client and kept fresh by a ChangeMonitor
+    polled at most once per poll_interval seconds. Clients log in for a
+    bearer token (see TokenSessions). Each request is handled on its own
+    thread in one database transaction.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        db: Database,
+        repos: Repos,
+        services: Services,
+        routes: list[Route],
+        *,
+        session_idle_minutes: float = AppConfig.api_session_idle_minutes,
+        poll_interval: float = 1.0,
+        log_requests: bool = False,
+    ):
+        self.db = db
+        self.repos = repos
+        self.services = services
+        self.routes = routes
+        self.log_requests = log_requests
+        self.sessions = TokenSessions(idle=session_idle_minutes * 60)
+
+        self.change_monitor = ChangeMonitor(
+            db.session_scope, min_interval=poll_interval
+        )
+        self.change_monitor.bind(db.session_factory)
+        self.lookup_cache = LookupCache(db.session_scope, repos)
+        self.change_monitor.add_listener(self.lookup_cache.invalidate_tables)
+        self.data_cache = DataCache()
+        self.data_cache.bind(db.session_factory)
+        self.change_monitor.add_listener(self.data_cache.invalidate_tags)
+        repos.appointment_request.enable_result_cache(self.data_cache)
+        repos.specialty.enable_result_cache(self.data_cache)
+
+        super().__init__(address, ApiRequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def dispatch(
+        self, method: str, path: str, headers: Any, raw_body: bytes
+    ) -> tuple[HTTPStatus, Any]:
+        """Route one request and return (status, JSON-serialisable payload)."""
+        try:
+            url = urlsplit(path)
+            route, params = self._match(method, url.path)
+            request = ApiRequest(
+                server=self,
+                params=params,
+                query=dict(parse_qsl(url.query)),
+                body=_parse_body(raw_body),
+            )
+            if route.profile_types is not None:
+                self._authenticate(request, headers, route.profile_types)
+            self.change_monitor.poll()
+            return route.status, route.handler(request)
+        except ApiError as e:
+            return e.status, {"error": str(e)}
+        except StaleDataError as e:
+            return HTTPStatus.CONFLICT, {"error": str(e)}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception:
+            traceback.print_exc()
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error."}
+
+    def _match(self, method: str, path: str) -> tuple[Route, dict[str, int]]:
+        path_matched = False
+        for route in self.routes:
+            match = route.pattern.match(path)
+            if match is None:
+                continue
+            path_matched = True
+            if route.method == method:
+                return route, {k: int(v) for k, v in match.groupdict().items()}
+        if path_matched:
+            raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed.")
+        raise ApiError(HTTPStatus.NOT_FOUND, f"No route for {path}.")
+
+    def _authenticate(
+        self,
+        request: ApiRequest,
+        headers: Any,
+        profile_types: frozenset[ProfileTypeEnum],
+    ) -> None:
+        scheme, _, token = (headers.get("Authorization") or "").partition(" ")
+        session = self.sessions.get(token) if scheme == "Bearer" else None
+        if session is None:
+            raise ApiError(HTTPStatus.UNAUTHORIZED, "Log in first.")
+        if session.profile_type not in profile_types:
+            raise ApiError(
+                HTTPStatus.FORBIDDEN,
+                f"Not available to {session.profile_type.display} profiles.",
+            )
+        request.token = token
+        request.session = session
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients reuse one connection for many requests
+    protocol_version = "HTTP/1.1"
+    server: ApiServer
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+            payload = {"error": "Request body too large."}
+            self.close_connection = True
+        else:
+            raw_body = self.rfile.read(length) if length else b""
+            status, payload = self.server.dispatch(
+                method, self.path, self.headers, raw_body
+            )
+
+        body = json.dumps(payload, default=_json_default).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.log_requests:
+            super().log_message(format, *args)
+
+
+def _parse_body(raw_body: bytes) -> dict[str, Any]:
+    if not raw_body:
+        return {}
+    try:
+        body = json.loads(raw_body)
+    except ValueError:
+        raise ValueError("Request body is not valid JSON.") from None
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object.")
+    return body
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serialisable")
@@ -0,0 +1,65 @@
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from app.lookups.enums import ProfileTypeEnum
+
+
+@dataclass(frozen=True)
+class ApiSession:
+    user_id: int
+    person_id: int
+    profile_id: int
+    profile_type: ProfileTypeEnum
+
+
+class TokenSessions:
+    """
+    Logged-in API clients by bearer token, held in memory.
+
+    A token expires after idle seconds without a request, and every token is
+    lost when the server restarts.
+    """
+
+    def __init__(self, *, idle: float, clock: Callable[[], float] = time.monotonic):
+        self.idle = idle
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Token -> (session, monotonic expiry)
+        self._sessions: dict[str, tuple[ApiSession, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, session: ApiSession) -> str:
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._sessions[token] = (session, self._clock() + self.idle)
+            self._remove_expired()
+        return token
+
+    def get(self, token: str) -> ApiSession | None:
+        """The session for token, extending it, or None if unknown or expired."""
+        now = self._clock()
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is None:
+                return None
+            session, expires = entry
+            if expires < now:
+                del self._sessions[token]
+                return None
+            self._sessions[token] = (session, now + self.idle)
+            return session
+
+    def remove(self, token: str) -> None:
+        with self._lock:
+            self._sessions.pop(token, None)
+
+    def _remove_expired(self) -> None:
+        now = self._clock()
+        expired = [t for t, (_, expires) in self._sessions.items() if expires < now]
+        for token in expired:
+            del self._sessions[token]
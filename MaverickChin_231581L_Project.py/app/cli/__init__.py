@@ -0,0 +1,30 @@
+from app.cli import (
+    backup_command,
+    batch_command,
+    calls_command,
+    export_command,
+    import_command,
+    maintenance_command,
+    report_command,
+    serve_command,
+)
+
+COMMAND_MODULES = [
+    import_command,
+    batch_command,
+    export_command,
+    report_command,
+    backup_command,
+    maintenance_command,
+    serve_command,
+    calls_command,
+]
+
+
+def register_commands(subparsers) -> None:
+    """Add every CLI subcommand to the launcher's argparse subparsers."""
+    for module in COMMAND_MODULES:
+        module.register(subparsers)
+
+
+__all__ = ["register_commands"]
@@ -0,0 +1,59 @@
+from argparse import Namespace
+from pathlib import Path
+
+from app.core.app import Repos, Services
+from app.database.engine import Database
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def register(subparsers) -> None:
+    backup_parser = subparsers.add_parser(
+        "backup", help="Dump every table to a compressed archive."
+    )
+    backup_parser.add_argument("output", type=Path, help=".zip path to write")
+    backup_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    backup_parser.set_defaults(handler=run_backup)
+
+    restore_parser = subparsers.add_parser(
+        "restore", help="Load an archive written by backup into this database."
+    )
+    restore_parser.add_argument("source", type=Path, help=".zip path to read")
+    restore_parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Delete every existing row first (default: tables must be empty). "
+        "Not atomic on MySQL: a failed restore can leave the tables emptied.",
+    )
+    restore_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    restore_parser.set_defaults(handler=run_restore)
+
+
+def run_backup(args: Namespace, db: Database, repos: Repos, services: Services) -> int:
+    from app.database.backup import backup_database
+
+    summary = backup_database(db, args.output, chunk_size=args.chunk_size)
+    for table_name, rows in summary.table_rows.items():
+        print(f"[backup]   {table_name}: {rows}")
+    print(f"[backup] Wrote {summary.total_rows} rows to {args.output}")
+    return 0
+
+
+def run_restore(args: Namespace, db: Database, repos: Repos, services: Services) -> int:
+    from app.database.backup import restore_database
+
+    source: Path = args.source
+    if not source.exists():
+        print(f"[restore] File not found: {source}")
+        return 1
+    try:
+        summary = restore_database(
+            db, source, chunk_size=args.chunk_size, replace=args.replace
+        )
+    except ValueError as e:
+        print(f"[restore] {e}")
+        return 1
+    for table_name, rows in summary.table_rows.items():
+        print(f"[restore]   {table_name}: {rows}")
+    print(f"[restore] Loaded {summary.total_rows} rows from {source}")
+    return 0
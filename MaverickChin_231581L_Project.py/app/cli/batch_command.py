@@ -0,0 +1,193 @@
+from argparse import Namespace
+from datetime import datetime, timedelta
+from typing import Callable
+
+from app.core.app import Repos, Services
+from app.core.config import AppConfig
+from app.database.engine import Database
+from app.database.models import Profile
+from app.lookups.enums import ProfileTypeEnum
+from app.services import BulkChunk
+from sqlalchemy.orm import Session
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def register(subparsers) -> None:
+    batch_parser = subparsers.add_parser(
+        "batch", help="Bulk updates, one transaction per chunk."
+    )
+    batch_subparsers = batch_parser.add_subparsers(dest="batch_type", required=True)
+
+    missed_parser = batch_subparsers.add_parser(
+        "mark-missed",
+        help="Mark scheduled appointments that started before a time as missed.",
+    )
+    missed_parser.add_argument(
+        "--before",
+        type=datetime.fromisoformat,
+        default=None,
+        help="YYYY-MM-DD[THH:MM] (default: now)",
+    )
+    missed_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    missed_parser.set_defaults(handler=run_mark_missed)
+
+    cancel_parser = batch_subparsers.add_parser(
+        "cancel-doctor-appointments",
+        help="Cancel a deactivated doctor's upcoming scheduled appointments.",
+    )
+    cancel_parser.add_argument("doctor_username")
+    cancel_parser.add_argument(
+        "--by",
+        required=True,
+        dest="by_username",
+        help="Username of the admin or receptionist recorded as cancelling",
+    )
+    cancel_parser.add_argument("--reason", required=True)
+    cancel_parser.add_argument(
+        "--after",
+        type=datetime.fromisoformat,
+        default=None,
+        help="YYYY-MM-DD[THH:MM] (default: now)",
+    )
+    cancel_parser.add_argument(
+        "--include-active",
+        action="store_true",
+        help="Allow cancelling for a doctor who is still in service",
+    )
+    cancel_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    cancel_parser.set_defaults(handler=run_cancel_doctor_appointments)
+
+    archive_parser = batch_subparsers.add_parser(
+        "archive",
+        help="Move old handled requests and closed appointments to the archive.",
+    )
+    archive_parser.add_argument(
+        "--older-than-days", type=int, default=AppConfig.archive_after_days
+    )
+    archive_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    archive_parser.set_defaults(handler=run_archive)
+
+
+def run_mark_missed(
+    args: Namespace, db: Database, repos: Repos, services: Services
+) -> int:
+    before: datetime = args.before or datetime.now()
+    total = _run_in_chunks(
+        db,
+        lambda session: services.appointment.update_appointments_missed_before(
+            session, before, limit=args.chunk_size
+        ),
+    )
+    print(f"[batch] Marked {total} appointments before {before:%Y-%m-%d %H:%M} missed.")
+    return 0
+
+
+def run_cancel_doctor_appointments(
+    args: Namespace, db: Database, repos: Repos, services: Services
+) -> int:
+    after: datetime = args.after or datetime.now()
+
+    with db.session_scope() as session:
+        doctor_profile = _get_profile(
+            session, repos, args.doctor_username, [ProfileTypeEnum.DOCTOR]
+        )
+        if doctor_profile is None:
+            print(f"[batch] No doctor profile for username {args.doctor_username}.")
+            return 1
+        doctor_user = doctor_profile.person.user
+        is_active = doctor_profile.is_in_service and (
+            doctor_user is not None and doctor_user.is_in_service
+        )
+        if is_active and not args.include_active:
+            print(
+                f"[batch] Doctor {args.doctor_username} is still in service. "
+                "Deactivate them first or pass --include-active."
+            )
+            return 1
+        cancelled_by = _get_profile(
+            session,
+            repos,
+            args.by_username,
+            [ProfileTypeEnum.ADMIN, ProfileTypeEnum.RECEPTIONIST],
+        )
+        if cancelled_by is None:
+            print(
+                f"[batch] No admin or receptionist profile for username {args.by_username}."
+            )
+            return 1
+        doctor_profile_id = doctor_profile.profile_id
+        cancelled_by_profile_id = cancelled_by.profile_id
+
+    total = _run_in_chunks(
+        db,
+        lambda session: services.appointment.update_doctor_appointments_cancelled(
+            session,
+            doctor_profile_id,
+            after,
+            cancelled_by_profile_id,
+            args.reason,
+            limit=args.chunk_size,
+        ),
+    )
+    print(
+        f"[batch] Cancelled {total} appointments of {args.doctor_username} "
+        f"from {after:%Y-%m-%d %H:%M}."
+    )
+    return 0
+
+
+def run_archive(args: Namespace, db: Database, repos: Repos, services: Services) -> int:
+    before = datetime.now() - timedelta(days=args.older_than_days)
+    # Requests first: they hold the only references to appointments
+    requests = _run_in_chunks(
+        db,
+        lambda session: services.appointment.archive_appointment_requests_before(
+            session, before, limit=args.chunk_size
+        ),
+    )
+    appointments = _run_in_chunks(
+        db,
+        lambda session: services.appointment.archive_appointments_before(
+            session, before, limit=args.chunk_size
+        ),
+    )
+    print(
+        f"[batch] Archived {requests} requests and {appointments} appointments "
+        f"from before {before:%Y-%m-%d %H:%M}."
+    )
+    return 0
+
+
+def _run_in_chunks(db: Database, run_chunk: Callable[[Session], BulkChunk]) -> int:
+    """
+    Call run_chunk in a fresh transaction until it finds no rows left. A chunk
+    whose rows were all handled concurrently changes none but is not the end.
+    """
+    total = 0
+    while True:
+        with db.session_scope() as session:
+            chunk = run_chunk(session)
+        if chunk.found == 0:
+            return total
+        total += chunk.changed
+        print(f"[batch] ... {total} so far")
+
+
+def _get_profile(
+    session: Session,
+    repos: Repos,
+    username: str,
+    profile_types: list[ProfileTypeEnum],
+) -> Profile | None:
+    user = repos.user.get_by_username(session, username)
+    if user is None:
+        return None
+    return repos.profile.get_first(
+        session,
+        conditions=[
+            Profile.person_id == user.person_id,
+            Profile.profile_type_id.in_([t.value for t in profile_types]),
+        ],
+        order_by=[Profile.profile_type_id],
+    )
@@ -0,0 +1,86 @@
+from argparse import Namespace
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+SORT_KEYS = {
+    "total": "total_ms",
+    "p50": "p50_ms",
+    "p95": "p95_ms",
+    "p99": "p99_ms",
+    "calls": "calls",
+}
+
+
+def register(subparsers) -> None:
+    calls_parser = subparsers.add_parser(
+        "calls",
+        help="Latency percentiles per repository and service method, from files "
+        "written with --call-log.",
+    )
+    calls_parser.add_argument("paths", nargs="+", type=Path, metavar="FILE")
+    calls_parser.add_argument(
+        "--by-page", action="store_true", help="One row per page and method"
+    )
+    calls_parser.add_argument(
+        "--top-level",
+        action="store_true",
+        help="Leave out calls made from other logged calls",
+    )
+    calls_parser.add_argument(
+        "--sort", choices=sorted(SORT_KEYS), default="total", help="(default: total)"
+    )
+    calls_parser.add_argument(
+        "--limit", type=int, default=30, help="Rows to list (default: 30)"
+    )
+    calls_parser.set_defaults(handler=run_calls, needs_database=False)
+
+
+def run_calls(args: Namespace) -> int:
+    from app.core.call_log import read_call_log, summarize_calls
+
+    missing = [path for path in args.paths if not path.is_file()]
+    if missing:
+        print(f"[calls] No such file: {', '.join(map(str, missing))}")
+        return 1
+
+    stats = summarize_calls(
+        read_call_log(args.paths),
+        by_page=args.by_page,
+        top_level_only=args.top_level,
+    )
+    if not stats:
+        print("[calls] No calls logged.")
+        return 1
+    stats.sort(key=lambda s: getattr(s, SORT_KEYS[args.sort]), reverse=True)
+
+    grouped_by = "page and method" if args.by_page else "method"
+    table = Table(
+        title=f"Calls per {grouped_by}, by {args.sort} ({len(stats)} rows)",
+        title_justify="left",
+    )
+    if args.by_page:
+        table.add_column("Page", overflow="fold")
+    table.add_column("Method", overflow="fold")
+    for column in ("Calls", "Errors", "p50 ms", "p95 ms", "p99 ms", "Max ms"):
+        table.add_column(column, justify="right")
+    table.add_column("Total s", justify="right")
+    table.add_column("SQL/call", justify="right")
+    table.add_column("Rows/call", justify="right")
+    for s in stats[: args.limit]:
+        table.add_row(
+            *([s.page or "-"] if args.by_page else []),
+            s.method,
+            str(s.calls),
+            str(s.errors),
+            f"{s.p50_ms:.2f}",
+            f"{s.p95_ms:.2f}",
+            f"{s.p99_ms:.2f}",
+            f"{s.max_ms:.2f}",
+            f"{s.total_ms / 1000:.2f}",
+            f"{s.mean_statements:.1f}",
+            f"{s.mean_rows:.1f}" if s.mean_rows is not None else "-",
+        )
+    Console().print(table)
+    return 0
@@ -0,0 +1,218 @@
+import csv
+import sys
+from argparse import BooleanOptionalAction, Namespace
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Callable
+
+from app.core.app import Repos, Services
+from app.database.bulk_export import write_csv, write_jsonl
+from app.database.engine import Database
+from app.database.models import Specialty
+from app.lookups.enums import AppointmentStatusEnum
+from sqlalchemy import Result
+from sqlalchemy.orm import Session
+
+DEFAULT_CHUNK_SIZE = 500
+
+SCHEDULE_HEADER = [
+    "start",
+    "end",
+    "room",
+    "specialty",
+    "doctor",
+    "patient",
+    "status",
+    "reason",
+]
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl}
+
+# (export_type, rows label, range filter label)
+RECORD_EXPORTS = [
+    ("appointments", "appointments", "starting"),
+    ("requests", "appointment requests", "created"),
+    ("prescriptions", "prescription items", "created"),
+]
+
+
+def register(subparsers) -> None:
+    export_parser = subparsers.add_parser(
+        "export", help="Export records as CSV or JSON Lines."
+    )
+    export_subparsers = export_parser.add_subparsers(dest="export_type", required=True)
+
+    schedule_parser = export_subparsers.add_parser(
+        "schedule", help="Every appointment starting on a given day."
+    )
+    schedule_parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=None,
+        help="YYYY-MM-DD (default: today)",
+    )
+    schedule_parser.add_argument(
+        "--output", type=Path, default=None, help="CSV path (default: stdout)"
+    )
+    _add_include_archived_argument(schedule_parser, "appointments")
+    schedule_parser.set_defaults(handler=run_export_schedule)
+
+    for export_type, label, range_label in RECORD_EXPORTS:
+        records_parser = export_subparsers.add_parser(
+            export_type,
+            help=f"Every {label[:-1]}, streamed with constant memory.",
+        )
+        records_parser.add_argument(
+            "--from",
+            dest="first_day",
+            type=date.fromisoformat,
+            default=None,
+            help=f"YYYY-MM-DD, only {label} {range_label} on or after this day",
+        )
+        records_parser.add_argument(
+            "--to",
+            dest="last_day",
+            type=date.fromisoformat,
+            default=None,
+            help=f"YYYY-MM-DD, only {label} {range_label} on or before this day",
+        )
+        records_parser.add_argument(
+            "--specialty", default=None, help="Specialty name to filter on"
+        )
+        records_parser.add_argument(
+            "--format",
+            choices=sorted(WRITERS),
+            default=None,
+            help="Default: from the --output suffix, else csv",
+        )
+        records_parser.add_argument(
+            "--output", type=Path, default=None, help="Output path (default: stdout)"
+        )
+        records_parser.add_argument(
+            "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE
+        )
+        _add_include_archived_argument(records_parser, label)
+        records_parser.set_defaults(handler=run_export_records, label=label)
+
+
+def run_export_schedule(
+    args: Namespace, db: Database, repos: Repos, services: Services
+) -> int:
+    day: date = args.date or date.today()
+    day_start = datetime.combine(day, time.min)
+    day_range = (day_start, day_start + timedelta(days=1))
+
+    output = (
+        open(args.output, "w", newline="", encoding="utf-8")
+        if args.output
+        else sys.stdout
+    )
+    count = 0
+    try:
+        writer = csv.writer(output)
+        writer.writerow(SCHEDULE_HEADER)
+        with db.session_scope() as session:
+            for (
+                start,
+                end,
+                room_name,
+                specialty_name,
+                doctor_name,
+                patient_name,
+                status_id,
+                reason,
+            ) in repos.appointment.iter_schedule_rows(
+                session, day_range, include_archived=args.include_archived
+            ):
+                writer.writerow(
+                    [
+                        start.strftime("%Y-%m-%d %H:%M"),
+                        end.strftime("%Y-%m-%d %H:%M"),
+                        room_name,
+                        specialty_name,
+                        doctor_name,
+                        patient_name,
+                        AppointmentStatusEnum(status_id).display,
+                        reason,
+                    ]
+                )
+                count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if args.output:
+        print(f"[export] Wrote {count} appointments on {day} to {args.output}")
+    return 0
+
+
+def run_export_records(
+    args: Namespace, db: Database, repos: Repos, services: Services
+) -> int:
+    if args.first_day and args.last_day and args.last_day < args.first_day:
+        print("[export] --to must not be before --from.")
+        return 1
+    datetime_range = None
+    if args.first_day or args.last_day:
+        datetime_range = (
+            datetime.combine(args.first_day or date.min, time.min),
+            datetime.combine(args.last_day or date.max - timedelta(days=1), time.min)
+            + timedelta(days=1),
+        )
+
+    stream_rows: Callable[..., Result] = {
+        "appointments": repos.appointment.stream_export_rows,
+        "requests": repos.appointment_request.stream_export_rows,
+        "prescriptions": repos.prescription.stream_export_item_rows,
+    }[args.export_type]
+    export_format = args.format or _format_from_suffix(args.output)
+
+    with db.session_scope() as session:
+        specialty_id = None
+        if args.specialty is not None:
+            specialty_id = _get_specialty_id(session, repos, args.specialty)
+            if specialty_id is None:
+                print(f"[export] No specialty named {args.specialty}.")
+                return 1
+
+        output = (
+            open(args.output, "w", newline="", encoding="utf-8")
+            if args.output
+            else sys.stdout
+        )
+        try:
+            result = stream_rows(
+                session,
+                datetime_range=datetime_range,
+                specialty_id=specialty_id,
+                chunk_size=args.chunk_size,
+                include_archived=args.include_archived,
+            )
+            count = WRITERS[export_format](result, output)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+    if args.output:
+        print(f"[export] Wrote {count} {args.label} to {args.output}")
+    return 0
+
+
+def _add_include_archived_argument(parser, label: str) -> None:
+    parser.add_argument(
+        "--include-archived",
+        action=BooleanOptionalAction,
+        default=True,
+        help=f"Export archived {label} too",
+    )
+
+
+def _format_from_suffix(path: Path | None) -> str:
+    if path is not None and path.suffix.lower() in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "csv"
+
+
+def _get_specialty_id(session: Session, repos: Repos, name: str) -> int | None:
+    specialty = repos.specialty.get_first(session, conditions=[Specialty.name == name])
+    return specialty.specialty_id if specialty else None
@@ -0,0 +1,66 @@
+from argparse import Namespace
+from pathlib import Path
+
+from app.core.app import Repos, Services
+from app.database.engine import Database
+
+
+def register(subparsers) -> None:
+    import_parser = subparsers.add_parser("import", help="Bulk import records.")
+    import_subparsers = import_parser.add_subparsers(dest="import_type", required=True)
+
+    patients_parser = import_subparsers.add_parser(
+        "patients", help="Import user accounts with patient profiles."
+    )
+    patients_parser.add_argument("source", type=Path, help=".csv or .jsonl file")
+    patients_parser.add_argument(
+        "--errors",
+        type=Path,
+        default=None,
+        help="Error report path (default: <source>.errors.csv)",
+    )
+    patients_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Rows per transaction, inserted with one INSERT per table (one per "
+        "row on MySQL, which has no RETURNING to read the new keys back with) "
+        "(default: 500)",
+    )
+    patients_parser.add_argument(
+        "--workers", type=int, default=None, help="Hashing processes (default: CPUs)"
+    )
+    patients_parser.set_defaults(handler=run_import_patients)
+
+
+def run_import_patients(
+    args: Namespace, db: Database, repos: Repos, services: Services
+) -> int:
+    from app.database.bulk_import import import_patients
+
+    source: Path = args.source
+    if not source.exists():
+        print(f"[import] File not found: {source}")
+        return 1
+    errors_path: Path = args.errors or source.with_suffix(".errors.csv")
+
+    summary = import_patients(
+        db,
+        services.security,
+        source,
+        errors_path,
+        batch_size=args.batch_size,
+        workers=args.workers,
+    )
+
+    print(
+        f"[import] Done. {summary.rows_imported}/{summary.rows_read} rows imported, "
+        f"{summary.rows_failed} failed."
+    )
+    for reason, count in sorted(
+        summary.errors_by_reason.items(), key=lambda item: item[1], reverse=True
+    ):
+        print(f"[import]   {count} x {reason}")
+    if summary.rows_failed:
+        print(f"[import] Error report written to {errors_path}")
+    return 0 if summary.rows_failed == 0 else 2
@@ -0,0 +1,63 @@
+import time
+from argparse import Namespace
+
+from app.core.app import Repos, Services
+from app.core.config import AppConfig
+from app.core.maintenance import MaintenanceRun, MaintenanceScheduler, format_run
+from app.database.engine import Database
+
+
+def register(subparsers) -> None:
+    maintenance_parser = subparsers.add_parser(
+        "maintenance",
+        help="Mark past appointments missed, expire past requests and archive old "
+        "ones, periodically.",
+    )
+    maintenance_parser.add_argument(
+        "--once", action="store_true", help="Run once and exit instead of looping"
+    )
+    maintenance_parser.add_argument(
+        "--interval",
+        type=float,
+        default=AppConfig.maintenance_interval_seconds,
+        help="Seconds between runs",
+    )
+    maintenance_parser.add_argument(
+        "--chunk-size", type=int, default=AppConfig.maintenance_chunk_size
+    )
+    maintenance_parser.set_defaults(handler=run_maintenance)
+
+
+def run_maintenance(
+    args: Namespace, db: Database, repos: Repos, services: Services
+) -> int:
+    scheduler = MaintenanceScheduler(
+        db.session_scope,
+        services,
+        interval=args.interval,
+        chunk_size=args.chunk_size,
+        on_run=_print_run,
+    )
+    if args.once:
+        run = scheduler.run_once()
+        return 1 if run.error is not None else 0
+
+    print(f"[maintenance] Running every {args.interval:g} s. Press Ctrl+C to stop.")
+    try:
+        while True:
+            scheduler.run_once()
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+    metrics = scheduler.metrics
+    rows = ", ".join(f"{name} {count}" for name, count in metrics.rows.items())
+    print(
+        f"[maintenance] {metrics.runs} runs ({metrics.failed_runs} failed) "
+        f"in {metrics.seconds:.2f} s; rows: {rows or 'none'}."
+    )
+    return 0
+
+
+def _print_run(run: MaintenanceRun) -> None:
+    print(f"[maintenance] {format_run(run)}")
@@ -0,0 +1,79 @@
+from argparse import BooleanOptionalAction, Namespace
+from datetime import date, timedelta
+
+from app.core.app import Repos, Services
+from app.database.engine import Database
+from rich.console import Console
+
+DEFAULT_REPORT_DAYS = 30
+
+
+def register(subparsers) -> None:
+    report_parser = subparsers.add_parser("report", help="Print analytics reports.")
+    report_subparsers = report_parser.add_subparsers(dest="report_type", required=True)
+
+    utilisation_parser = report_subparsers.add_parser(
+        "utilisation",
+        help="Booked hours and working-hours utilisation per doctor, with a heatmap.",
+    )
+    utilisation_parser.add_argument(
+        "--from",
+        dest="first_day",
+        type=date.fromisoformat,
+        default=None,
+        help=f"YYYY-MM-DD (default: {DEFAULT_REPORT_DAYS - 1} days before --to)",
+    )
+    utilisation_parser.add_argument(
+        "--to",
+        dest="last_day",
+        type=date.fromisoformat,
+        default=None,
+        help="YYYY-MM-DD, inclusive (default: today)",
+    )
+    utilisation_parser.add_argument(
+        "--limit", type=int, default=20, help="Doctors to list (default: 20)"
+    )
+    utilisation_parser.add_argument(
+        "--include-archived",
+        action=BooleanOptionalAction,
+        default=True,
+        help="Count archived appointments too",
+    )
+    utilisation_parser.set_defaults(handler=run_report_utilisation)
+
+
+def run_report_utilisation(
+    args: Namespace, db: Database, repos: Repos, services: Services
+) -> int:
+    # NumPy is only needed here, so keep it off the launcher's startup path
+    from app.analytics import load_utilisation
+    from app.ui.utilisation_tables import heatmap_table, utilisation_table
+
+    last_day: date = args.last_day or date.today()
+    first_day: date = args.first_day or last_day - timedelta(
+        days=DEFAULT_REPORT_DAYS - 1
+    )
+    if last_day < first_day:
+        print("[report] --to must not be before --from.")
+        return 1
+
+    with db.session_scope() as session:
+        report = load_utilisation(
+            session,
+            repos.appointment,
+            first_day,
+            last_day,
+            include_archived=args.include_archived,
+        )
+        doctor_names = {
+            doctor_profile_id: f"{first_name} {last_name}"
+            for doctor_profile_id, first_name, last_name, *_ in (
+                repos.doctor_profile.list_roster_rows(session)
+            )
+        }
+
+    console = Console()
+    console.print(utilisation_table(report, doctor_names, limit=args.limit))
+    console.print("")
+    console.print(heatmap_table(report))
+    return 0
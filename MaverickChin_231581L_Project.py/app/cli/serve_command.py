@@ -0,0 +1,37 @@
+from argparse import Namespace
+
+from app.core.app import Repos, Services
+from app.database.engine import Database
+
+
+def register(subparsers) -> None:
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve the JSON HTTP API until interrupted."
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument(
+        "--log-requests", action="store_true", help="Log every request to stderr"
+    )
+    serve_parser.set_defaults(handler=run_serve)
+
+
+def run_serve(args: Namespace, db: Database, repos: Repos, services: Services) -> int:
+    from app.api import ROUTES, ApiServer
+
+    server = ApiServer(
+        (args.host, args.port),
+        db,
+        repos,
+        services,
+        ROUTES,
+        log_requests=args.log_requests,
+    )
+    print(f"[serve] Listening on {server.url}. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
@@ -1,8 +1,15 @@
+import time
 import traceback
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Callable, ContextManager
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Callable, ContextManager
 
+from app.core.change_monitor import ChangeMonitor
+from app.core.data_cache import DataCache
+from app.core.lookup_cache import LookupCache
+from app.core.maintenance import MaintenanceScheduler
 from app.database.engine import Database
 from app.database.models import (
     AdminProfile,
@@ -12,7 +19,6 @@ from app.database.models import (
     Specialty,
 )
 from app.lookups.enums import ProfileTypeEnum, SexEnum
-from app.pages.core.app_start_page import AppStartPage
 from app.pages.core.base_page import BasePage
 from app.repositories import (
     AppointmentRepository,
@@ -32,9 +38,19 @@ from app.services import (
     SecurityService,
     UserService,
 )
+from app.ui.prompts import PromptSessionClosed
 from rich.console import Console
 from sqlalchemy.orm import Session
 
+if TYPE_CHECKING:
+    from app.core.page_profiler import PageProfiler
+
+# (page that ran, page shown next or None on exit, seconds spent in page.run())
+PageListener = Callable[[BasePage, BasePage | None, float], None]
+
+# Page whose run() is executing in this thread/context, for instrumentation
+current_page: ContextVar[BasePage | None] = ContextVar("current_page", default=None)
+
 
 @dataclass
 class Repos:
@@ -82,32 +98,6 @@ class CurrentPersonDTO:
     profile_id: int
 
 
-@dataclass
-class LookupCache:
-    specialties: dict[int, str] = field(default_factory=dict)
-    specialties_by_name: dict[str, int] = field(default_factory=dict)
-
-    def load_from_database(
-        self, session: Session, specialty_repo: BaseRepository[Specialty]
-    ) -> None:
-        """Load specialties from database into cache"""
-        specialties = specialty_repo.get_all(session)
-        self.specialties = {s.specialty_id: s.name for s in specialties}
-        self.specialties_by_name = {s.name: s.specialty_id for s in specialties}
-
-    def get_specialty_name(self, specialty_id: int) -> str | None:
-        """Get specialty name by ID (from cache)"""
-        return self.specialties.get(specialty_id)
-
-    def get_specialty_id(self, name: str) -> int | None:
-        """Get specialty ID by name (from cache)"""
-        return self.specialties_by_name.get(name)
-
-    def get_all_specialties(self) -> list[tuple[int, str]]:
-        """Get all specialties as [(id, name), ...] for UI display"""
-        return sorted(self.specialties.items(), key=lambda x: x[1])
-
-
 class App:
     """Main application class with dependency injection"""
 
@@ -116,7 +106,11 @@ class App:
     session_scope: Callable[[], ContextManager[Session]]
     repos: Repos
     services: Services
+    change_monitor: ChangeMonitor
     lookup_cache: LookupCache
+    data_cache: DataCache
+    maintenance: MaintenanceScheduler | None
+    profiler: "PageProfiler | None"
     current_user: CurrentUserDTO | None
     current_person: CurrentPersonDTO | None
     current_profile_type: ProfileTypeEnum | None
@@ -126,42 +120,115 @@ class App:
         db: Database,
         repos: Repos,
         services: Services,
+        *,
+        console: Console | None = None,
+        change_monitor: ChangeMonitor | None = None,
+        data_cache: DataCache | None = None,
+        lookup_cache: LookupCache | None = None,
+        maintenance: MaintenanceScheduler | None = None,
+        profiler: "PageProfiler | None" = None,
+        close_db_on_exit: bool = True,
+        propagate_errors: bool = False,
     ):
-        self.console = Console()
+        """
+        :param change_monitor: Shared monitor, already bound to db. Caches
+            passed in must already be listening to it.
+        :param data_cache: Shared cache, already bound to db. A new one is bound if not given.
+        :param lookup_cache: Shared reference data cache.
+        :param maintenance: Scheduler to run in the background while run() is.
+        :param profiler: Profiles every page.run(); its summary is printed on exit.
+        :param close_db_on_exit: Set False when several apps share one database.
+        :param propagate_errors: Re-raise unexpected errors from run() instead of
+            pausing on them, for scripted sessions.
+        """
+        self.console = console if console is not None else Console()
         self.db = db
         self.session_scope = db.session_scope
         self.repos = repos
         self.services = services
 
-        self.lookup_cache = LookupCache()
-        with self.session_scope() as session:
-            self.lookup_cache.load_from_database(session, self.repos.specialty)
+        # Polled before every page render so writes from other terminals
+        # reach the caches below
+        if change_monitor is None:
+            change_monitor = ChangeMonitor(self.session_scope)
+            change_monitor.bind(db.session_factory)
+        self.change_monitor = change_monitor
+
+        # Reference data, reloaded after writes to the tables it is read from
+        if lookup_cache is None:
+            lookup_cache = LookupCache(self.session_scope, repos)
+            change_monitor.add_listener(lookup_cache.invalidate_tables)
+        self.lookup_cache = lookup_cache
+
+        # Query results cached by pages; table tags are bumped on every write
+        if data_cache is None:
+            data_cache = DataCache()
+            data_cache.bind(db.session_factory)
+            change_monitor.add_listener(data_cache.invalidate_tags)
+        self.data_cache = data_cache
+        # Aggregates that receptionist pages re-run on every visit
+        repos.appointment_request.enable_result_cache(data_cache)
+        repos.specialty.enable_result_cache(data_cache)
+        self.maintenance = maintenance
+        self.profiler = profiler
+        self.close_db_on_exit = close_db_on_exit
+        self.propagate_errors = propagate_errors
+        self._page_listeners: list[PageListener] = []
 
         # Session state
         self.current_user = None
         self.current_person = None
         self.current_profile_type = None
 
-        # Page navigation
+        # Page navigation (pages are imported on first use to keep startup light)
+        from app.pages.core.app_start_page import AppStartPage
+
         self._start_page: BasePage = AppStartPage(self)
         self._page_stack: list[BasePage] = [self._start_page]
         self._logged_in: bool = False
 
+    def add_page_listener(self, listener: PageListener) -> None:
+        """Call listener after every page transition, e.g. to time them."""
+        self._page_listeners.append(listener)
+
     def run(self):
         """Main application loop"""
+        if self.maintenance is not None:
+            self.maintenance.start()
         try:
             while self._page_stack:
                 page = self._page_stack[-1]
-                result = page.run()
+                self.change_monitor.poll()
+                started = time.perf_counter()
+                page_token = current_page.set(page)
+                try:
+                    with (
+                        self.profiler.profile(page)
+                        if self.profiler is not None
+                        else nullcontext()
+                    ):
+                        result = page.run()
+                finally:
+                    current_page.reset(page_token)
+                elapsed = time.perf_counter() - started
 
                 if result is None:
                     self._page_stack.pop()
                 else:
                     self._page_stack.append(result)
 
+                next_page = self._page_stack[-1] if self._page_stack else None
+                for listener in self._page_listeners:
+                    listener(page, next_page, elapsed)
+
+        except PromptSessionClosed:
+            # Scripted input ran out; nothing left to do
+            pass
         except KeyboardInterrupt:
             self.console.print("\n[yellow]Application interrupted by user.[/]")
         except Exception:
+            if self.propagate_errors:
+                raise
             self.console.print("\n[red]Unexpected error in app.[/]")
             traceback.print_exc()
             try:
@@ -169,7 +236,12 @@ class App:
             except EOFError:
                 pass
         finally:
-            self.db.close()
+            if self.maintenance is not None:
+                self.maintenance.stop()
+            if self.profiler is not None:
+                self.profiler.summary(self.console)
+            if self.close_db_on_exit:
+                self.db.close()
 
     def login(
         self,
@@ -0,0 +1,79 @@
+from app.core.app import Repos, Services
+from app.database.models import (
+    AdminProfile,
+    Medication,
+    Profile,
+    ReceptionistProfile,
+    Specialty,
+)
+from app.repositories import (
+    AppointmentRepository,
+    AppointmentRequestRepository,
+    BaseRepository,
+    DoctorProfileRepository,
+    PatientProfileRepository,
+    PersonRepository,
+    PrescriptionRepository,
+    UserRepository,
+)
+from app.services import (
+    AppointmentService,
+    DoctorService,
+    PatientService,
+    PersonService,
+    SecurityService,
+    UserService,
+)
+
+
+def build_repos() -> Repos:
+    """Create one instance of every repository used by the application."""
+    return Repos(
+        user=UserRepository(),
+        person=PersonRepository(),
+        profile=BaseRepository(Profile),
+        patient_profile=PatientProfileRepository(),
+        doctor_profile=DoctorProfileRepository(),
+        receptionist_profile=BaseRepository(ReceptionistProfile),
+        admin_profile=BaseRepository(AdminProfile),
+        specialty=BaseRepository(Specialty),
+        appointment_request=AppointmentRequestRepository(),
+        appointment=AppointmentRepository(),
+        prescription=PrescriptionRepository(),
+        medication=BaseRepository(Medication),
+    )
+
+
+def build_services(repos: Repos) -> Services:
+    """Create the services, wired to the given repositories."""
+    security_service = SecurityService()
+    return Services(
+        security=security_service,
+        user=UserService(
+            user_repo=repos.user,
+            person_repo=repos.person,
+            security_service=security_service,
+        ),
+        person=PersonService(person_repo=repos.person, user_repo=repos.user),
+        patient=PatientService(
+            patient_profile_repo=repos.patient_profile,
+            profile_repo=repos.profile,
+            person_repo=repos.person,
+        ),
+        doctor=DoctorService(
+            doctor_profile_repo=repos.doctor_profile,
+            profile_repo=repos.profile,
+            person_repo=repos.person,
+        ),
+        appointment=AppointmentService(
+            appointment_repo=repos.appointment,
+            appointment_request_repo=repos.appointment_request,
+            profile_repo=repos.profile,
+            patient_profile_repo=repos.patient_profile,
+            doctor_profile_repo=repos.doctor_profile,
+            receptionist_profile_repo=repos.receptionist_profile,
+            user_repo=repos.user,
+            person_repo=repos.person,
+            prescription_repo=repos.prescription,
+        ),
+    )
@@ -0,0 +1,219 @@
+import dataclasses
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from app.core.app import Repos, Services, current_page
+from app.repositories import BaseRepository
+from app.services.base_service import BaseService
+from sqlalchemy import Engine, Row, event
+
+
+@dataclass
+class _Call:
+    method: str
+    statements: int = 0
+
+
+# Instrumented calls in progress in this thread/context, outermost first
+_calls: ContextVar[tuple[_Call, ...]] = ContextVar("instrumented_calls", default=())
+
+
+class CallLog:
+    """
+    Appends a JSON line to path for every call to a public method of the
+    repositories and services it instruments, e.g.
+
+        {"time": "2026-01-05T09:30:00.125", "method": "repos.appointment.get",
+         "ms": 1.84, "rows": 1, "statements": 2,
+         "page": "PatientViewAppointmentPage", "parent": null, "error": null}
+
+    rows is the length of a returned sequence, 0 for None, 1 for any other
+    object and null for scalars such as counts. statements counts SQL run on
+    the bound engine during the call, nested calls included; parent is the
+    instrumented call it was made from. page is the class of the page whose
+    run() made the call (see app.core.app.current_page).
+
+    Generators and Results are read after the call returns, so for them rows
+    is null and ms and statements cover the call only, not the iteration.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def bind(self, engine: Engine) -> None:
+        """Count statements run on engine towards the calls in progress."""
+        if not event.contains(engine, "before_cursor_execute", _count_statement):
+            event.listen(engine, "before_cursor_execute", _count_statement)
+
+    def instrument(self, repos: Repos, services: Services) -> None:
+        """
+        Wrap the public methods of every BaseRepository and BaseService in repos
+        and services, on the instances only. Services share the repository
+        instances, so their calls into repositories are logged too.
+        """
+        for prefix, container in (("repos", repos), ("services", services)):
+            for field in dataclasses.fields(container):
+                target = getattr(container, field.name)
+                if not isinstance(target, (BaseRepository, BaseService)):
+                    continue
+                for name, _ in inspect.getmembers(type(target), inspect.isfunction):
+                    if name.startswith("_"):
+                        continue
+                    setattr(
+                        target,
+                        name,
+                        self._wrap(
+                            f"{prefix}.{field.name}.{name}", getattr(target, name)
+                        ),
+                    )
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def _wrap(self, method_name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(method)
+        def logged(*args, **kwargs):
+            outer = _calls.get()
+            call = _Call(method_name)
+            token = _calls.set(outer + (call,))
+            result = None
+            error = None
+            started = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+                return result
+            except BaseException as e:
+                error = type(e).__name__
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                _calls.reset(token)
+                page = current_page.get()
+                self._write(
+                    {
+                        "time": datetime.now().isoformat(timespec="milliseconds"),
+                        "method": method_name,
+                        "ms": round(elapsed * 1000, 3),
+                        "rows": None if error else _rows(result),
+                        "statements": call.statements,
+                        "page": type(page).__name__ if page is not None else None,
+                        "parent": outer[-1].method if outer else None,
+                        "error": error,
+                    }
+                )
+
+        return logged
+
+    def _write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            # Calls from other threads may outlive the app
+            if not self._file.closed:
+                self._file.write(line)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    for call in _calls.get():
+        call.statements += 1
+
+
+def _rows(result: Any) -> int | None:
+    if result is None:
+        return 0
+    if isinstance(result, (str, bytes, int, float, Iterator)):
+        return None
+    if isinstance(result, Sequence) and not isinstance(result, Row):
+        return len(result)
+    return 1
+
+
+# -------------------------------------------------------------------------
+# ANALYSIS
+# -------------------------------------------------------------------------
+@dataclass(frozen=True)
+class CallStats:
+    method: str
+    # Only set when grouped by page
+    page: str | None
+    calls: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    total_ms: float
+    mean_statements: float
+    # Over the calls that returned rows, if any did
+    mean_rows: float | None
+
+
+def read_call_log(paths: Iterable[Path]) -> Iterator[dict[str, Any]]:
+    """Records from CallLog files, skipping lines cut short by a crash."""
+    for path in paths:
+        with path.open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def summarize_calls(
+    records: Iterable[dict[str, Any]],
+    *,
+    by_page: bool = False,
+    top_level_only: bool = False,
+) -> list[CallStats]:
+    """
+    Latency percentiles per method, or per page and method, most total time
+    first. With top_level_only, calls made from other instrumented calls are
+    left out, so no time is counted twice.
+    """
+    grouped: defaultdict[tuple[str, str | None], list[dict[str, Any]]] = defaultdict(
+        list
+    )
+    for record in records:
+        if top_level_only and record["parent"] is not None:
+            continue
+        grouped[(record["method"], record["page"] if by_page else None)].append(record)
+
+    stats = []
+    for (method, page), group in grouped.items():
+        ordered = sorted(record["ms"] for record in group)
+        rows = [record["rows"] for record in group if record["rows"] is not None]
+        stats.append(
+            CallStats(
+                method=method,
+                page=page,
+                calls=len(group),
+                errors=sum(1 for record in group if record["error"] is not None),
+                p50_ms=_percentile(ordered, 0.50),
+                p95_ms=_percentile(ordered, 0.95),
+                p99_ms=_percentile(ordered, 0.99),
+                max_ms=ordered[-1],
+                total_ms=sum(ordered),
+                mean_statements=(
+                    sum(record["statements"] for record in group) / len(group)
+                ),
+                mean_rows=sum(rows) / len(rows) if rows else None,
+            )
+        )
+    stats.sort(key=lambda s: s.total_ms, reverse=True)
+    return stats
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
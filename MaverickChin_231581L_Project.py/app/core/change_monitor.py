@@ -0,0 +1,111 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, ContextManager
+
+from app.database.change_tracking import CHANGED_TABLE_VERSIONS_KEY
+from app.repositories import TableChangeRepository
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+
+# Called with the names of tables that changed since it was last called
+ChangeListener = Callable[[set[str]], None]
+
+_table_change_repo = TableChangeRepository()
+
+
+class ChangeMonitor:
+    """
+    Tells in-process caches which tables changed, whichever process wrote them.
+
+    Every write bumps the table's table_change row once it commits (see
+    track_table_changes). Listeners hear about this process's writes right
+    after they commit, and about other processes' writes on the next poll(). A
+    poll reads only the rows whose updated_at is within lag of the newest
+    change already seen, so it is one indexed query however many tables there
+    are. lag must cover the longest bump transaction, plus clock drift between
+    terminals for databases that take now() from the client.
+    """
+
+    def __init__(
+        self,
+        session_scope: Callable[[], ContextManager[Session]],
+        *,
+        lag: timedelta = timedelta(seconds=60),
+        min_interval: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._session_scope = session_scope
+        self.lag = lag
+        self.min_interval = min_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._listeners: list[ChangeListener] = []
+        self._versions: dict[str, int] = {}
+        self._newest_change: datetime | None = None
+        self._next_poll = float("-inf")
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        self._listeners.append(listener)
+
+    def bind(self, session_factory: sessionmaker[Session]) -> None:
+        """
+        Notify listeners as soon as sessions of this factory commit a write.
+        Bind after track_table_changes, so the new versions are known by then.
+        """
+        event.listen(
+            session_factory, "after_transaction_end", self._after_transaction_end
+        )
+
+    def poll(self) -> set[str]:
+        """
+        Fetch tables changed by other processes and notify listeners.
+        Does nothing if called again within min_interval.
+
+        :return: Names of the changed tables.
+        """
+        with self._lock:
+            now = self._clock()
+            if now < self._next_poll:
+                return set()
+            self._next_poll = now + self.min_interval
+            since = (
+                self._newest_change - self.lag
+                if self._newest_change is not None
+                else None
+            )
+
+        with self._session_scope() as session:
+            rows = _table_change_repo.list_changes(session, since=since)
+
+        changed: set[str] = set()
+        with self._lock:
+            for table_name, version, updated_at in rows:
+                if self._versions.get(table_name, 0) < version:
+                    self._versions[table_name] = version
+                    changed.add(table_name)
+                if self._newest_change is None or updated_at > self._newest_change:
+                    self._newest_change = updated_at
+        self._notify(changed)
+        return changed
+
+    def _after_transaction_end(
+        self, session: Session, transaction: SessionTransaction
+    ) -> None:
+        versions: dict[str, int | None] = session.info.get(
+            CHANGED_TABLE_VERSIONS_KEY, {}
+        )
+        if transaction.parent is not None or not versions:
+            return
+        # Remember the versions we wrote so the next poll does not report them
+        with self._lock:
+            for table_name, version in versions.items():
+                if version is not None and self._versions.get(table_name, 0) < version:
+                    self._versions[table_name] = version
+        self._notify(set(versions))
+
+    def _notify(self, tables: set[str]) -> None:
+        if not tables:
+            return
+        for listener in self._listeners:
+            listener(tables)
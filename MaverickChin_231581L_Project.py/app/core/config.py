@@ -6,6 +6,11 @@ class AppConfig:
     appointment_timeslot_min_interval_minutes: int = 10
     appointment_preferred_datetime_max_days_from_current: int = 180
     appointment_min_days_from_start_allow_cancel: int = 2
+    appointment_request_claim_lease_minutes: int = 15
+    maintenance_interval_seconds: int = 300
+    maintenance_chunk_size: int = 500
+    archive_after_days: int = 365
+    api_session_idle_minutes: int = 30
 
 
 APP_CONFIG = AppConfig()
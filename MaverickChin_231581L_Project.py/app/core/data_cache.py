@@ -0,0 +1,195 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable, TypeVar
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+
+T = TypeVar("T")
+
+_MISSING = object()
+_PENDING_TABLES_KEY = "data_cache_pending_tables"
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    tag_versions: tuple[tuple[str, int], ...]
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    entries: int
+
+
+class DataCache:
+    """
+    In-memory cache for page query results.
+
+    Entries expire after a per-key TTL, the least recently used entry is evicted
+    once max_entries is reached, and every entry records the version of each of
+    its tags when stored. Bumping a tag (see invalidate_tags) makes every entry
+    stored under an older version of it a miss. Tags are table names, bumped
+    automatically on write once bind() has been called on a session factory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        default_ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._tag_versions: dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    # -------------------------------------------------------------------------
+    # READ / WRITE
+    # -------------------------------------------------------------------------
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not self._is_fresh(entry):
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        *,
+        tags: Iterable[str] = (),
+        ttl: float | None = None,
+    ) -> None:
+        with self._lock:
+            self._store(key, value, self._snapshot(tags), ttl)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], T],
+        *,
+        tags: Iterable[str] = (),
+        ttl: float | None = None,
+    ) -> T:
+        """Return the cached value for key, calling loader on a miss."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # Snapshot before loading so a write during the load leaves it stale
+        with self._lock:
+            tag_versions = self._snapshot(tags)
+        value = loader()
+        with self._lock:
+            self._store(key, value, tag_versions, ttl)
+        return value
+
+    # -------------------------------------------------------------------------
+    # INVALIDATION
+    # -------------------------------------------------------------------------
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, len(self._entries))
+
+    # -------------------------------------------------------------------------
+    # SQLALCHEMY HOOKS
+    # -------------------------------------------------------------------------
+    def bind(self, session_factory: sessionmaker[Session]) -> None:
+        """Bump the tags of every table written through sessions of this factory."""
+        event.listen(session_factory, "after_flush", self._after_flush)
+        event.listen(session_factory, "do_orm_execute", self._on_orm_execute)
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_rollback", self._after_rollback)
+
+    def _after_flush(self, session: Session, flush_context) -> None:
+        tables = {
+            table.name
+            for obj in (*session.new, *session.dirty, *session.deleted)
+            for table in inspect(obj).mapper.tables
+        }
+        self._record_write(session, tables)
+
+    def _on_orm_execute(self, orm_execute_state: ORMExecuteState) -> None:
+        if not (
+            orm_execute_state.is_insert
+            or orm_execute_state.is_update
+            or orm_execute_state.is_delete
+        ):
+            return
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            self._record_write(orm_execute_state.session, {table.name})
+
+    def _record_write(self, session: Session, tables: Iterable[str]) -> None:
+        tables = frozenset(tables)
+        # Bump now so reads later in this transaction miss, and again on commit
+        # so nothing cached from another session mid-transaction survives.
+        self.invalidate_tags(tables)
+        session.info.setdefault(_PENDING_TABLES_KEY, set()).update(tables)
+
+    def _after_commit(self, session: Session) -> None:
+        tables = session.info.pop(_PENDING_TABLES_KEY, None)
+        if tables:
+            self.invalidate_tags(tables)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(_PENDING_TABLES_KEY, None)
+
+    # -------------------------------------------------------------------------
+    # INTERNAL
+    # -------------------------------------------------------------------------
+    def _snapshot(self, tags: Iterable[str]) -> tuple[tuple[str, int], ...]:
+        return tuple((tag, self._tag_versions.get(tag, 0)) for tag in tags)
+
+    def _is_fresh(self, entry: _Entry) -> bool:
+        if entry.expires_at <= self._clock():
+            return False
+        return all(
+            self._tag_versions.get(tag, 0) == version
+            for tag, version in entry.tag_versions
+        )
+
+    def _store(
+        self,
+        key: Hashable,
+        value: Any,
+        tag_versions: tuple[tuple[str, int], ...],
+        ttl: float | None,
+    ) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        self._entries[key] = _Entry(value, self._clock() + ttl, tag_versions)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,124 @@
+import os
+import time
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from app.core.app import App, PageListener, Repos, Services
+from app.core.change_monitor import ChangeMonitor
+from app.core.data_cache import DataCache
+from app.core.lookup_cache import LookupCache
+from app.database.engine import Database
+from app.pages.core.base_page import BasePage
+from app.ui.prompts import use_prompt_backend
+from app.ui.scripted_prompts import ScriptAnswer, ScriptedPromptBackend
+from rich.console import Console
+
+
+@dataclass(frozen=True)
+class PageTransition:
+    from_title: str
+    to_title: str | None
+    seconds: float
+
+
+@dataclass
+class SessionReport:
+    transitions: list[PageTransition] = field(default_factory=list)
+    total_seconds: float = 0.0
+    prompts_answered: int = 0
+    unanswered: int = 0
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """The script ran to the end without an error."""
+        return self.error is None and self.unanswered == 0
+
+
+def run_scripted_session(
+    db: Database,
+    repos: Repos,
+    services: Services,
+    script: Iterable[ScriptAnswer],
+    *,
+    change_monitor: ChangeMonitor | None = None,
+    data_cache: DataCache | None = None,
+    lookup_cache: LookupCache | None = None,
+    page_listeners: Sequence[PageListener] = (),
+) -> SessionReport:
+    """
+    Run the app headless, answering its prompts from script (see
+    ScriptedPromptBackend), and time every page transition. page_listeners are
+    added to the app after the one doing the timing.
+
+    Output is rendered and discarded. The session ends when the app exits or
+    the script runs out; db is left open for other sessions.
+    """
+    backend = ScriptedPromptBackend(script)
+    report = SessionReport()
+
+    def record(page: BasePage, next_page: BasePage | None, seconds: float) -> None:
+        report.transitions.append(
+            PageTransition(page.title, next_page.title if next_page else None, seconds)
+        )
+
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, use_prompt_backend(backend):
+        try:
+            app = App(
+                db=db,
+                repos=repos,
+                services=services,
+                console=Console(file=devnull, width=120),
+                change_monitor=change_monitor,
+                data_cache=data_cache,
+                lookup_cache=lookup_cache,
+                close_db_on_exit=False,
+                propagate_errors=True,
+            )
+            app.add_page_listener(record)
+            for listener in page_listeners:
+                app.add_page_listener(listener)
+            app.run()
+        except Exception as e:
+            report.error = e
+    report.total_seconds = time.perf_counter() - started
+    report.prompts_answered = backend.prompts_answered
+    report.unanswered = backend.remaining
+    return report
+
+
+def run_scripted_sessions(
+    db: Database,
+    repos: Repos,
+    services: Services,
+    scripts: Sequence[Iterable[ScriptAnswer]],
+    *,
+    max_workers: int = 8,
+) -> list[SessionReport]:
+    """Run one scripted session per script in parallel against the same database."""
+    change_monitor = ChangeMonitor(db.session_scope)
+    change_monitor.bind(db.session_factory)
+    data_cache = DataCache()
+    data_cache.bind(db.session_factory)
+    change_monitor.add_listener(data_cache.invalidate_tags)
+    lookup_cache = LookupCache(db.session_scope, repos)
+    change_monitor.add_listener(lookup_cache.invalidate_tables)
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="scripted-session"
+    ) as executor:
+        return list(
+            executor.map(
+                lambda script: run_scripted_session(
+                    db,
+                    repos,
+                    services,
+                    script,
+                    change_monitor=change_monitor,
+                    data_cache=data_cache,
+                    lookup_cache=lookup_cache,
+                ),
+                scripts,
+            )
+        )
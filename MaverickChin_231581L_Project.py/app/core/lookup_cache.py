@@ -0,0 +1,322 @@
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ContextManager,
+    Hashable,
+    Iterable,
+    Sequence,
+    TypeVar,
+)
+
+from app.database.models import Medication, Specialty
+from app.search import NGramIndex
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from app.core.app import Repos
+
+SPECIALTY = "specialty"
+MEDICATION = "medication"
+DOCTOR_ROSTER = "doctor_roster"
+
+# Tables each reference set is read from
+REFERENCE_SET_TABLES: dict[str, frozenset[str]] = {
+    SPECIALTY: frozenset({"specialty"}),
+    MEDICATION: frozenset({"medication"}),
+    DOCTOR_ROSTER: frozenset(
+        {"doctor_profile", "doctor_specialty", "profile", "person"}
+    ),
+}
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SpecialtyRef:
+    specialty_id: int
+    name: str
+    is_in_service: bool
+
+
+@dataclass(frozen=True)
+class MedicationRef:
+    medication_id: int
+    generic_name: str
+    is_in_service: bool
+
+
+@dataclass(frozen=True)
+class DoctorRosterEntry:
+    doctor_profile_id: int
+    full_name: str
+    office_phone_number: str | None
+    specialty_ids: frozenset[int]
+    is_in_service: bool
+
+
+class LookupCache:
+    """
+    In-memory copy of reference data: specialties, medications, and the doctor
+    roster (name, office phone and specialties of every doctor), with the
+    in-service flag of each.
+
+    Sets are loaded on first use and reloaded on the next lookup after a
+    write to any table they are read from (see invalidate_tables, which the
+    App's ChangeMonitor calls for writes from this and other processes).
+
+    The *_with_index lookups also return a search index for FilterInput, built
+    once per load of the sets they are read from and shared by every prompt.
+    """
+
+    def __init__(
+        self,
+        session_scope: Callable[[], ContextManager[Session]],
+        repos: Repos,
+    ):
+        self._session_scope = session_scope
+        self._repos = repos
+        self._lock = threading.RLock()
+        self._stale: set[str] = set(REFERENCE_SET_TABLES)
+
+        self._specialties: dict[int, SpecialtyRef] = {}
+        self._specialties_by_name: dict[str, int] = {}
+        self._medications: list[MedicationRef] = []
+        self._doctors: dict[int, DoctorRosterEntry] = {}
+        self._specialty_doctors: dict[int, tuple[DoctorRosterEntry, ...]] = {}
+
+        # Times each set was loaded, so an index is never kept from an older load
+        self._loads: dict[str, int] = dict.fromkeys(REFERENCE_SET_TABLES, 0)
+        # (set names, lookup key) -> (their loads, items, index over the items)
+        self._indexes: dict[
+            tuple[tuple[str, ...], Hashable],
+            tuple[tuple[int, ...], tuple, NGramIndex],
+        ] = {}
+
+        self._loaders: dict[str, Callable[[Session], None]] = {
+            SPECIALTY: self._load_specialties,
+            MEDICATION: self._load_medications,
+            DOCTOR_ROSTER: self._load_doctor_roster,
+        }
+
+    # -------------------------------------------------------------------------
+    # SPECIALTIES
+    # -------------------------------------------------------------------------
+    def get_specialty_name(self, specialty_id: int) -> str | None:
+        """Get specialty name by ID (from cache)"""
+        self._ensure_fresh(SPECIALTY)
+        specialty = self._specialties.get(specialty_id)
+        return specialty.name if specialty else None
+
+    def get_specialty_id(self, name: str) -> int | None:
+        """Get specialty ID by name (from cache)"""
+        self._ensure_fresh(SPECIALTY)
+        return self._specialties_by_name.get(name)
+
+    def is_specialty_in_service(self, specialty_id: int) -> bool:
+        self._ensure_fresh(SPECIALTY)
+        specialty = self._specialties.get(specialty_id)
+        return specialty is not None and specialty.is_in_service
+
+    def get_all_specialties(
+        self, in_service_only: bool = False
+    ) -> list[tuple[int, str]]:
+        """Get specialties as [(id, name), ...] sorted by name for UI display"""
+        self._ensure_fresh(SPECIALTY)
+        return sorted(
+            (
+                (s.specialty_id, s.name)
+                for s in self._specialties.values()
+                if s.is_in_service or not in_service_only
+            ),
+            key=lambda x: x[1],
+        )
+
+    def get_all_specialties_with_index(
+        self, in_service_only: bool = False
+    ) -> tuple[tuple[tuple[int, str], ...], NGramIndex]:
+        """get_all_specialties, with an index over the names in the same order"""
+        return self._get_with_index(
+            (SPECIALTY,),
+            in_service_only,
+            lambda: self.get_all_specialties(in_service_only),
+            lambda specialty: [specialty[1]],
+        )
+
+    # -------------------------------------------------------------------------
+    # MEDICATIONS
+    # -------------------------------------------------------------------------
+    def get_medications(self, in_service_only: bool = False) -> list[MedicationRef]:
+        """Get medications in ID order"""
+        self._ensure_fresh(MEDICATION)
+        if not in_service_only:
+            return list(self._medications)
+        return [m for m in self._medications if m.is_in_service]
+
+    def get_medications_with_index(
+        self, in_service_only: bool = False
+    ) -> tuple[tuple[MedicationRef, ...], NGramIndex]:
+        """get_medications, with an index over the generic names in the same order"""
+        return self._get_with_index(
+            (MEDICATION,),
+            in_service_only,
+            lambda: self.get_medications(in_service_only),
+            lambda medication: [medication.generic_name],
+        )
+
+    # -------------------------------------------------------------------------
+    # DOCTOR ROSTER
+    # -------------------------------------------------------------------------
+    def get_doctor(self, doctor_profile_id: int) -> DoctorRosterEntry | None:
+        self._ensure_fresh(DOCTOR_ROSTER)
+        return self._doctors.get(doctor_profile_id)
+
+    def get_specialty_ids_for_doctor(self, doctor_profile_id: int) -> frozenset[int]:
+        doctor = self.get_doctor(doctor_profile_id)
+        return doctor.specialty_ids if doctor else frozenset()
+
+    def get_doctors_for_specialty(
+        self, specialty_id: int, active_only: bool = True
+    ) -> list[DoctorRosterEntry]:
+        """
+        Doctors practising a specialty, sorted by name.
+
+        :param active_only: Only in-service doctors, and none at all if the
+            specialty itself is out of service.
+        """
+        if active_only and not self.is_specialty_in_service(specialty_id):
+            return []
+        self._ensure_fresh(DOCTOR_ROSTER)
+        doctors = self._specialty_doctors.get(specialty_id, ())
+        return [d for d in doctors if d.is_in_service or not active_only]
+
+    def get_doctors_for_specialty_with_index(
+        self, specialty_id: int, active_only: bool = True
+    ) -> tuple[tuple[DoctorRosterEntry, ...], NGramIndex]:
+        """
+        get_doctors_for_specialty, with an index over the doctors' names and
+        office phone numbers in the same order.
+        """
+        return self._get_with_index(
+            (SPECIALTY, DOCTOR_ROSTER),
+            (specialty_id, active_only),
+            lambda: self.get_doctors_for_specialty(specialty_id, active_only),
+            lambda doctor: [doctor.full_name, doctor.office_phone_number],
+        )
+
+    # -------------------------------------------------------------------------
+    # FRESHNESS
+    # -------------------------------------------------------------------------
+    def invalidate(self) -> None:
+        """Reload every set on its next lookup."""
+        with self._lock:
+            self._stale.update(REFERENCE_SET_TABLES)
+
+    def invalidate_tables(self, tables: Iterable[str]) -> None:
+        """Reload the sets read from any of these tables on their next lookup."""
+        tables = frozenset(tables)
+        with self._lock:
+            self._stale.update(
+                name
+                for name, set_tables in REFERENCE_SET_TABLES.items()
+                if not set_tables.isdisjoint(tables)
+            )
+
+    def _ensure_fresh(self, name: str) -> None:
+        with self._lock:
+            if name not in self._stale:
+                return
+
+        # Opening a session may take the database lock. Take it before our own
+        # lock, as callers already inside a session scope do, to avoid deadlock
+        with self._session_scope() as session, self._lock:
+            if name in self._stale:
+                self._loaders[name](session)
+                self._stale.discard(name)
+                self._loads[name] += 1
+                for key in [key for key in self._indexes if name in key[0]]:
+                    del self._indexes[key]
+
+    def _get_with_index(
+        self,
+        names: tuple[str, ...],
+        key: Hashable,
+        get_items: Callable[[], Sequence[T]],
+        fields: Callable[[T], Sequence[str | None]],
+    ) -> tuple[tuple[T, ...], NGramIndex]:
+        for name in names:
+            self._ensure_fresh(name)
+        with self._lock:
+            loads = tuple(self._loads[name] for name in names)
+            cached = self._indexes.get((names, key))
+        if cached is not None and cached[0] == loads:
+            return cached[1], cached[2]
+
+        # Built outside the lock; only kept if no set was reloaded meanwhile
+        items = tuple(get_items())
+        index = NGramIndex.from_fields(fields(item) for item in items)
+        with self._lock:
+            if loads == tuple(self._loads[name] for name in names):
+                self._indexes[(names, key)] = (loads, items, index)
+        return items, index
+
+    def _load_specialties(self, session: Session) -> None:
+        specialties = self._repos.specialty.get_all(
+            session, order_by=[Specialty.specialty_id]
+        )
+        self._specialties = {
+            s.specialty_id: SpecialtyRef(s.specialty_id, s.name, s.is_in_service)
+            for s in specialties
+        }
+        self._specialties_by_name = {s.name: s.specialty_id for s in specialties}
+
+    def _load_medications(self, session: Session) -> None:
+        medications = self._repos.medication.get_all(
+            session, order_by=[Medication.medication_id]
+        )
+        self._medications = [
+            MedicationRef(m.medication_id, m.generic_name, m.is_in_service)
+            for m in medications
+        ]
+
+    def _load_doctor_roster(self, session: Session) -> None:
+        details: dict[int, tuple[str, str | None, bool]] = {}
+        specialty_ids: defaultdict[int, set[int]] = defaultdict(set)
+        for (
+            doctor_profile_id,
+            first_name,
+            last_name,
+            office_phone_number,
+            is_in_service,
+            specialty_id,
+        ) in self._repos.doctor_profile.list_roster_rows(session):
+            details[doctor_profile_id] = (
+                f"{first_name} {last_name}",
+                office_phone_number,
+                is_in_service,
+            )
+            if specialty_id is not None:
+                specialty_ids[doctor_profile_id].add(specialty_id)
+
+        doctors = {
+            doctor_profile_id: DoctorRosterEntry(
+                doctor_profile_id,
+                full_name,
+                office_phone_number,
+                frozenset(specialty_ids[doctor_profile_id]),
+                is_in_service,
+            )
+            for doctor_profile_id, (
+                full_name,
+                office_phone_number,
+                is_in_service,
+            ) in details.items()
+        }
+        by_specialty: defaultdict[int, list[DoctorRosterEntry]] = defaultdict(list)
+        for doctor in sorted(doctors.values(), key=lambda d: d.full_name):
+            for specialty_id in doctor.specialty_ids:
+                by_specialty[specialty_id].append(doctor)
+        self._doctors = doctors
+        self._specialty_doctors = {k: tuple(v) for k, v in by_specialty.items()}
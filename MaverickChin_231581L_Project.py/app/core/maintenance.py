@@ -0,0 +1,201 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, ContextManager
+
+from app.core.config import AppConfig
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from app.core.app import Services
+    from app.services import BulkChunk
+
+# Runs one chunk of a task in the given transaction
+MaintenanceChunk = Callable[[Session, datetime, int], "BulkChunk"]
+
+
+@dataclass(frozen=True)
+class MaintenanceTaskRun:
+    rows: int
+    chunks: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class MaintenanceRun:
+    started: datetime
+    seconds: float
+    # Task name -> what it did, in the order tasks ran
+    tasks: dict[str, MaintenanceTaskRun]
+    error: str | None = None
+
+    @property
+    def rows(self) -> int:
+        return sum(task.rows for task in self.tasks.values())
+
+
+@dataclass
+class MaintenanceMetrics:
+    runs: int = 0
+    failed_runs: int = 0
+    seconds: float = 0.0
+    # Task name -> rows changed over all runs
+    rows: dict[str, int] = field(default_factory=dict)
+    last_run: MaintenanceRun | None = None
+
+
+class MaintenanceScheduler:
+    """
+    Applies time-driven state transitions nobody is on a page to make:
+
+        mark_missed      scheduled appointments that have started -> missed,
+                         prescriptions removed (as update_appointment_missed)
+        expire_requests  pending requests whose preferred datetime passed
+                         -> rejected
+        archive_requests handled requests older than archive_after -> archive
+        archive_appointments
+                         closed appointments that ended over archive_after
+                         ago -> archive, with their prescriptions
+
+    Each task runs as set-based statements on up to chunk_size rows, one
+    transaction per chunk, until a chunk finds nothing left. run_once() runs every task
+    once; start() does so every interval seconds on a daemon thread until
+    stop(). Every task is idempotent, so several processes may run one.
+    """
+
+    def __init__(
+        self,
+        session_scope: Callable[[], ContextManager[Session]],
+        services: Services,
+        *,
+        interval: float = AppConfig.maintenance_interval_seconds,
+        chunk_size: int = AppConfig.maintenance_chunk_size,
+        archive_after: timedelta = timedelta(days=AppConfig.archive_after_days),
+        clock: Callable[[], datetime] = datetime.now,
+        on_run: Callable[[MaintenanceRun], None] | None = None,
+    ):
+        """:param on_run: Called after every run, e.g. to log it."""
+        self._session_scope = session_scope
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self._clock = clock
+        self._on_run = on_run
+        self.tasks: dict[str, MaintenanceChunk] = {
+            "mark_missed": lambda session, now, limit: (
+                services.appointment.update_appointments_missed_before(
+                    session, now, limit=limit
+                )
+            ),
+            "expire_requests": lambda session, now, limit: (
+                services.appointment.update_appointment_requests_expired_before(
+                    session, now, limit=limit
+                )
+            ),
+            # Requests first: they hold the only references to appointments
+            "archive_requests": lambda session, now, limit: (
+                services.appointment.archive_appointment_requests_before(
+                    session, now - archive_after, limit=limit
+                )
+            ),
+            "archive_appointments": lambda session, now, limit: (
+                services.appointment.archive_appointments_before(
+                    session, now - archive_after, limit=limit
+                )
+            ),
+        }
+        self.metrics = MaintenanceMetrics()
+        self._metrics_lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # -------------------------------------------------------------------------
+    # RUNNING
+    # -------------------------------------------------------------------------
+    def run_once(self) -> MaintenanceRun:
+        """
+        Run every task to completion. A failing task is recorded in the
+        returned run's error and the tasks after it are skipped.
+        """
+        with self._run_lock:
+            started = self._clock()
+            run_started = time.perf_counter()
+            tasks: dict[str, MaintenanceTaskRun] = {}
+            error = None
+            for name, run_chunk in self.tasks.items():
+                task_started = time.perf_counter()
+                try:
+                    rows, chunks = self._run_task(run_chunk, started)
+                except Exception as e:
+                    error = f"{name}: {type(e).__name__}: {e}"
+                    break
+                tasks[name] = MaintenanceTaskRun(
+                    rows, chunks, time.perf_counter() - task_started
+                )
+            run = MaintenanceRun(
+                started, time.perf_counter() - run_started, tasks, error
+            )
+
+        with self._metrics_lock:
+            self.metrics.runs += 1
+            self.metrics.failed_runs += error is not None
+            self.metrics.seconds += run.seconds
+            for name, task in tasks.items():
+                self.metrics.rows[name] = self.metrics.rows.get(name, 0) + task.rows
+            self.metrics.last_run = run
+        if self._on_run is not None:
+            self._on_run(run)
+        return run
+
+    def _run_task(self, run_chunk: MaintenanceChunk, now: datetime) -> tuple[int, int]:
+        rows = chunks = 0
+        while True:
+            with self._session_scope() as session:
+                chunk = run_chunk(session, now, self.chunk_size)
+            # Rows found but handled concurrently change nothing; more may remain
+            if chunk.found == 0:
+                return rows, chunks
+            rows += chunk.changed
+            chunks += 1
+
+    # -------------------------------------------------------------------------
+    # BACKGROUND THREAD
+    # -------------------------------------------------------------------------
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Run now, then every interval seconds, on a daemon thread."""
+        if self.is_running:
+            raise ValueError("Maintenance scheduler is already running.")
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="maintenance", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the thread, waiting for a run in progress to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+
+def format_run(run: MaintenanceRun) -> str:
+    """One-line summary of a run for logs."""
+    tasks = ", ".join(
+        f"{name} {task.rows} rows in {task.seconds * 1000:.0f} ms"
+        for name, task in run.tasks.items()
+    )
+    summary = f"{run.started:%Y-%m-%d %H:%M:%S} {tasks or 'no tasks'}"
+    if run.error is not None:
+        summary += f"; failed {run.error}"
+    return summary
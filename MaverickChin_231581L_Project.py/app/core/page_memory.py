@@ -0,0 +1,160 @@
+import inspect
+import tracemalloc
+from dataclasses import dataclass
+
+from app.pages.core.base_page import BasePage
+from rich.console import Console
+from rich.table import Table
+
+
+@dataclass(frozen=True)
+class PageMemorySample:
+    from_title: str
+    to_title: str | None
+    # Traced bytes still allocated, over what was allocated at start()
+    retained_bytes: int
+
+
+class PageMemoryTracker:
+    """
+    Page listener (see App.add_page_listener) that measures the memory traced
+    by tracemalloc after every page transition, and snapshots it at the peak.
+
+    report() attributes each allocation alive at the peak to the innermost page
+    class whose module is on its traceback, so frames must be deep enough to
+    reach page code from inside SQLAlchemy and rich.
+    """
+
+    def __init__(self, *, frames: int = 64, top: int = 15):
+        """
+        :param frames: Traceback depth stored per allocation.
+        :param top: Allocation sites listed by report().
+        """
+        self.frames = frames
+        self.top = top
+        self.samples: list[PageMemorySample] = []
+        self._started_tracing = False
+        self._baseline_bytes = 0
+        self._first: tracemalloc.Snapshot | None = None
+        self._peak: tracemalloc.Snapshot | None = None
+        self._peak_snapshot_bytes = 0
+        # Page module file -> page class name
+        self._page_files: dict[str, str] = {}
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._first = tracemalloc.take_snapshot()
+        self._baseline_bytes = tracemalloc.get_traced_memory()[0]
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __call__(
+        self, page: BasePage, next_page: BasePage | None, seconds: float
+    ) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        for seen in (page, next_page):
+            if seen is not None:
+                self._page_files.setdefault(
+                    inspect.getfile(type(seen)), type(seen).__name__
+                )
+        retained_bytes = (
+            tracemalloc.get_traced_memory()[0]
+            - self._baseline_bytes
+            - self._peak_snapshot_bytes
+        )
+        peak = self.peak
+        self.samples.append(
+            PageMemorySample(
+                page.title, next_page.title if next_page else None, retained_bytes
+            )
+        )
+        if peak is None or retained_bytes > peak.retained_bytes:
+            # Snapshots are traced too; the one kept is not counted as retained
+            self._peak = None
+            before = tracemalloc.get_traced_memory()[0]
+            self._peak = tracemalloc.take_snapshot()
+            self._peak_snapshot_bytes = tracemalloc.get_traced_memory()[0] - before
+
+    @property
+    def peak(self) -> PageMemorySample | None:
+        return max(self.samples, key=lambda s: s.retained_bytes, default=None)
+
+    def retained_by_page_class(self) -> dict[str, int]:
+        """Bytes alive at the peak, by the page class whose run() allocated them."""
+        if self._peak is None:
+            return {}
+        totals: dict[str, int] = {}
+        for stat in self._peak.statistics("traceback"):
+            page_class = next(
+                (
+                    self._page_files[frame.filename]
+                    for frame in reversed(stat.traceback)
+                    if frame.filename in self._page_files
+                ),
+                None,
+            )
+            if page_class is not None:
+                totals[page_class] = totals.get(page_class, 0) + stat.size
+        return totals
+
+    def report(self, console: Console) -> None:
+        """Print memory per transition, per page class, and where it grew most."""
+        if not self.samples or self._first is None or self._peak is None:
+            return
+        table = Table(
+            title="Memory retained after each transition", title_justify="left"
+        )
+        table.add_column("#", justify="right")
+        table.add_column("Transition")
+        table.add_column("Retained KiB", justify="right")
+        for index, sample in enumerate(self.samples, 1):
+            table.add_row(
+                str(index),
+                f"{sample.from_title} -> {sample.to_title or '(exit)'}",
+                f"{sample.retained_bytes / 1024:,.0f}",
+            )
+        console.print(table)
+
+        peak = self.peak
+        assert peak is not None
+        table = Table(title="Retained by page class, at peak", title_justify="left")
+        table.add_column("Page")
+        table.add_column("KiB", justify="right")
+        for page_class, size in sorted(
+            self.retained_by_page_class().items(),
+            key=lambda item: item[1],
+            reverse=True,
+        ):
+            table.add_row(page_class, f"{size / 1024:,.0f}")
+        console.print(table)
+
+        table = Table(title="Top allocation sites, at peak", title_justify="left")
+        table.add_column("Site")
+        table.add_column("KiB", justify="right")
+        table.add_column("Blocks", justify="right")
+        ignored = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ]
+        growth = self._peak.filter_traces(ignored).compare_to(
+            self._first.filter_traces(ignored), "lineno"
+        )
+        for stat in growth[: self.top]:
+            frame = stat.traceback[0]
+            table.add_row(
+                f"{frame.filename}:{frame.lineno}",
+                f"{stat.size_diff / 1024:,.0f}",
+                f"{stat.count_diff:,}",
+            )
+        console.print(table)
+        console.print(
+            f"Peak retained: {peak.retained_bytes / 1024 / 1024:.1f} MiB after "
+            f"{peak.from_title} -> {peak.to_title or '(exit)'}"
+        )
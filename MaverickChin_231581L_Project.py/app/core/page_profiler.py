@@ -0,0 +1,88 @@
+import cProfile
+import io
+import pstats
+import re
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.pages.core.base_page import BasePage
+from rich.console import Console
+from rich.table import Table
+
+
+@dataclass
+class PageVisitTotals:
+    visits: int = 0
+    seconds: float = 0.0
+
+
+class PageProfiler:
+    """
+    Profiles each page.run() with cProfile and dumps it to its own file in
+    output_dir, named {visit}_{page class}_{page title}.prof. Open one with
+    pstats or snakeviz; summary() adds them all up.
+    """
+
+    def __init__(self, output_dir: Path, *, top: int = 30):
+        """
+        :param top: Functions listed by summary(), by cumulative time.
+        """
+        self.output_dir = output_dir
+        self.top = top
+        self.paths: list[Path] = []
+        # (page class, page title) -> wall time spent in page.run()
+        self.totals: dict[tuple[str, str], PageVisitTotals] = {}
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def profile(self, page: BasePage) -> Generator[None, None, None]:
+        """Profile the block as one visit to page, even if it raises."""
+        # Read before running: some titles change with what the page does
+        key = (type(page).__name__, page.title)
+        path = self.output_dir / (
+            f"{len(self.paths) + 1:04d}_{key[0]}_{_slug(key[1])}.prof"
+        )
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            profiler.dump_stats(path)
+            self.paths.append(path)
+            totals = self.totals.setdefault(key, PageVisitTotals())
+            totals.visits += 1
+            totals.seconds += elapsed
+
+    def summary(self, console: Console) -> None:
+        """Print time per page, then the top functions over every visit."""
+        if not self.paths:
+            return
+        table = Table(title="Time per page", title_justify="left")
+        table.add_column("Page")
+        table.add_column("Title")
+        table.add_column("Visits", justify="right")
+        table.add_column("Seconds", justify="right")
+        for (page_class, title), totals in sorted(
+            self.totals.items(), key=lambda item: item[1].seconds, reverse=True
+        ):
+            table.add_row(
+                page_class, title, str(totals.visits), f"{totals.seconds:.3f}"
+            )
+        console.print(table)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(*map(str, self.paths), stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        console.print(stream.getvalue(), markup=False, highlight=False, soft_wrap=True)
+        console.print(f"{len(self.paths)} page profiles written to {self.output_dir}")
+
+
+def _slug(title: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", title).strip("-").lower()
+    return slug[:60].rstrip("-") or "untitled"
@@ -0,0 +1,81 @@
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from app.database.models import ARCHIVE_TABLES
+from app.database.models.archive import ARCHIVED_DATETIME_COLUMN
+from sqlalchemy import CTE, Column, MetaData, Table, event, select
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+
+# session.info key: set while SELECTs should read archived rows too
+INCLUDE_ARCHIVED_KEY = "include_archived"
+
+
+def read_archives_on_request(session_factory: sessionmaker[Session]) -> None:
+    """
+    Let reading_archives() widen SELECTs through sessions of this factory to the
+    archive tables. Safe to call more than once.
+    """
+    if event.contains(session_factory, "do_orm_execute", _add_archive_ctes):
+        return
+    event.listen(session_factory, "do_orm_execute", _add_archive_ctes)
+
+
+@contextmanager
+def reading_archives(
+    session: Session, enabled: bool = True
+) -> Generator[None, None, None]:
+    """
+    While open, every SELECT through session, including relationship loads,
+    reads each archived table as its hot rows UNION ALL its archived rows.
+
+    A no-op if not enabled, or if read_archives_on_request was never called for
+    the session's factory.
+    """
+    if not enabled or session.info.get(INCLUDE_ARCHIVED_KEY):
+        yield
+        return
+    session.info[INCLUDE_ARCHIVED_KEY] = True
+    try:
+        yield
+    finally:
+        del session.info[INCLUDE_ARCHIVED_KEY]
+
+
+def _add_archive_ctes(orm_execute_state: ORMExecuteState) -> None:
+    session = orm_execute_state.session
+    if not orm_execute_state.is_select or not session.info.get(INCLUDE_ARCHIVED_KEY):
+        return
+    schema = session.get_bind().dialect.default_schema_name
+    orm_execute_state.statement = orm_execute_state.statement.add_cte(
+        *_archive_ctes(schema)
+    )
+
+
+# Default schema name -> CTEs; built once per dialect
+_ctes_by_schema: dict[str | None, tuple[CTE, ...]] = {}
+
+
+def _archive_ctes(schema: str | None) -> tuple[CTE, ...]:
+    """
+    A CTE per archived table, named like the hot table so that it shadows it in
+    whatever statement it is added to. The CTE itself reads the hot table by its
+    schema-qualified name.
+    """
+    ctes = _ctes_by_schema.get(schema)
+    if ctes is None:
+        metadata = MetaData(schema=schema)
+        built = []
+        for name, archive in ARCHIVE_TABLES.items():
+            columns = [
+                column
+                for column in archive.columns
+                if column.name != ARCHIVED_DATETIME_COLUMN
+            ]
+            hot = Table(
+                name,
+                metadata,
+                *(Column(column.name, column.type) for column in columns),
+            )
+            built.append(select(hot).union_all(select(*columns)).cte(name))
+        ctes = _ctes_by_schema[schema] = tuple(built)
+    return ctes
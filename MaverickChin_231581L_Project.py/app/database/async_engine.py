@@ -0,0 +1,128 @@
+from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from app.database.archive_reads import read_archives_on_request
+from app.database.change_tracking import track_table_changes
+from app.database.models import Base
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+
+
+class TrackedSession(Session):
+    """
+    Sync session behind each AsyncSession; tracks table changes and reads
+    archives on request as Database does.
+    """
+
+
+track_table_changes(TrackedSession)
+read_archives_on_request(TrackedSession)
+
+
+class AsyncDatabase(ABC):
+    """
+    Async counterpart of Database, for serving many concurrent clients from one
+    event loop. Needs greenlet and an async driver (aiosqlite / aiomysql).
+    """
+
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+
+    @abstractmethod
+    def _create_engine(self) -> AsyncEngine:
+        """Create the SQLAlchemy async engine (implemented by subclasses)"""
+        pass
+
+    def _initialize(self):
+        """Initialize engine and session factory"""
+        self.engine = self._create_engine()
+        self.session_factory = async_sessionmaker(
+            bind=self.engine,
+            expire_on_commit=False,
+            sync_session_class=TrackedSession,
+        )
+
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncGenerator[AsyncSession, None]:
+        """Provide a transactional scope for a series of operations"""
+        async with self.session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def create_all(self):
+        """Create any missing tables"""
+        async with self.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    async def close(self):
+        """Close all connections"""
+        await self.engine.dispose()
+
+
+class AsyncMySQLDatabase(AsyncDatabase):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 3306,
+        username: str = "root",
+        password: str = "",
+        database: str = "my_app",
+    ):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.database = database
+        self._initialize()
+
+    def _create_engine(self):
+        db_url = f"mysql+aiomysql://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}"
+        return create_async_engine(
+            db_url,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            pool_size=20,
+            max_overflow=20,
+            echo=False,
+        )
+
+
+class AsyncSQLiteDatabase(AsyncDatabase):
+    def __init__(self, db_path):
+        super().__init__()
+        self.db_path = db_path
+        self._initialize()
+
+    def _create_engine(self):
+        db_url = f"sqlite+aiosqlite:///{self.db_path}"
+        # SQLite runs one writer at a time, so tasks queue for a single
+        # connection rather than busy-waiting on the file lock
+        engine = create_async_engine(
+            db_url,
+            connect_args={"timeout": 30},
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=300,
+            echo=False,
+        )
+
+        # Enable foreign keys for SQLite
+        @event.listens_for(engine.sync_engine, "connect")
+        def _enable_foreign_keys(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+        return engine
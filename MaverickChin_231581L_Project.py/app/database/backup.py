@@ -0,0 +1,270 @@
+import io
+import json
+import zipfile
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from app.database.bulk_export import write_jsonl
+from app.database.change_tracking import mark_tables_changed
+from app.database.engine import Database
+from app.database.models import Base, TableChange
+from sqlalchemy import Connection, Date, DateTime, Index, Table, delete, func, select
+
+FORMAT_NAME = "hms-backup"
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+# Change versions belong to the database, not its rows: restoring them could
+# move a version backwards and hide the restore from ChangeMonitor
+EXCLUDED_TABLES = frozenset({TableChange.__tablename__})
+
+
+@dataclass
+class BackupSummary:
+    # Table name -> rows, in FK-dependency order
+    table_rows: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.table_rows.values())
+
+
+def backup_database(
+    db: Database, path: Path, *, chunk_size: int = 5000
+) -> BackupSummary:
+    """
+    Dump every table but EXCLUDED_TABLES to a zip archive of one deflated
+    JSONL member per table, plus a manifest of the table order, columns and row
+    counts.
+
+    Tables are read in FK-dependency order and each is streamed chunk_size rows
+    at a time, so memory does not grow with the size of the database.
+    """
+    summary = BackupSummary()
+    manifest_tables = []
+    with (
+        db.session_scope() as session,
+        zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive,
+    ):
+        connection = session.connection()
+        for table in _backup_tables():
+            stmt = (
+                select(table)
+                .order_by(*table.primary_key.columns)
+                .execution_options(yield_per=chunk_size)
+            )
+            with (
+                archive.open(_member_name(table.name), "w", force_zip64=True) as member,
+                io.TextIOWrapper(member, encoding="utf-8", newline="\n") as output,
+            ):
+                rows = write_jsonl(connection.execute(stmt), output)
+            summary.table_rows[table.name] = rows
+            manifest_tables.append(
+                {
+                    "name": table.name,
+                    "columns": [column.name for column in table.columns],
+                    "rows": rows,
+                }
+            )
+
+        manifest = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "created": datetime.now().isoformat(),
+            "dialect": db.engine.dialect.name,
+            "tables": manifest_tables,
+        }
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+    return summary
+
+
+def restore_database(
+    db: Database,
+    path: Path,
+    *,
+    chunk_size: int = 5000,
+    replace: bool = False,
+) -> BackupSummary:
+    """
+    Load an archive written by backup_database into db, whose schema must
+    already exist, in a single transaction.
+
+    Every row is read and decoded once before anything is changed, so a
+    damaged archive fails without touching the database. Rows are then
+    inserted in FK-dependency order with executemany batches of chunk_size,
+    and every table restored (or emptied by replace) is bumped in table_change
+    once they commit. EXCLUDED_TABLES are never touched.
+    Secondary indexes are dropped first and rebuilt once every row is in,
+    rather than updated row by row; if the load fails they are rebuilt anyway.
+
+    Not atomic on MySQL: dropping an index commits implicitly, so with replace
+    a failed restore can leave the tables emptied.
+
+    :param replace: Delete every existing row first. Otherwise every table in
+        the archive must be empty.
+    :raises ValueError: If the archive is not a backup, names tables or columns
+        this schema lacks, has rows that cannot be decoded or a row count that
+        does not match its manifest, or a table to restore into already has
+        rows.
+    """
+    summary = BackupSummary()
+    if not zipfile.is_zipfile(path):
+        raise ValueError(f"{path} is not a zip archive; not a backup.")
+    with zipfile.ZipFile(path) as archive:
+        manifest = _read_manifest(archive)
+        archived = {table["name"]: table for table in manifest["tables"]}
+        tables = [t for t in _backup_tables() if t.name in archived]
+        for table in tables:
+            unknown = set(archived[table.name]["columns"]) - set(table.columns.keys())
+            if unknown:
+                raise ValueError(
+                    f"Table {table.name} in backup has unknown columns: "
+                    f"{', '.join(sorted(unknown))}."
+                )
+            rows = sum(1 for _ in _read_rows(archive, table))
+            if rows != archived[table.name]["rows"]:
+                raise ValueError(
+                    f"Table {table.name} in backup has {rows} rows, but its "
+                    f"manifest lists {archived[table.name]['rows']}."
+                )
+
+        deferred: list[Index] = []
+        try:
+            with db.session_scope() as session:
+                connection = session.connection()
+                if replace:
+                    for table in reversed(_backup_tables()):
+                        connection.execute(delete(table))
+                    mark_tables_changed(
+                        session, {table.name for table in _backup_tables()}
+                    )
+                else:
+                    for table in tables:
+                        if connection.scalar(select(func.count()).select_from(table)):
+                            raise ValueError(
+                                f"Table {table.name} is not empty. Restore into "
+                                "an empty database or replace existing rows."
+                            )
+
+                deferred = [
+                    index
+                    for table in tables
+                    for index in _deferrable_indexes(table, connection)
+                ]
+                for index in deferred:
+                    index.drop(connection)
+
+                for table in tables:
+                    summary.table_rows[table.name] = _insert_rows(
+                        connection, table, archive, chunk_size
+                    )
+
+                for index in deferred:
+                    index.create(connection)
+                # Written on the connection, which the session's events miss
+                mark_tables_changed(session, set(summary.table_rows))
+        finally:
+            # The drops may have committed on their own (always on MySQL, and on
+            # SQLite before the first row is written), so a rollback need not
+            # bring the indexes back
+            for index in deferred:
+                index.create(db.engine, checkfirst=True)
+    return summary
+
+
+def _backup_tables() -> list[Table]:
+    """Tables to back up and restore, in FK-dependency order."""
+    return [t for t in Base.metadata.sorted_tables if t.name not in EXCLUDED_TABLES]
+
+
+def _member_name(table_name: str) -> str:
+    return f"{table_name}.jsonl"
+
+
+def _read_manifest(archive: zipfile.ZipFile) -> dict[str, Any]:
+    try:
+        manifest = json.loads(archive.read(MANIFEST_NAME))
+    except KeyError:
+        raise ValueError(f"Archive has no {MANIFEST_NAME}; not a backup.") from None
+    if manifest.get("format") != FORMAT_NAME:
+        raise ValueError("Archive is not a backup.")
+    if manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported backup version {manifest.get('version')}.")
+
+    table_names = set(Base.metadata.tables)
+    unknown = [t["name"] for t in manifest["tables"] if t["name"] not in table_names]
+    if unknown:
+        raise ValueError(f"Backup has unknown tables: {', '.join(unknown)}.")
+    return manifest
+
+
+def _deferrable_indexes(table: Table, connection: Connection) -> list[Index]:
+    """Indexes that can be rebuilt after loading table."""
+    if connection.dialect.name != "mysql":
+        return list(table.indexes)
+    # InnoDB will not drop an index that is the only one backing a foreign key
+    fk_columns = {fk.parent.name for fk in table.foreign_keys}
+    return [
+        index
+        for index in table.indexes
+        if next(iter(index.columns)).name not in fk_columns
+    ]
+
+
+def _insert_rows(
+    connection: Connection, table: Table, archive: zipfile.ZipFile, chunk_size: int
+) -> int:
+    rows = _read_rows(archive, table)
+    count = 0
+    while chunk := list(islice(rows, chunk_size)):
+        connection.execute(table.insert(), chunk)
+        count += len(chunk)
+    return count
+
+
+def _read_rows(archive: zipfile.ZipFile, table: Table) -> Iterator[dict[str, Any]]:
+    """Decoded rows of table's member, streamed one line at a time."""
+    member_name = _member_name(table.name)
+    try:
+        member = archive.open(member_name)
+    except KeyError:
+        raise ValueError(f"Backup has no {member_name}.") from None
+    decoders = _column_decoders(table)
+    columns = set(table.columns.keys())
+    with member, io.TextIOWrapper(member, encoding="utf-8") as lines:
+        for line_number, line in enumerate(lines, 1):
+            try:
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError("not a JSON object")
+                unknown = row.keys() - columns
+                if unknown:
+                    raise ValueError(f"unknown columns {', '.join(sorted(unknown))}")
+                row = _decode_row(row, decoders)
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"{member_name} line {line_number}: {e}.") from None
+            yield row
+
+
+def _column_decoders(table: Table) -> dict[str, Callable[[str], Any]]:
+    """Parsers for the columns JSONL holds as ISO 8601 strings."""
+    decoders: dict[str, Callable[[str], Any]] = {}
+    for column in table.columns:
+        if isinstance(column.type, DateTime):
+            decoders[column.name] = datetime.fromisoformat
+        elif isinstance(column.type, Date):
+            decoders[column.name] = date.fromisoformat
+    return decoders
+
+
+def _decode_row(
+    row: dict[str, Any], decoders: dict[str, Callable[[str], Any]]
+) -> dict[str, Any]:
+    for name, decode in decoders.items():
+        value = row.get(name)
+        if value is not None:
+            row[name] = decode(value)
+    return row
@@ -0,0 +1,3 @@
+from app.database.bulk_export.writers import write_csv, write_jsonl
+
+__all__ = ["write_csv", "write_jsonl"]
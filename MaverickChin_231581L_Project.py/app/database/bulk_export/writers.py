@@ -0,0 +1,55 @@
+import csv
+import json
+from datetime import date, datetime
+from typing import Any, TextIO
+
+from sqlalchemy import Result
+
+
+def write_csv(result: Result, output: TextIO) -> int:
+    """
+    Write result to output as CSV, header first, one row at a time.
+
+    Datetimes are written as ISO 8601 and NULLs as empty fields.
+
+    :return: Number of rows written (excluding the header).
+    """
+    writer = csv.writer(output)
+    writer.writerow(result.keys())
+    count = 0
+    for row in result:
+        writer.writerow([_csv_value(value) for value in row])
+        count += 1
+    return count
+
+
+def write_jsonl(result: Result, output: TextIO) -> int:
+    """
+    Write result to output as JSON Lines, one object per row keyed by column
+    name, one row at a time.
+
+    :return: Number of rows written.
+    """
+    keys = list(result.keys())
+    count = 0
+    for row in result:
+        output.write(
+            json.dumps(dict(zip(keys, row)), default=_json_default, ensure_ascii=False)
+        )
+        output.write("\n")
+        count += 1
+    return count
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serialisable")
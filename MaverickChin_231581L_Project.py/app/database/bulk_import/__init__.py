@@ -0,0 +1,3 @@
+from app.database.bulk_import.patients import ImportSummary, import_patients
+
+__all__ = ["ImportSummary", "import_patients"]
@@ -0,0 +1,414 @@
+import csv
+import json
+import operator
+import re
+from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import islice, repeat
+from pathlib import Path
+from typing import Any, TextIO
+
+from app.database.engine import Database
+from app.database.models import PatientProfile, Person, Profile, User
+from app.lookups.enums import ProfileTypeEnum, SexEnum
+from app.services.security_service import SecurityService
+from app.validators import (
+    validate_date,
+    validate_date_relation,
+    validate_email,
+    validate_password,
+    validate_phone_number,
+)
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+REQUIRED_FIELDS = (
+    "username",
+    "password",
+    "first_name",
+    "last_name",
+    "date_of_birth",
+    "primary_email",
+    "primary_phone_number",
+    "primary_home_address",
+)
+OPTIONAL_FIELDS = ("sex", "medication_allergies")
+
+# Mirrors the String(n) column lengths of User / Person
+MAX_LENGTHS = {
+    "username": 64,
+    "first_name": 50,
+    "last_name": 50,
+    "primary_email": 254,
+    "primary_phone_number": 32,
+    "primary_home_address": 255,
+}
+
+ERROR_REPORT_HEADER = ("line_number", "username", "error")
+
+# Person columns set from an import row, in ImportRow.values
+PERSON_COLUMNS = (
+    Person.sex,
+    Person.first_name,
+    Person.last_name,
+    Person.date_of_birth,
+    Person.primary_email,
+    Person.primary_phone_number,
+    Person.primary_home_address,
+)
+
+# What a driver's constraint / value error failed on, e.g. "user.username" from
+# SQLite's "UNIQUE constraint failed: user.username" or MySQL's "... for key
+# 'user.username'"
+_FAILED_ON = re.compile(r"(?:constraint failed:|for key|for column)\s+'?([\w.]+)")
+
+
+@dataclass
+class ImportRow:
+    line_number: int
+    values: dict[str, Any]
+    password_hash: str | None = None
+
+
+@dataclass
+class ImportSummary:
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_failed: int = 0
+    errors_by_reason: dict[str, int] = field(default_factory=dict)
+
+
+def import_patients(
+    db: Database,
+    security_service: SecurityService,
+    source_path: Path,
+    error_report_path: Path,
+    *,
+    batch_size: int = 500,
+    workers: int | None = None,
+) -> ImportSummary:
+    """
+    Stream user accounts with patient profiles from a CSV or JSONL file.
+
+    Rows are read, validated, password-hashed and inserted one batch at a time,
+    so memory use is bounded by batch_size rather than by the file size. Every
+    rejected row is written to the error report as (line_number, username, error).
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+
+    summary = ImportSummary()
+    with (
+        open(error_report_path, "w", newline="", encoding="utf-8") as report_file,
+        ProcessPoolExecutor(max_workers=workers) as executor,
+    ):
+        report = csv.writer(report_file)
+        report.writerow(ERROR_REPORT_HEADER)
+
+        def reject(line_number: int, username: str | None, error: str) -> None:
+            summary.rows_failed += 1
+            summary.errors_by_reason[error] = summary.errors_by_reason.get(error, 0) + 1
+            report.writerow((line_number, username or "", error))
+
+        raw_rows = _read_rows(source_path)
+        while True:
+            chunk = list(islice(raw_rows, batch_size))
+            if not chunk:
+                break
+            summary.rows_read += len(chunk)
+
+            batch: list[ImportRow] = []
+            seen_usernames: set[str] = set()
+            for line_number, raw, parse_error in chunk:
+                if parse_error is not None:
+                    reject(line_number, None, parse_error)
+                    continue
+                values, error = _validate_row(raw)
+                if error is not None:
+                    reject(line_number, values.get("username"), error)
+                    continue
+                if values["username"] in seen_usernames:
+                    reject(
+                        line_number, values["username"], "Duplicate username in file"
+                    )
+                    continue
+                seen_usernames.add(values["username"])
+                batch.append(ImportRow(line_number, values))
+
+            batch = _drop_existing_usernames(db, batch, reject)
+            _hash_passwords(executor, batch, security_service.rounds)
+            summary.rows_imported += _insert_batch(db, batch, reject)
+            report_file.flush()
+
+            print(
+                f"[import] {summary.rows_read} rows read, "
+                f"{summary.rows_imported} imported, {summary.rows_failed} failed."
+            )
+
+    return summary
+
+
+# -------------------------------------------------------------------------
+# READING
+# -------------------------------------------------------------------------
+def _read_rows(
+    source_path: Path,
+) -> Iterator[tuple[int, dict[str, Any] | None, str | None]]:
+    """Yield (line_number, raw_row, parse_error) lazily from the source file."""
+    suffix = source_path.suffix.lower()
+    with open(source_path, "r", newline="", encoding="utf-8-sig") as f:
+        if suffix == ".csv":
+            yield from _read_csv(f)
+        elif suffix in (".jsonl", ".ndjson"):
+            yield from _read_jsonl(f)
+        else:
+            raise ValueError(
+                f"Unsupported import file type '{suffix}' (expected .csv or .jsonl)."
+            )
+
+
+def _read_csv(f: TextIO) -> Iterator[tuple[int, dict[str, Any] | None, str | None]]:
+    reader = csv.DictReader(f)
+    missing = [
+        name for name in REQUIRED_FIELDS if name not in (reader.fieldnames or [])
+    ]
+    if missing:
+        raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+    for row in reader:
+        yield reader.line_num, row, None
+
+
+def _read_jsonl(f: TextIO) -> Iterator[tuple[int, dict[str, Any] | None, str | None]]:
+    for line_number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, record, None
+
+
+# -------------------------------------------------------------------------
+# VALIDATION
+# -------------------------------------------------------------------------
+def _validate_row(raw: dict[str, Any]) -> tuple[dict[str, Any], str | None]:
+    """Normalise a raw row and run the same validators used by the UI forms."""
+    values: dict[str, Any] = {}
+    for name in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+        value = raw.get(name)
+        if isinstance(value, str):
+            value = value.strip() if name != "password" else value
+            if value == "":
+                value = None
+        values[name] = value
+
+    for name in REQUIRED_FIELDS:
+        if values[name] is None:
+            return values, f"Missing {name}"
+
+    for name, max_length in MAX_LENGTHS.items():
+        if len(str(values[name])) > max_length:
+            return values, f"{name} exceeds {max_length} characters"
+
+    for name, validator in (
+        ("password", validate_password),
+        ("primary_email", validate_email),
+        ("primary_phone_number", validate_phone_number),
+    ):
+        result = validator(str(values[name]))
+        if result.error is not None:
+            return values, result.error
+
+    result = validate_date(str(values["date_of_birth"]))
+    if result.error is None:
+        result = validate_date_relation(result.value, date.today(), operator.lt)
+    if result.error is not None:
+        return values, result.error
+    values["date_of_birth"] = result.value
+
+    try:
+        values["sex"] = _parse_sex(values["sex"])
+    except ValueError as e:
+        return values, str(e)
+
+    return values, None
+
+
+def _parse_sex(value: Any) -> int:
+    if value is None:
+        return SexEnum.UNKNOWN.value
+    if isinstance(value, int) or str(value).isdigit():
+        try:
+            return SexEnum(int(value)).value
+        except ValueError:
+            pass
+    else:
+        name = str(value).strip().upper().replace(" ", "_")
+        if name in SexEnum.__members__:
+            return SexEnum[name].value
+    raise ValueError(f"Invalid sex '{value}'")
+
+
+def _drop_existing_usernames(
+    db: Database, batch: list[ImportRow], reject
+) -> list[ImportRow]:
+    """Reject rows whose username is already taken, with one query per batch."""
+    if not batch:
+        return batch
+    with db.session_scope() as session:
+        existing = set(
+            session.scalars(
+                select(User.username).where(
+                    User.username.in_([row.values["username"] for row in batch])
+                )
+            )
+        )
+    kept = []
+    for row in batch:
+        if row.values["username"] in existing:
+            reject(row.line_number, row.values["username"], "Username already exists")
+        else:
+            kept.append(row)
+    return kept
+
+
+# -------------------------------------------------------------------------
+# HASHING
+# -------------------------------------------------------------------------
+def _hash_password(plain_password: str, rounds: int) -> str:
+    """Top-level so that it can be pickled into pool worker processes."""
+    return SecurityService(rounds=rounds).hash_password(plain_password)
+
+
+def _hash_passwords(executor: Executor, batch: list[ImportRow], rounds: int) -> None:
+    passwords = [row.values["password"] for row in batch]
+    hashes = executor.map(_hash_password, passwords, repeat(rounds), chunksize=8)
+    for row, password_hash in zip(batch, hashes):
+        row.password_hash = password_hash
+
+
+# -------------------------------------------------------------------------
+# INSERTING
+# -------------------------------------------------------------------------
+def _build_person(row: ImportRow) -> Person:
+    values = row.values
+    return Person(
+        sex=values["sex"],
+        first_name=values["first_name"],
+        last_name=values["last_name"],
+        date_of_birth=values["date_of_birth"],
+        primary_email=values["primary_email"],
+        primary_phone_number=values["primary_phone_number"],
+        primary_home_address=values["primary_home_address"],
+        user=User(username=values["username"], password_hash=row.password_hash),
+        profiles=[
+            Profile(
+                profile_type_id=ProfileTypeEnum.PATIENT,
+                patient_profile=PatientProfile(
+                    medication_allergies=values["medication_allergies"]
+                ),
+            )
+        ],
+    )
+
+
+def _insert_batch(db: Database, batch: list[ImportRow], reject) -> int:
+    """
+    Insert person/user/profile/patient_profile for the whole batch in one
+    transaction. If the batch breaks a constraint or holds a value the column
+    cannot store, retry row by row so only the offending rows end up in the
+    error report. Any other error (e.g. a lost connection) propagates.
+    """
+    if not batch:
+        return 0
+    try:
+        with db.session_scope() as session:
+            _insert_rows(session, batch)
+        return len(batch)
+    except (IntegrityError, DataError):
+        pass
+
+    imported = 0
+    for row in batch:
+        try:
+            with db.session_scope() as session:
+                _insert_rows(session, [row])
+            imported += 1
+        except (IntegrityError, DataError) as e:
+            reject(row.line_number, row.values["username"], _insert_error(e))
+    return imported
+
+
+def _insert_rows(session: Session, batch: list[ImportRow]) -> None:
+    """
+    One executemany INSERT per table, parent table first, reading the new keys
+    back with RETURNING. MySQL has no RETURNING, so there the unit of work
+    inserts the rows one at a time per table instead.
+    """
+    if not session.get_bind().dialect.insert_executemany_returning:
+        session.add_all([_build_person(row) for row in batch])
+        return
+
+    # RETURNING rows may come back in any order, so match people by their
+    # values; people with identical values are interchangeable
+    people = [
+        {column.key: row.values[column.key] for column in PERSON_COLUMNS}
+        for row in batch
+    ]
+    person_ids: defaultdict[tuple, list[int]] = defaultdict(list)
+    for person_id, *values in session.execute(
+        insert(Person).returning(Person.person_id, *PERSON_COLUMNS), people
+    ):
+        person_ids[tuple(values)].append(person_id)
+    row_person_ids = [person_ids[tuple(person.values())].pop(0) for person in people]
+
+    session.execute(
+        insert(User),
+        [
+            {
+                "person_id": person_id,
+                "username": row.values["username"],
+                "password_hash": row.password_hash,
+            }
+            for row, person_id in zip(batch, row_person_ids)
+        ],
+    )
+    profile_ids = dict(
+        session.execute(
+            insert(Profile).returning(Profile.person_id, Profile.profile_id),
+            [
+                {"person_id": person_id, "profile_type_id": ProfileTypeEnum.PATIENT}
+                for person_id in row_person_ids
+            ],
+        ).all()
+    )
+    session.execute(
+        insert(PatientProfile),
+        [
+            {
+                "profile_id": profile_ids[person_id],
+                "medication_allergies": row.values["medication_allergies"],
+            }
+            for row, person_id in zip(batch, row_person_ids)
+        ],
+    )
+
+
+def _insert_error(error: IntegrityError | DataError) -> str:
+    """
+    Name the constraint or column that failed, so the same failure is counted
+    under one reason. The error's own message holds the INSERT parameters,
+    password hash included, and is never written.
+    """
+    match = _FAILED_ON.search(str(error.orig))
+    failed_on = f" on {match.group(1)}" if match else ""
+    return f"Insert failed: {type(error).__name__}{failed_on}"
@@ -0,0 +1,89 @@
+from app.database.models.table_change import (
+    CHANGED_TABLE_VERSIONS_KEY,
+    CHANGED_TABLES_KEY,
+)
+from app.repositories.table_change_repository import TableChangeRepository
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction, sessionmaker
+
+_table_change_repo = TableChangeRepository()
+
+# session.info key: set by a commit, until its transaction has ended
+_COMMITTED_KEY = "changes_committed"
+
+
+def track_table_changes(session_factory: sessionmaker[Session]) -> None:
+    """
+    Bump the table_change row of every table written through sessions of this
+    factory, in a short transaction of its own once the write has committed
+    and released its connection. Writers never hold the table_change rows, so
+    they do not queue behind each other on them.
+
+    Until the transaction ends, session.info[CHANGED_TABLES_KEY] holds the
+    tables written in it. Once a commit has ended,
+    session.info[CHANGED_TABLE_VERSIONS_KEY] maps them to their new versions
+    (None where the bump failed). Safe to call more than once.
+    """
+    if event.contains(session_factory, "after_flush", _record_after_flush):
+        return
+    event.listen(session_factory, "after_flush", _record_after_flush)
+    event.listen(session_factory, "do_orm_execute", _record_on_orm_execute)
+    event.listen(session_factory, "after_commit", _mark_committed)
+    event.listen(session_factory, "after_transaction_end", _bump_committed)
+
+
+def mark_tables_changed(session: Session, tables: set[str]) -> None:
+    """Bump tables after the session commits, for writes the events cannot see."""
+    if tables:
+        session.info.setdefault(CHANGED_TABLES_KEY, set()).update(tables)
+
+
+def _record_after_flush(session: Session, flush_context) -> None:
+    tables: set[str] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        state = inspect(obj)
+        tables.update(table.name for table in state.mapper.tables)
+        # Many-to-many changes only show up as collection history
+        for relationship in state.mapper.relationships:
+            if (
+                relationship.secondary is not None
+                and state.attrs[relationship.key].history.has_changes()
+            ):
+                tables.add(relationship.secondary.name)
+    mark_tables_changed(session, tables)
+
+
+def _record_on_orm_execute(orm_execute_state: ORMExecuteState) -> None:
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None:
+        mark_tables_changed(orm_execute_state.session, {table.name})
+
+
+def _mark_committed(session: Session) -> None:
+    session.info[_COMMITTED_KEY] = True
+
+
+def _bump_committed(session: Session, transaction: SessionTransaction) -> None:
+    # Savepoints end inside the outer transaction, whose writes still count
+    if transaction.parent is not None:
+        return
+    session.info.pop(CHANGED_TABLE_VERSIONS_KEY, None)
+    tables: set[str] = session.info.pop(CHANGED_TABLES_KEY, set())
+    if not session.info.pop(_COMMITTED_KEY, False) or not tables:
+        return
+    versions: dict[str, int | None] = dict.fromkeys(tables)
+    try:
+        with Session(session.get_bind()) as bump_session, bump_session.begin():
+            versions.update(_table_change_repo.bump(bump_session, tables))
+    except SQLAlchemyError:
+        # The write has committed either way; other processes hear of it with
+        # the table's next bump
+        pass
+    session.info[CHANGED_TABLE_VERSIONS_KEY] = versions
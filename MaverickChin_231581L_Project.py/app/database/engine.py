@@ -1,7 +1,10 @@
+import threading
 from abc import ABC, abstractmethod
 from collections.abc import Generator
-from contextlib import contextmanager
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 
+from app.database.archive_reads import read_archives_on_request
+from app.database.change_tracking import track_table_changes
 from app.database.models import Base
 from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
@@ -13,6 +16,9 @@ class Database(ABC):
 
     engine: Engine
     session_factory: sessionmaker[Session]
+    # Held for the duration of each session_scope; only needed when every
+    # session shares one connection (e.g. background page prefetching on SQLite)
+    _session_lock: AbstractContextManager = nullcontext()
 
     @abstractmethod
     def _create_engine(self) -> Engine:
@@ -26,19 +32,24 @@ class Database(ABC):
             bind=self.engine,
             expire_on_commit=False,
         )
+        # Lets other processes sharing the database see what changed
+        track_table_changes(self.session_factory)
+        # History reads (reading_archives) union in the archive tables
+        read_archives_on_request(self.session_factory)
 
     @contextmanager
     def session_scope(self) -> Generator[Session, None, None]:
         """Provide a transactional scope for a series of operations"""
-        session = self.session_factory()
-        try:
-            yield session
-            session.commit()
-        except Exception:
-            session.rollback()
-            raise
-        finally:
-            session.close()
+        with self._session_lock:
+            session = self.session_factory()
+            try:
+                yield session
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
 
     def close(self):
         """Close all connections"""
@@ -79,6 +90,8 @@ class SQLiteDatabase(Database):
     def __init__(self, db_path):
         super().__init__()
         self.db_path = db_path
+        # StaticPool hands the same connection to every thread
+        self._session_lock = threading.RLock()
         self._initialize()
         Base.metadata.create_all(self.engine)
 
@@ -16,6 +16,8 @@ from .appointments import (
     Appointment,
 )
 from .prescription import Medication, Prescription, PrescriptionItem
+from .table_change import TableChange
+from .archive import ARCHIVE_TABLES
 
 __all__ = [
     "Base",
@@ -35,4 +37,6 @@ __all__ = [
     "Medication",
     "Prescription",
     "PrescriptionItem",
+    "TableChange",
+    "ARCHIVE_TABLES",
 ]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, List, Optional
 
 from app.lookups.enums import (
     AppointmentRequestStatusEnum,
@@ -16,6 +16,7 @@ from sqlalchemy import (
     Text,
     func,
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -83,6 +84,16 @@ class AppointmentRequest(Base):
     handled_datetime: Mapped[Optional[datetime]] = mapped_column(DateTime)
     handling_notes: Mapped[Optional[str]] = mapped_column(Text)
 
+    # Work-queue lease: the receptionist holding the request until it expires
+    claimed_by_profile_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("profile.profile_id")
+    )
+    claim_expires_datetime: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
+    # Bumped on every UPDATE; a flush against an older version raises StaleDataError
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version_id}
+
     # Relationships
     patient: Mapped["PatientProfile"] = relationship(
         "PatientProfile", back_populates="appointment_requests"
@@ -103,66 +114,100 @@ class AppointmentRequest(Base):
         back_populates="appointment_requests",
     )
     handled_by: Mapped[Optional["Profile"]] = relationship(
-        "Profile", back_populates="handled_appointment_requests"
+        "Profile",
+        foreign_keys=[handled_by_profile_id],
+        back_populates="handled_appointment_requests",
     )
 
     @property
     def status_enum(self):
         return AppointmentRequestStatusEnum(self.appointment_request_status_id)
 
-    @property
+    @hybrid_property
     def is_pending(self):
         return (
             self.appointment_request_status_id == AppointmentRequestStatusEnum.PENDING
         )
 
-    @property
+    @hybrid_property
     def is_approved(self):
         return (
             self.appointment_request_status_id == AppointmentRequestStatusEnum.APPROVED
         )
 
-    @property
+    @hybrid_property
     def is_cancelled(self):
         return (
             self.appointment_request_status_id == AppointmentRequestStatusEnum.CANCELLED
         )
 
-    @property
+    @hybrid_property
     def is_rejected(self):
         return (
             self.appointment_request_status_id == AppointmentRequestStatusEnum.REJECTED
         )
 
+    # Approving, cancelling and rejecting are only allowed from PENDING (see
+    # is_pending). The *_values give the columns each one sets, for the
+    # methods below and for compare-and-set UPDATEs in AppointmentService.
+    @staticmethod
+    def approval_values(
+        appointment_id: int,
+        handled_by_profile_id: int,
+        handling_notes: str | None = None,
+    ) -> dict[str, Any]:
+        return {
+            "appointment_request_status_id": AppointmentRequestStatusEnum.APPROVED,
+            "appointment_id": appointment_id,
+            "handled_by_profile_id": handled_by_profile_id,
+            "handling_notes": handling_notes,
+            "handled_datetime": datetime.now(),
+        }
+
+    @staticmethod
+    def cancellation_values() -> dict[str, Any]:
+        return {
+            "appointment_request_status_id": AppointmentRequestStatusEnum.CANCELLED,
+            "handled_datetime": datetime.now(),
+        }
+
+    @staticmethod
+    def rejection_values(
+        handled_by_profile_id: int | None, handling_notes: str
+    ) -> dict[str, Any]:
+        return {
+            "appointment_request_status_id": AppointmentRequestStatusEnum.REJECTED,
+            "handled_by_profile_id": handled_by_profile_id,
+            "handling_notes": handling_notes,
+            "handled_datetime": datetime.now(),
+        }
+
     def approve(
         self,
         appointment_id: int,
         handled_by_profile_id: int,
         handling_notes: str | None = None,
     ):
-        if self.status_enum != AppointmentRequestStatusEnum.PENDING:
-            raise ValueError("Only pending appointment requests can be approved.")
-        self.appointment_request_status_id = AppointmentRequestStatusEnum.APPROVED
-        self.appointment_id = appointment_id
-        self.handled_by_profile_id = handled_by_profile_id
-        self.handling_notes = handling_notes
-        self.handled_datetime = datetime.now()
+        self._handle(
+            "approved",
+            self.approval_values(appointment_id, handled_by_profile_id, handling_notes),
+        )
 
     def cancel(
         self,
     ):
-        if self.status_enum != AppointmentRequestStatusEnum.PENDING:
-            raise ValueError("Only pending appointment requests can be cancelled.")
-        self.appointment_request_status_id = AppointmentRequestStatusEnum.CANCELLED
-        self.handled_datetime = datetime.now()
+        self._handle("cancelled", self.cancellation_values())
 
     def reject(self, handled_by_profile_id: int, handling_notes: str):
-        if self.status_enum != AppointmentRequestStatusEnum.PENDING:
-            raise ValueError("Only pending appointment requests can be rejected.")
-        self.appointment_request_status_id = AppointmentRequestStatusEnum.REJECTED
-        self.handled_by_profile_id = handled_by_profile_id
-        self.handling_notes = handling_notes
-        self.handled_datetime = datetime.now()
+        self._handle(
+            "rejected", self.rejection_values(handled_by_profile_id, handling_notes)
+        )
+
+    def _handle(self, action: str, values: dict[str, Any]):
+        if not self.is_pending:
+            raise ValueError(f"Only pending appointment requests can be {action}.")
+        for name, value in values.items():
+            setattr(self, name, value)
 
 
 class AppointmentStatus(Base):
@@ -223,6 +268,10 @@ class Appointment(Base):
     cancelled_datetime: Mapped[Optional[datetime]] = mapped_column(DateTime)
     cancellation_reason: Mapped[Optional[str]] = mapped_column(Text)
 
+    # Bumped on every UPDATE; a flush against an older version raises StaleDataError
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version_id}
+
     # Relationships
     patient: Mapped["PatientProfile"] = relationship(
         "PatientProfile",
@@ -269,36 +318,58 @@ class Appointment(Base):
             return
         return ProfileTypeEnum(self.cancelled_by_profile_id)
 
-    @property
+    @hybrid_property
     def is_scheduled(self):
         return self.appointment_status_id == AppointmentStatusEnum.SCHEDULED
 
-    @property
+    @hybrid_property
     def is_completed(self):
         return self.appointment_status_id == AppointmentStatusEnum.COMPLETED
 
-    @property
+    @hybrid_property
     def is_cancelled(self):
         return self.appointment_status_id == AppointmentStatusEnum.CANCELLED
 
-    @property
+    @hybrid_property
     def is_missed(self):
         return self.appointment_status_id == AppointmentStatusEnum.MISSED
 
+    # Completing, cancelling and missing are only allowed from SCHEDULED (see
+    # is_scheduled). The *_values give the columns each one sets, for the
+    # methods below and for compare-and-set UPDATEs in AppointmentService.
+    @staticmethod
+    def completion_values() -> dict[str, Any]:
+        return {"appointment_status_id": AppointmentStatusEnum.COMPLETED}
+
+    @staticmethod
+    def cancellation_values(
+        cancelled_by_profile_id: int, cancellation_reason: str
+    ) -> dict[str, Any]:
+        return {
+            "appointment_status_id": AppointmentStatusEnum.CANCELLED,
+            "cancelled_by_profile_id": cancelled_by_profile_id,
+            "cancellation_reason": cancellation_reason,
+            "cancelled_datetime": datetime.now(),
+        }
+
+    @staticmethod
+    def missed_values() -> dict[str, Any]:
+        return {"appointment_status_id": AppointmentStatusEnum.MISSED}
+
     def complete(self):
-        if self.status_enum != AppointmentStatusEnum.SCHEDULED:
-            raise ValueError("Only scheduled appointments can be completed.")
-        self.appointment_status_id = AppointmentStatusEnum.COMPLETED
+        self._close("completed", self.completion_values())
 
     def cancel(self, cancelled_by_profile_id: int, cancellation_reason: str):
-        if self.status_enum != AppointmentStatusEnum.SCHEDULED:
-            raise ValueError("Only scheduled appointments can be cancelled.")
-        self.appointment_status_id = AppointmentStatusEnum.CANCELLED
-        self.cancelled_by_profile_id = cancelled_by_profile_id
-        self.cancellation_reason = cancellation_reason
-        self.cancelled_datetime = datetime.now()
+        self._close(
+            "cancelled",
+            self.cancellation_values(cancelled_by_profile_id, cancellation_reason),
+        )
 
     def miss(self):
-        if self.status_enum != AppointmentStatusEnum.SCHEDULED:
-            raise ValueError("Only scheduled appointments can be missed.")
-        self.appointment_status_id = AppointmentStatusEnum.MISSED
+        self._close("missed", self.missed_values())
+
+    def _close(self, action: str, values: dict[str, Any]):
+        if not self.is_scheduled:
+            raise ValueError(f"Only scheduled appointments can be {action}.")
+        for name, value in values.items():
+            setattr(self, name, value)
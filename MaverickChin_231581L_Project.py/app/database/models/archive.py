@@ -0,0 +1,63 @@
+from sqlalchemy import Column, DateTime, Index, Table
+
+from . import appointments, prescription  # noqa: F401  (registers the hot tables)
+from .base import Base
+
+ARCHIVED_DATETIME_COLUMN = "archived_datetime"
+
+
+def _archive_table(table: Table, *extra_indexes: tuple[str, ...]) -> Table:
+    """
+    Copy of table's columns and indexes as {name}_archive, plus the time each
+    row was archived.
+
+    Foreign keys and defaults are dropped: archived rows keep the IDs they had,
+    may point at rows archived with them, and are never written by the app.
+    """
+    columns = [
+        Column(
+            column.name,
+            column.type,
+            primary_key=column.primary_key,
+            autoincrement=False,
+            nullable=column.nullable,
+        )
+        for column in table.columns
+    ]
+    indexes = [
+        Index(f"{index.name}_archive", *(column.name for column in index.columns))
+        for index in table.indexes
+    ]
+    indexes += [
+        Index(f"idx_{table.name}_archive_{'_'.join(names)}", *names)
+        for names in extra_indexes
+    ]
+    return Table(
+        f"{table.name}_archive",
+        Base.metadata,
+        *columns,
+        Column(ARCHIVED_DATETIME_COLUMN, DateTime, nullable=False),
+        *indexes,
+    )
+
+
+appointment_archive = _archive_table(Base.metadata.tables["appointment"])
+appointment_request_archive = _archive_table(
+    Base.metadata.tables["appointment_request"],
+    ("patient_profile_id", "created_datetime"),
+)
+prescription_archive = _archive_table(
+    Base.metadata.tables["prescription"], ("appointment_id",)
+)
+prescription_item_archive = _archive_table(Base.metadata.tables["prescription_item"])
+
+# Hot table name -> its archive
+ARCHIVE_TABLES: dict[str, Table] = {
+    table.name.removesuffix("_archive"): table
+    for table in (
+        appointment_archive,
+        appointment_request_archive,
+        prescription_archive,
+        prescription_item_archive,
+    )
+}
@@ -88,7 +88,9 @@ class Profile(Base):
         back_populates="cancelled_by",
     )
     handled_appointment_requests: Mapped[List["AppointmentRequest"]] = relationship(
-        "AppointmentRequest", back_populates="handled_by"
+        "AppointmentRequest",
+        foreign_keys="AppointmentRequest.handled_by_profile_id",
+        back_populates="handled_by",
     )
 
     @property
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+# session.info keys: tables written in the session's current transaction, and
+# their new versions once a commit has ended it
+CHANGED_TABLES_KEY = "changed_tables"
+CHANGED_TABLE_VERSIONS_KEY = "changed_table_versions"
+
+
+class TableChange(Base):
+    """Change counter per table, bumped right after every transaction that writes it"""
+
+    __tablename__ = "table_change"
+
+    table_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), index=True
+    )
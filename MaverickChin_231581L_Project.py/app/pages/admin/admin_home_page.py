@@ -13,6 +13,7 @@ class PageChoice(Enum):
     MANAGE_USER = "Manage user"
     MANAGE_MEDICATIONS = "Manage medications"
     MANAGE_SPECIALTIES = "Manage specialties"
+    VIEW_DOCTOR_UTILISATION = "View doctor utilisation"
     EDIT_PERSONAL_INFORMATION = "Edit personal information"
     LOGOUT = cast(FormattedText, [("class:red", "Logout")])
 
@@ -25,6 +26,9 @@ class AdminHomePage(BasePage):
     selected_choice: PageChoice | None = None
 
     def run(self) -> BasePage | None:
+        from app.pages.admin.analytics.admin_doctor_utilisation_page import (
+            AdminDoctorUtilisationPage,
+        )
         from app.pages.admin.medication.admin_manage_medications_page import (
             AdminManageMedicationsPage,
         )
@@ -152,6 +156,8 @@ class AdminHomePage(BasePage):
                 return AdminManageMedicationsPage(self.app)
             case PageChoice.MANAGE_SPECIALTIES:
                 return AdminManageSpecialtiesPage(self.app)
+            case PageChoice.VIEW_DOCTOR_UTILISATION:
+                return AdminDoctorUtilisationPage(self.app)
             case PageChoice.EDIT_PERSONAL_INFORMATION:
                 return EditPersonalInformationPage(self.app)
             case PageChoice.LOGOUT:
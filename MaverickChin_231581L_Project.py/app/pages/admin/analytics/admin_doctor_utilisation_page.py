@@ -0,0 +1,84 @@
+from datetime import date, timedelta
+from enum import Enum
+
+from app.analytics import UtilisationReport, load_utilisation
+from app.pages.core.base_page import BasePage
+from app.ui.prompts import KeyAction, prompt_choice
+from app.ui.utilisation_tables import heatmap_table, utilisation_table
+
+UTILISATION_CACHE_TTL_SECONDS = 60.0
+
+
+class PeriodChoice(Enum):
+    # (label, days before today, days after today)
+    LAST_7_DAYS = ("Last 7 days", 6, 0)
+    LAST_30_DAYS = ("Last 30 days", 29, 0)
+    LAST_365_DAYS = ("Last 365 days", 364, 0)
+    NEXT_30_DAYS = ("Next 30 days", 0, 29)
+
+    @property
+    def label(self) -> str:
+        return self.value[0]
+
+    def day_range(self, today: date) -> tuple[date, date]:
+        _, days_before, days_after = self.value
+        return today - timedelta(days=days_before), today + timedelta(days=days_after)
+
+
+class AdminDoctorUtilisationPage(BasePage):
+    @property
+    def title(self):
+        return "Doctor utilisation"
+
+    selected_period: PeriodChoice = PeriodChoice.LAST_30_DAYS
+
+    def run(self) -> BasePage | None:
+        while True:
+            self.clear()
+            self.display_logged_in_header(self.app)
+
+            first_day, last_day = self.selected_period.day_range(date.today())
+            report = self._retrieve_report(first_day, last_day)
+            doctor_names = {}
+            for doctor_profile_id in report.doctor_profile_ids.tolist():
+                doctor = self.app.lookup_cache.get_doctor(doctor_profile_id)
+                if doctor:
+                    doctor_names[doctor_profile_id] = doctor.full_name
+
+            self.console.print(utilisation_table(report, doctor_names))
+            self.console.print("")
+            self.console.print(heatmap_table(report))
+            self.console.print("")
+
+            choices = [(period, period.label) for period in PeriodChoice]
+            selected_period = prompt_choice(
+                "Select period",
+                choices,
+                default=self.selected_period,
+                exitable=True,
+                clearable=False,
+                scrollable=False,
+                show_frame=True,
+            )
+
+            if selected_period == KeyAction.BACK:
+                return
+            self.selected_period = selected_period
+
+    def _retrieve_report(self, first_day: date, last_day: date) -> UtilisationReport:
+        return self.app.data_cache.get_or_load(
+            ("doctor_utilisation", first_day, last_day),
+            lambda: self._load_report(first_day, last_day),
+            tags=["appointment"],
+            ttl=UTILISATION_CACHE_TTL_SECONDS,
+        )
+
+    def _load_report(self, first_day: date, last_day: date) -> UtilisationReport:
+        with self.app.session_scope() as session:
+            return load_utilisation(
+                session,
+                self.app.repos.appointment,
+                first_day,
+                last_day,
+                include_archived=True,
+            )
@@ -44,8 +44,9 @@ class AdminSelectMedicationToManage(BasePage):
             )
 
     def _init_fields(self) -> list[MenuField]:
-        with self.app.session_scope() as session:
-            medications = self.app.repos.medication.get_all(session)
+        medications, medication_index = (
+            self.app.lookup_cache.get_medications_with_index()
+        )
 
         return [
             MenuField(
@@ -58,6 +59,7 @@ class AdminSelectMedicationToManage(BasePage):
                         FilterItem(med.medication_id, [med.generic_name])
                         for med in medications
                     ],
+                    index=medication_index,
                 ),
             ),
         ]
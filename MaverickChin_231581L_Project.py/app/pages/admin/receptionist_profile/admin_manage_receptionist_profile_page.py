@@ -66,6 +66,7 @@ class AdminManageReceptionistProfilePage(BasePage):
                             AppointmentRequest.handled_by_profile_id
                             == self.receptionist_profile.profile_id
                         ],
+                        include_archived=True,
                     )
                     approved_count = self.app.repos.appointment_request.count(
                         session,
@@ -75,6 +76,7 @@ class AdminManageReceptionistProfilePage(BasePage):
                             AppointmentRequest.appointment_request_status_id
                             == AppointmentRequestStatusEnum.APPROVED.value,
                         ],
+                        include_archived=True,
                     )
                     rejected_count = self.app.repos.appointment_request.count(
                         session,
@@ -84,6 +86,7 @@ class AdminManageReceptionistProfilePage(BasePage):
                             AppointmentRequest.appointment_request_status_id
                             == AppointmentRequestStatusEnum.REJECTED.value,
                         ],
+                        include_archived=True,
                     )
                     table = Table(title="Appointment Requests", title_justify="left")
                     table.add_column("Total Handled")
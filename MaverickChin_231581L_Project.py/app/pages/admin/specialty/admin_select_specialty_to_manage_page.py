@@ -44,8 +44,9 @@ class AdminSelectSpecialtyToManage(BasePage):
             )
 
     def _init_fields(self) -> list[MenuField]:
-        with self.app.session_scope() as session:
-            specialties = self.app.repos.specialty.get_all(session)
+        specialties, specialty_index = (
+            self.app.lookup_cache.get_all_specialties_with_index()
+        )
 
         return [
             MenuField(
@@ -55,9 +56,10 @@ class AdminSelectSpecialtyToManage(BasePage):
                     self.app,
                     FieldKey.SPECIALTY.value,
                     [
-                        FilterItem(specialty.specialty_id, [specialty.name])
-                        for specialty in specialties
+                        FilterItem(specialty_id, [name])
+                        for specialty_id, name in specialties
                     ],
+                    index=specialty_index,
                 ),
             ),
         ]
@@ -4,9 +4,10 @@ from app.core.app import App
 from app.pages.core.base_page import BasePage
 from app.pages.patient.patient_tables import patient_display_appointments_table
 from app.repositories.appointment_repository import AppointmentLoad
+from app.services import StaleDataError
 from app.ui.inputs.text_input import TextInput
 from app.ui.menu_form import KeyAction, MenuField, MenuForm
-from app.ui.prompts import prompt_success
+from app.ui.prompts import prompt_error, prompt_success
 
 
 class FieldKey(Enum):
@@ -63,14 +64,18 @@ class CancelAppointmentPage(BasePage):
                     return
                 cancellation_reason = data[FieldKey.CANCELLATION_REASON.value]
 
-                with self.app.session_scope() as session:
-                    assert self.app.current_person is not None
-                    self.app.services.appointment.update_appointment_cancelled(
-                        session,
-                        self.appointment.appointment_id,
-                        cancelled_by_profile_id=self.app.current_person.profile_id,
-                        cancellation_reason=cancellation_reason,
-                    )
+                try:
+                    with self.app.session_scope() as session:
+                        assert self.app.current_person is not None
+                        self.app.services.appointment.update_appointment_cancelled(
+                            session,
+                            self.appointment.appointment_id,
+                            cancelled_by_profile_id=self.app.current_person.profile_id,
+                            cancellation_reason=cancellation_reason,
+                        )
+                except StaleDataError as e:
+                    prompt_error(self.console, str(e))
+                    return
                 prompt_success(self.console, "Appointment successfully cancelled!")
                 return
 
@@ -4,7 +4,6 @@ from enum import Enum
 
 from app.core.app import App
 from app.core.config import AppConfig
-from app.database.models import Specialty
 from app.lookups.enums import AppointmentStatusEnum
 from app.pages.core.base_page import BasePage
 from app.repositories.patient_profile_repository import PatientProfileLoad
@@ -150,10 +149,9 @@ class DoctorCreateAppointmentForPatientPage(BasePage):
     def _init_fields(self) -> list[MenuField]:
         request = self.appointment_request
 
-        with self.app.session_scope() as session:
-            specialties = self.app.repos.specialty.get_all(
-                session, conditions=[Specialty.is_in_service.is_(True)]
-            )
+        specialties, specialty_index = (
+            self.app.lookup_cache.get_all_specialties_with_index(in_service_only=True)
+        )
 
         return [
             MenuField(
@@ -163,9 +161,10 @@ class DoctorCreateAppointmentForPatientPage(BasePage):
                     self.app,
                     FieldKey.SPECIALTY.value,
                     [
-                        FilterItem(value=s.specialty_id, filter_values=[s.name])
-                        for s in specialties
+                        FilterItem(value=specialty_id, filter_values=[name])
+                        for specialty_id, name in specialties
                     ],
+                    index=specialty_index,
                 ),
             ),
             MenuField(
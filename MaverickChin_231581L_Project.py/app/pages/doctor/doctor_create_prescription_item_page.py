@@ -1,7 +1,6 @@
 from enum import Enum
 
 from app.core.app import App
-from app.database.models import Medication
 from app.pages.core.base_page import BasePage
 from app.repositories.appointment_repository import AppointmentLoad
 from app.ui.inputs.filter_input import FilterInput, FilterItem
@@ -121,10 +120,9 @@ class DoctorCreatePrescriptionItemPage(BasePage):
                 continue
 
     def _init_fields(self) -> list[MenuField]:
-        with self.app.session_scope() as session:
-            medications = self.app.repos.medication.get_all(
-                session, conditions=[Medication.is_in_service.is_(True)]
-            )
+        medications, medication_index = (
+            self.app.lookup_cache.get_medications_with_index(in_service_only=True)
+        )
 
         return [
             MenuField(
@@ -137,6 +135,7 @@ class DoctorCreatePrescriptionItemPage(BasePage):
                         FilterItem(med.medication_id, [med.generic_name])
                         for med in medications
                     ],
+                    index=medication_index,
                 ),
             ),
             MenuField(
@@ -103,8 +103,9 @@ class DoctorEditPrescriptionItemPage(BasePage):
                     continue
 
     def _init_fields(self) -> list[MenuField]:
-        with self.app.session_scope() as session:
-            medications = self.app.repos.medication.get_all(session)
+        medications, medication_index = (
+            self.app.lookup_cache.get_medications_with_index()
+        )
 
         return [
             MenuField(
@@ -117,6 +118,7 @@ class DoctorEditPrescriptionItemPage(BasePage):
                         FilterItem(med.medication_id, [med.generic_name])
                         for med in medications
                     ],
+                    index=medication_index,
                 ),
                 InputResult(
                     value=self.prescription_item.medication_id,
@@ -1,6 +1,7 @@
 from enum import Enum
-from typing import cast
+from typing import Sequence, cast
 
+from app.database.models import Appointment
 from app.pages.core.base_page import BasePage
 from app.pages.doctor.doctor_tables import doctor_display_appointments_table
 from app.repositories.appointment_repository import AppointmentLoad
@@ -15,11 +16,23 @@ class PageChoice(Enum):
     LOGOUT = cast(FormattedText, [("class:red", "Logout")])
 
 
+# Tables read by the appointments shown on the home page
+HOME_APPOINTMENTS_CACHE_TAGS = (
+    "appointment",
+    "specialty",
+    "patient_profile",
+    "profile",
+    "person",
+)
+HOME_CACHE_TTL_SECONDS = 30
+
+
 class DoctorHomePage(BasePage):
     @property
     def title(self):
         return "Doctor Home"
 
+    items_shown: int = 10
     selected_choice: PageChoice | None = None
 
     def run(self) -> BasePage | None:
@@ -35,13 +48,14 @@ class DoctorHomePage(BasePage):
 
         self.clear()
         self.display_logged_in_header(self.app)
+        appointments, appointment_count = self._retrieve_recent_appointments()
         doctor_display_appointments_table(
             self.console,
-            self._retrieve_all_appointments(),
+            appointments,
             title="Your Appointments",
-            max_count=10,
+            max_count=self.items_shown,
+            total_count=appointment_count,
         )
-        self._retrieve_all_appointments()
 
         choices = [(choice, choice.value) for choice in PageChoice]
         self.selected_choice = prompt_choice(
@@ -65,10 +79,18 @@ class DoctorHomePage(BasePage):
                 self.app.logout()
                 return
 
-    def _retrieve_all_appointments(self):
+    def _retrieve_recent_appointments(self) -> tuple[Sequence[Appointment], int]:
+        assert self.app.current_person is not None
+        doctor_profile_id = self.app.current_person.profile_id
+        return self.app.data_cache.get_or_load(
+            ("doctor_home_appointments", doctor_profile_id),
+            lambda: self._load_recent_appointments(doctor_profile_id),
+            tags=HOME_APPOINTMENTS_CACHE_TAGS,
+            ttl=HOME_CACHE_TTL_SECONDS,
+        )
+
+    def _load_recent_appointments(self, doctor_profile_id: int):
         with self.app.session_scope() as session:
-            assert self.app.current_person is not None
-            doctor_profile_id = self.app.current_person.profile_id
             appts = self.app.repos.appointment.list_by_doctor_profile_id(
                 session,
                 doctor_profile_id,
@@ -78,5 +100,10 @@ class DoctorHomePage(BasePage):
                     AppointmentLoad.PATIENT_WITH_PERSON,
                     AppointmentLoad.CREATED_BY_PROFILE,
                 ),
+                limit=self.items_shown,
+            )
+            count = self.app.repos.appointment.count(
+                session,
+                conditions=[Appointment.doctor_profile_id == doctor_profile_id],
             )
-            return appts
+            return appts, count
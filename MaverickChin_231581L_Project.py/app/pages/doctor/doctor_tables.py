@@ -15,6 +15,7 @@ def doctor_display_appointments_table(
     title: str = "Appointments",
     max_count: int | None = None,
     start_index: int | None = None,
+    total_count: int | None = None,
 ):
     display_one = isinstance(appointments, Appointment)
     display_list = (
@@ -33,15 +34,17 @@ def doctor_display_appointments_table(
     if display_list:
         assert max_count is not None
         assert not isinstance(appointments, Appointment)
-        if len(appointments) > max_count:
-            title += f" ({max_count}/{len(appointments)})"
+        total = total_count if total_count is not None else len(appointments)
+        if total > max_count:
+            title += f" ({max_count}/{total})"
         else:
-            title += f" ({len(appointments)})"
+            title += f" ({total})"
     elif display_scrolling:
         assert max_count is not None
         assert start_index is not None
         assert not isinstance(appointments, Appointment)
-        title += f" ({start_index+1}-{min(start_index+max_count, len(appointments))}/{len(appointments)})"
+        total = total_count if total_count is not None else len(appointments)
+        title += f" ({start_index+1}-{min(start_index+max_count, total)}/{total})"
 
     table = Table(title=title, title_justify="left", show_lines=True)
     if display_scrolling:
@@ -61,9 +64,13 @@ def doctor_display_appointments_table(
     max_count = max_count if max_count else 1
     if display_one:
         appointments = (appointments,)
-    for offset, appointment in enumerate(
-        appointments[start_index : start_index + max_count]
-    ):
+    # With total_count, the sequence passed in is already just the visible page
+    visible = (
+        appointments
+        if total_count is not None
+        else appointments[start_index : start_index + max_count]
+    )
+    for offset, appointment in enumerate(visible):
         row: list[RenderableType] = [
             appointment.status_enum.display,
             appointment.created_by.type_enum.display,
@@ -6,7 +6,14 @@ from app.core.config import AppConfig
 from app.pages.core.base_page import BasePage
 from app.pages.doctor.doctor_tables import doctor_display_appointments_table
 from app.repositories.appointment_repository import AppointmentLoad
-from app.ui.prompts import KeyAction, prompt_choice, prompt_success, prompt_text
+from app.services import StaleDataError
+from app.ui.prompts import (
+    KeyAction,
+    prompt_choice,
+    prompt_error,
+    prompt_success,
+    prompt_text,
+)
 
 
 class PageChoice(Enum):
@@ -48,12 +55,16 @@ class DoctorWorkOnAppointmentPage(BasePage):
                         AppointmentLoad.CREATED_BY_PROFILE,
                         AppointmentLoad.PRESCRIPTION_WITH_ITEMS_WITH_MEDICATION,
                     ],
+                    include_archived=True,
                 )
                 if appointment is None:
                     raise ValueError(
                         f"Appointment id {self.appointment_id} does not exist."
                     )
                 self.appointment = appointment
+                self.is_archived = self.app.repos.appointment.is_archived(
+                    session, self.appointment_id
+                )
 
             self.clear()
             self.display_logged_in_header(self.app)
@@ -85,16 +96,22 @@ class DoctorWorkOnAppointmentPage(BasePage):
                 if result == KeyAction.BACK:
                     continue
                 if result == KeyAction.CLEAR:
-                    appointment.doctor_notes = None
+                    doctor_notes = None
                 else:
-                    result = result.strip()
-                    if len(result) == 0:
-                        result = None
-                    appointment.doctor_notes = result
-                with self.app.session_scope() as session:
-                    self.app.repos.appointment.update(session, appointment)
-                    prompt_success(self.console, "Successfully edited doctor's notes.")
+                    doctor_notes = result.strip() or None
+                try:
+                    with self.app.session_scope() as session:
+                        self.app.services.appointment.update_appointment_doctor_notes(
+                            session,
+                            self.appointment_id,
+                            doctor_notes,
+                            appointment.version_id,
+                        )
+                except StaleDataError as e:
+                    prompt_error(self.console, str(e))
                     continue
+                prompt_success(self.console, "Successfully edited doctor's notes.")
+                continue
 
             if selected_choice == PageChoice.MANAGE_PRESCRIPTION:
                 return DoctorManagePrescriptionPage(
@@ -102,21 +119,29 @@ class DoctorWorkOnAppointmentPage(BasePage):
                 )
 
             if selected_choice == PageChoice.MARK_AS_COMPLETED:
-                with self.app.session_scope() as session:
-                    self.app.services.appointment.update_appointment_completed(
-                        session, self.appointment_id
-                    )
-                    prompt_success(self.console, "Successfully marked as completed.")
+                try:
+                    with self.app.session_scope() as session:
+                        self.app.services.appointment.update_appointment_completed(
+                            session, self.appointment_id
+                        )
+                except StaleDataError as e:
+                    prompt_error(self.console, str(e))
+                    continue
+                prompt_success(self.console, "Successfully marked as completed.")
 
             if selected_choice == PageChoice.MARK_AS_MISSED:
-                with self.app.session_scope() as session:
-                    self.app.services.appointment.update_appointment_missed(
-                        session, self.appointment_id
-                    )
-                    prompt_success(
-                        self.console,
-                        "Successfully marked as missed. All related prescriptions removed.",
-                    )
+                try:
+                    with self.app.session_scope() as session:
+                        self.app.services.appointment.update_appointment_missed(
+                            session, self.appointment_id
+                        )
+                except StaleDataError as e:
+                    prompt_error(self.console, str(e))
+                    continue
+                prompt_success(
+                    self.console,
+                    "Successfully marked as missed. All related prescriptions removed.",
+                )
 
             if selected_choice == PageChoice.CANCEL_APPOINTMENT:
                 return CancelAppointmentPage(self.app, self.appointment_id)
@@ -128,7 +153,8 @@ class DoctorWorkOnAppointmentPage(BasePage):
 
     def _generate_choices(self):
         choices: list[tuple[PageChoice, str]] = []
-        if not self.appointment.is_missed:
+        # Archived appointments are read-only
+        if not self.appointment.is_missed and not self.is_archived:
             choices.extend(
                 [
                     (
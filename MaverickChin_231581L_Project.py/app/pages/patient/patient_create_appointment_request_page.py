@@ -2,7 +2,6 @@ from datetime import date, datetime, time, timedelta
 from enum import Enum
 
 from app.core.config import AppConfig
-from app.database.models import Specialty
 from app.pages.core.base_page import BasePage
 from app.ui.inputs.doctor_by_specialty_input import DoctorBySpecialtyInput
 from app.ui.inputs.filter_input import FilterInput, FilterItem
@@ -84,10 +83,9 @@ class PatientCreateAppointmentRequestPage(BasePage):
                 continue
 
     def _init_fields(self) -> list[MenuField]:
-        with self.app.session_scope() as session:
-            specialties = self.app.repos.specialty.get_all(
-                session, conditions=[Specialty.is_in_service.is_(True)]
-            )
+        specialties, specialty_index = (
+            self.app.lookup_cache.get_all_specialties_with_index(in_service_only=True)
+        )
 
         return [
             MenuField(
@@ -97,9 +95,10 @@ class PatientCreateAppointmentRequestPage(BasePage):
                     self.app,
                     FieldKey.SPECIALTY.value,
                     [
-                        FilterItem(value=s.specialty_id, filter_values=[s.name])
-                        for s in specialties
+                        FilterItem(value=specialty_id, filter_values=[name])
+                        for specialty_id, name in specialties
                     ],
+                    index=specialty_index,
                 ),
             ),
             MenuField(
@@ -1,6 +1,7 @@
 from enum import Enum
-from typing import cast
+from typing import Sequence, cast
 
+from app.database.models import Appointment, AppointmentRequest
 from app.pages.core.base_page import BasePage
 from app.pages.patient.patient_tables import (
     patient_display_appointment_requests_table,
@@ -21,11 +22,30 @@ class PageChoice(Enum):
     LOGOUT = cast(FormattedText, [("class:red", "Logout")])
 
 
+# Tables read by the requests and appointments shown on the home page
+HOME_APPOINTMENT_REQUESTS_CACHE_TAGS = (
+    "appointment_request",
+    "specialty",
+    "doctor_profile",
+    "profile",
+    "person",
+)
+HOME_APPOINTMENTS_CACHE_TAGS = (
+    "appointment",
+    "specialty",
+    "doctor_profile",
+    "profile",
+    "person",
+)
+HOME_CACHE_TTL_SECONDS = 30
+
+
 class PatientHomePage(BasePage):
     @property
     def title(self):
         return "Patient Home"
 
+    items_shown: int = 5
     selected_choice: PageChoice | None = None
 
     def run(self) -> BasePage | None:
@@ -47,19 +67,24 @@ class PatientHomePage(BasePage):
 
         self.clear()
         self.display_logged_in_header(self.app)
+        appointment_requests, appointment_request_count = (
+            self._retrieve_recent_appointment_requests()
+        )
         patient_display_appointment_requests_table(
             self.console,
-            self._retrieve_all_appointment_requests(),
+            appointment_requests,
             title="Your Appointment Requests",
-            max_count=5,
+            max_count=self.items_shown,
+            total_count=appointment_request_count,
         )
+        appointments, appointment_count = self._retrieve_recent_appointments()
         patient_display_appointments_table(
             self.console,
-            self._retrieve_all_appointments(),
+            appointments,
             title="Your Appointments",
-            max_count=5,
+            max_count=self.items_shown,
+            total_count=appointment_count,
         )
-        self._retrieve_all_appointments()
 
         choices = [(choice, choice.value) for choice in PageChoice]
         self.selected_choice = prompt_choice(
@@ -87,10 +112,20 @@ class PatientHomePage(BasePage):
                 self.app.logout()
                 return
 
-    def _retrieve_all_appointment_requests(self):
+    def _retrieve_recent_appointment_requests(
+        self,
+    ) -> tuple[Sequence[AppointmentRequest], int]:
+        assert self.app.current_person is not None
+        patient_profile_id = self.app.current_person.profile_id
+        return self.app.data_cache.get_or_load(
+            ("patient_home_appointment_requests", patient_profile_id),
+            lambda: self._load_recent_appointment_requests(patient_profile_id),
+            tags=HOME_APPOINTMENT_REQUESTS_CACHE_TAGS,
+            ttl=HOME_CACHE_TTL_SECONDS,
+        )
+
+    def _load_recent_appointment_requests(self, patient_profile_id: int):
         with self.app.session_scope() as session:
-            assert self.app.current_person is not None
-            patient_profile_id = self.app.current_person.profile_id
             requests = self.app.repos.appointment_request.list_by_patient_profile_id(
                 session,
                 patient_profile_id,
@@ -99,13 +134,28 @@ class PatientHomePage(BasePage):
                     AppointmentRequestLoad.SPECIALTY,
                     AppointmentRequestLoad.PREFERRED_DOCTOR_WITH_PERSON,
                 ),
+                limit=self.items_shown,
             )
-            return requests
+            count = self.app.repos.appointment_request.count(
+                session,
+                conditions=[
+                    AppointmentRequest.patient_profile_id == patient_profile_id
+                ],
+            )
+            return requests, count
+
+    def _retrieve_recent_appointments(self) -> tuple[Sequence[Appointment], int]:
+        assert self.app.current_person is not None
+        patient_profile_id = self.app.current_person.profile_id
+        return self.app.data_cache.get_or_load(
+            ("patient_home_appointments", patient_profile_id),
+            lambda: self._load_recent_appointments(patient_profile_id),
+            tags=HOME_APPOINTMENTS_CACHE_TAGS,
+            ttl=HOME_CACHE_TTL_SECONDS,
+        )
 
-    def _retrieve_all_appointments(self):
+    def _load_recent_appointments(self, patient_profile_id: int):
         with self.app.session_scope() as session:
-            assert self.app.current_person is not None
-            patient_profile_id = self.app.current_person.profile_id
             appts = self.app.repos.appointment.list_by_patient_profile_id(
                 session,
                 patient_profile_id,
@@ -115,5 +165,10 @@ class PatientHomePage(BasePage):
                     AppointmentLoad.DOCTOR_WITH_PERSON,
                     AppointmentLoad.CREATED_BY_PROFILE,
                 ),
+                limit=self.items_shown,
+            )
+            count = self.app.repos.appointment.count(
+                session,
+                conditions=[Appointment.patient_profile_id == patient_profile_id],
             )
-            return appts
+            return appts, count
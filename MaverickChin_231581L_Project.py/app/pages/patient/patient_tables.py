@@ -14,6 +14,7 @@ def patient_display_appointment_requests_table(
     title="Appointment Requests",
     max_count: int | None = None,
     start_index: int | None = None,
+    total_count: int | None = None,
 ):
     display_one = isinstance(appointment_requests, AppointmentRequest)
     display_list = (
@@ -32,15 +33,17 @@ def patient_display_appointment_requests_table(
     if display_list:
         assert max_count is not None
         assert not isinstance(appointment_requests, AppointmentRequest)
-        if len(appointment_requests) > max_count:
-            title += f" ({max_count}/{len(appointment_requests)})"
+        total = total_count if total_count is not None else len(appointment_requests)
+        if total > max_count:
+            title += f" ({max_count}/{total})"
         else:
-            title += f" ({len(appointment_requests)})"
+            title += f" ({total})"
     elif display_scrolling:
         assert max_count is not None
         assert start_index is not None
         assert not isinstance(appointment_requests, AppointmentRequest)
-        title += f" ({start_index+1}-{min(start_index+max_count, len(appointment_requests))}/{len(appointment_requests)})"
+        total = total_count if total_count is not None else len(appointment_requests)
+        title += f" ({start_index+1}-{min(start_index+max_count, total)}/{total})"
 
     table = Table(title=title, title_justify="left", show_lines=True)
     if display_scrolling:
@@ -56,9 +59,13 @@ def patient_display_appointment_requests_table(
     max_count = max_count if max_count else 1
     if display_one:
         appointment_requests = (appointment_requests,)
-    for offset, appointment_request in enumerate(
-        appointment_requests[start_index : start_index + max_count]
-    ):
+    # With total_count, the sequence passed in is already just the visible page
+    visible = (
+        appointment_requests
+        if total_count is not None
+        else appointment_requests[start_index : start_index + max_count]
+    )
+    for offset, appointment_request in enumerate(visible):
         row = [
             appointment_request.status_enum.display,
             appointment_request.created_datetime.strftime("%Y-%m-%d"),
@@ -109,6 +116,7 @@ def patient_display_appointments_table(
     title: str = "Appointments",
     max_count: int | None = None,
     start_index: int | None = None,
+    total_count: int | None = None,
 ):
     display_one = isinstance(appointments, Appointment)
     display_list = (
@@ -127,15 +135,17 @@ def patient_display_appointments_table(
     if display_list:
         assert max_count is not None
         assert not isinstance(appointments, Appointment)
-        if len(appointments) > max_count:
-            title += f" ({max_count}/{len(appointments)})"
+        total = total_count if total_count is not None else len(appointments)
+        if total > max_count:
+            title += f" ({max_count}/{total})"
         else:
-            title += f" ({len(appointments)})"
+            title += f" ({total})"
     elif display_scrolling:
         assert max_count is not None
         assert start_index is not None
         assert not isinstance(appointments, Appointment)
-        title += f" ({start_index+1}-{min(start_index+max_count, len(appointments))}/{len(appointments)})"
+        total = total_count if total_count is not None else len(appointments)
+        title += f" ({start_index+1}-{min(start_index+max_count, total)}/{total})"
 
     table = Table(title=title, title_justify="left", show_lines=True)
     if display_scrolling:
@@ -155,9 +165,13 @@ def patient_display_appointments_table(
     max_count = max_count if max_count else 1
     if display_one:
         appointments = (appointments,)
-    for offset, appointment in enumerate(
-        appointments[start_index : start_index + max_count]
-    ):
+    # With total_count, the sequence passed in is already just the visible page
+    visible = (
+        appointments
+        if total_count is not None
+        else appointments[start_index : start_index + max_count]
+    )
+    for offset, appointment in enumerate(visible):
         row: list[RenderableType] = [
             appointment.status_enum.display,
             appointment.created_by.type_enum.display,
@@ -1,9 +1,10 @@
-import math
+from typing import Sequence
 
 from app.database.models import AppointmentRequest
 from app.pages.core.base_page import BasePage
 from app.pages.patient.patient_tables import patient_display_appointment_requests_table
 from app.repositories.appointment_request_repository import AppointmentRequestLoad
+from app.ui.paged_table import PagedTable
 from app.ui.prompts import KeyAction, prompt_choice, prompt_continue_message
 
 
@@ -13,43 +14,44 @@ class PatientViewAllAppointmentRequestsPage(BasePage):
         return "View all appointment requests"
 
     items_per_scroll: int = 10
-    scroll_offset: int = 0
-    max_scroll_offset: int
+    table: PagedTable[AppointmentRequest] | None = None
 
     def run(self) -> BasePage | None:
         from app.pages.patient.patient_view_appointment_request_page import (
             PatientViewAppointmentRequestPage,
         )
 
-        self.appointment_requests = self._retrieve_appointment_requests()
-        self.max_scroll_offset = max(
-            0, math.ceil(len(self.appointment_requests) / self.items_per_scroll) - 1
-        )
+        if self.table is None:
+            self.table = PagedTable(
+                self._retrieve_appointment_requests,
+                self._count_appointment_requests,
+                page_size=self.items_per_scroll,
+            )
+        else:
+            self.table.refresh()
 
         while True:
             self.clear()
             self.display_logged_in_header(self.app)
 
-            if len(self.appointment_requests) == 0:
+            if self.table.is_empty:
                 prompt_continue_message(self.console, "No appointment requests.")
                 return
 
-            start_index = self.scroll_offset * self.items_per_scroll
+            appointment_requests = self.table.current_page()
+            start_index = self.table.start_index
             patient_display_appointment_requests_table(
                 self.console,
-                self.appointment_requests,
+                appointment_requests,
                 title="Your Appointment Requests",
                 max_count=self.items_per_scroll,
                 start_index=start_index,
+                total_count=self.table.total_count,
             )
 
             choices = [
                 (req.appointment_request_id, f"No. {start_index + idx + 1}")
-                for idx, req in enumerate(
-                    self.appointment_requests[
-                        start_index : start_index + self.items_per_scroll
-                    ]
-                )
+                for idx, req in enumerate(appointment_requests)
             ]
 
             self.selected_choice = prompt_choice(
@@ -57,36 +59,47 @@ class PatientViewAllAppointmentRequestsPage(BasePage):
                 choices,
                 exitable=True,
                 clearable=False,
-                scrollable=len(self.appointment_requests) > self.items_per_scroll,
+                scrollable=self.table.is_scrollable,
                 show_frame=True,
             )
 
             if self.selected_choice == KeyAction.BACK:
                 return
             elif self.selected_choice == KeyAction.LEFT:
-                self.scroll_offset = (self.scroll_offset - 1) % (
-                    self.max_scroll_offset + 1
-                )
+                self.table.scroll(-1)
             elif self.selected_choice == KeyAction.RIGHT:
-                self.scroll_offset = (self.scroll_offset + 1) % (
-                    self.max_scroll_offset + 1
-                )
+                self.table.scroll(1)
             else:
                 choice_id = self.selected_choice
                 return PatientViewAppointmentRequestPage(self.app, choice_id)
 
-    def _retrieve_appointment_requests(self) -> list[AppointmentRequest]:
+    def _retrieve_appointment_requests(
+        self, offset: int, limit: int
+    ) -> Sequence[AppointmentRequest]:
         with self.app.session_scope() as session:
             assert self.app.current_person is not None
             patient_profile_id = self.app.current_person.profile_id
-            return list(
-                self.app.repos.appointment_request.list_by_patient_profile_id(
-                    session,
-                    patient_profile_id,
-                    order_by_created_datetime_desc=True,
-                    loaders=[
-                        AppointmentRequestLoad.SPECIALTY,
-                        AppointmentRequestLoad.PREFERRED_DOCTOR_WITH_PERSON,
-                    ],
-                )
+            return self.app.repos.appointment_request.list_by_patient_profile_id(
+                session,
+                patient_profile_id,
+                order_by_created_datetime_desc=True,
+                loaders=[
+                    AppointmentRequestLoad.SPECIALTY,
+                    AppointmentRequestLoad.PREFERRED_DOCTOR_WITH_PERSON,
+                ],
+                offset=offset,
+                limit=limit,
+                include_archived=True,
+            )
+
+    def _count_appointment_requests(self) -> int:
+        with self.app.session_scope() as session:
+            assert self.app.current_person is not None
+            return self.app.repos.appointment_request.count(
+                session,
+                conditions=[
+                    AppointmentRequest.patient_profile_id
+                    == self.app.current_person.profile_id
+                ],
+                include_archived=True,
             )
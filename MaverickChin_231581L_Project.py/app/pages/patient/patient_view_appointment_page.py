@@ -39,6 +39,7 @@ class PatientViewAppointmentPage(BasePage):
                         AppointmentLoad.CANCELLED_BY_PROFILE,
                         AppointmentLoad.PRESCRIPTION_WITH_ITEMS_WITH_MEDICATION,
                     ],
+                    include_archived=True,
                 )
                 if appointment is None:
                     raise ValueError(
@@ -10,9 +10,10 @@ from app.pages.patient.patient_tables import (
 )
 from app.repositories.appointment_repository import AppointmentLoad
 from app.repositories.appointment_request_repository import AppointmentRequestLoad
+from app.services import StaleDataError
 from app.ui.inputs.text_input import TextInput
 from app.ui.menu_form import InputResult, MenuField, MenuForm
-from app.ui.prompts import KeyAction, prompt_choice, prompt_success
+from app.ui.prompts import KeyAction, prompt_choice, prompt_error, prompt_success
 from app.validators import (
     validate_date,
     validate_date_in_range,
@@ -52,6 +53,7 @@ class PatientViewAppointmentRequestPage(BasePage):
                         AppointmentRequestLoad.PREFERRED_DOCTOR_WITH_PERSON,
                         AppointmentRequestLoad.HANDLED_BY_PROFILE,
                     ],
+                    include_archived=True,
                 )
                 if appointment_request is None:
                     raise ValueError(
@@ -74,6 +76,7 @@ class PatientViewAppointmentRequestPage(BasePage):
                         AppointmentLoad.CREATED_BY_PROFILE,
                         AppointmentLoad.CANCELLED_BY_PROFILE,
                     ],
+                    include_archived=True,
                 )
                 assert appointment is not None
                 patient_display_appointments_table(
@@ -183,18 +186,27 @@ class PatientViewAppointmentRequestPage(BasePage):
                     else:
                         break
 
-                    with self.app.session_scope() as session:
-                        assert self.app.current_person is not None
-                        request = self.appointment_request
-                        request.preferred_datetime = preferred_datetime
-                        self.app.repos.appointment_request.update(session, request)
-                        break
+                    try:
+                        with self.app.session_scope() as session:
+                            self.app.services.appointment.update_appointment_request_preferred_datetime(
+                                session,
+                                request.appointment_request_id,
+                                preferred_datetime,
+                                request.version_id,
+                            )
+                    except StaleDataError as e:
+                        prompt_error(self.console, str(e))
+                    break
 
             if selected_choice == PageChoice.CANCEL_APPOINTMENT_REQUEST:
-                with self.app.session_scope() as session:
-                    self.app.services.appointment.update_appointment_request_cancelled(
-                        session, self.appointment_request.appointment_request_id
-                    )
+                try:
+                    with self.app.session_scope() as session:
+                        self.app.services.appointment.update_appointment_request_cancelled(
+                            session, self.appointment_request.appointment_request_id
+                        )
+                except StaleDataError as e:
+                    prompt_error(self.console, str(e))
+                    continue
                 prompt_success(
                     self.console, "Appointment request successfully cancelled!"
                 )
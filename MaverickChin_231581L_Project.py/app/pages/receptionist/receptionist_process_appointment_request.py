@@ -4,13 +4,13 @@ from enum import Enum
 
 from app.core.app import App
 from app.core.config import AppConfig
-from app.database.models import Specialty
-from app.lookups.enums import AppointmentRequestStatusEnum, AppointmentStatusEnum
+from app.lookups.enums import AppointmentStatusEnum
 from app.pages.core.base_page import BasePage
 from app.pages.receptionist.receptionist_tables import (
     receptionist_display_appointment_requests_table,
 )
 from app.repositories.appointment_request_repository import AppointmentRequestLoad
+from app.services import StaleDataError
 from app.ui.inputs.doctor_by_specialty_input import DoctorBySpecialtyInput
 from app.ui.inputs.filter_input import FilterInput, FilterItem
 from app.ui.inputs.text_input import TextInput
@@ -156,16 +156,21 @@ class ReceptionistProcessAppointmentRequestPage(BasePage):
                         reason=data[FieldKey.REASON.value],
                         created_by_profile_id=self.app.current_person.profile_id,
                     )
-                    self.appointment_request.appointment_request_status_id = (
-                        AppointmentRequestStatusEnum.APPROVED.value
-                    )
-                    self.appointment_request.appointment_id = appointment.appointment_id
-                    self.app.repos.appointment_request.update(
-                        session, self.appointment_request
+                    # Fails, rolling back the appointment, if someone else
+                    # handled the request since it was loaded
+                    self.app.services.appointment.update_appointment_request_approved(
+                        session,
+                        self.appointment_request_id,
+                        appointment.appointment_id,
+                        handled_by_profile_id=self.app.current_person.profile_id,
+                        handling_notes=None,
                     )
                     prompt_success(self.console, "Appointment created successfully!")
                     return
 
+            except StaleDataError as e:
+                prompt_error(self.console, str(e))
+                return
             except Exception as e:
                 prompt_error(self.console, f"Failed to create appointment request: {e}")
                 continue
@@ -173,10 +178,9 @@ class ReceptionistProcessAppointmentRequestPage(BasePage):
     def _init_fields(self) -> list[MenuField]:
         request = self.appointment_request
 
-        with self.app.session_scope() as session:
-            specialties = self.app.repos.specialty.get_all(
-                session, conditions=[Specialty.is_in_service.is_(True)]
-            )
+        specialties, specialty_index = (
+            self.app.lookup_cache.get_all_specialties_with_index(in_service_only=True)
+        )
 
         return [
             MenuField(
@@ -186,9 +190,10 @@ class ReceptionistProcessAppointmentRequestPage(BasePage):
                     self.app,
                     FieldKey.SPECIALTY.value,
                     [
-                        FilterItem(value=s.specialty_id, filter_values=[s.name])
-                        for s in specialties
+                        FilterItem(value=specialty_id, filter_values=[name])
+                        for specialty_id, name in specialties
                     ],
+                    index=specialty_index,
                 ),
                 InputResult(
                     value=request.specialty_id,
@@ -1,6 +1,9 @@
-import math
+from datetime import timedelta
+from typing import Sequence
 
 from app.core.app import App
+from app.core.config import AppConfig
+from app.database.models import AppointmentRequest
 from app.lookups.enums import AppointmentRequestStatusEnum
 from app.pages.core.base_page import BasePage
 from app.repositories.appointment_request_repository import AppointmentRequestLoad
@@ -14,9 +17,8 @@ class ReceptionistSelectFromAppointmentRequestsInSpecialty(BasePage):
     def title(self):
         return "Select from appointment requests in specialty"
 
-    items_per_scroll: int = 10
-    scroll_offset: int = 0
-    max_scroll_offset: int
+    # Requests claimed at a time, so receptionists work on disjoint batches
+    batch_size: int = 10
 
     def __init__(self, app: App, specialty_id: int):
         super().__init__(app)
@@ -30,78 +32,81 @@ class ReceptionistSelectFromAppointmentRequestsInSpecialty(BasePage):
             ReceptionistWorkOnAppointmentRequestPage,
         )
 
-        with self.app.session_scope() as session:
-            self.appointment_requests = (
-                self.app.repos.appointment_request.list_by_specialty(
-                    session,
-                    specialty_id=self.specialty_id,
-                    only_include_status_ids=[AppointmentRequestStatusEnum.PENDING],
-                    order_by_created_datetime_desc=True,
-                    loaders=[
-                        AppointmentRequestLoad.PATIENT_WITH_PERSON,
-                        AppointmentRequestLoad.PREFERRED_DOCTOR_WITH_PERSON,
-                    ],
-                )
+        # Claims are renewed and topped up every time the page is shown
+        visible = self._claim_pending_appointment_requests()
+        pending_count = self._count_pending_appointment_requests()
+
+        self.clear()
+        self.display_logged_in_header(self.app)
+        if not visible:
+            prompt_continue_message(
+                self.console,
+                f"No unclaimed appointment requests for specialty {self.specialty_name}.",
             )
+            return
 
-        self.max_scroll_offset = max(
-            0, math.ceil(len(self.appointment_requests) / self.items_per_scroll) - 1
+        self._display_all_pending_appointment_requests_in_specialty(
+            visible, pending_count
         )
 
-        while True:
-            self.clear()
-            self.display_logged_in_header(self.app)
-            if len(self.appointment_requests) == 0:
-                prompt_continue_message(
-                    self.console,
-                    f"No appointment requests for specialty {self.app.lookup_cache.get_specialty_name(self.specialty_id)}.",
-                )
-                return
+        choices = [
+            (appointment_request.appointment_request_id, f"No. {idx + 1}")
+            for idx, appointment_request in enumerate(visible)
+        ]
+
+        self.selected_choice = prompt_choice(
+            "Select appointment request to work on",
+            choices,
+            exitable=True,
+            clearable=False,
+            scrollable=False,
+            show_frame=True,
+        )
 
-            self._display_all_pending_appointment_requests_in_specialty()
+        if self.selected_choice == KeyAction.BACK:
+            self._release_claims()
+            return
+        return ReceptionistWorkOnAppointmentRequestPage(self.app, self.selected_choice)
 
-            visible, start_index = self._get_visible_window()
+    def _claim_pending_appointment_requests(self) -> Sequence[AppointmentRequest]:
+        assert self.app.current_person is not None
+        with self.app.session_scope() as session:
+            return self.app.services.appointment.claim_appointment_requests(
+                session,
+                self.specialty_id,
+                self.app.current_person.profile_id,
+                self.batch_size,
+                lease=timedelta(
+                    minutes=AppConfig.appointment_request_claim_lease_minutes
+                ),
+                loaders=[
+                    AppointmentRequestLoad.PATIENT_WITH_PERSON,
+                    AppointmentRequestLoad.PREFERRED_DOCTOR_WITH_PERSON,
+                ],
+            )
 
-            choices = [
-                (
-                    appointment_request.appointment_request_id,
-                    f"No. {start_index + idx + 1}",
-                )
-                for idx, appointment_request in enumerate(visible)
-            ]
-
-            self.selected_choice = prompt_choice(
-                "Select appointment request to work on",
-                choices,
-                exitable=True,
-                clearable=False,
-                scrollable=len(self.appointment_requests) > self.items_per_scroll,
-                show_frame=True,
+    def _release_claims(self) -> None:
+        assert self.app.current_person is not None
+        with self.app.session_scope() as session:
+            self.app.repos.appointment_request.release_claims(
+                session, self.app.current_person.profile_id, self.specialty_id
+            )
+
+    def _count_pending_appointment_requests(self) -> int:
+        with self.app.session_scope() as session:
+            return self.app.repos.appointment_request.count(
+                session,
+                conditions=[
+                    AppointmentRequest.specialty_id == self.specialty_id,
+                    AppointmentRequest.appointment_request_status_id
+                    == AppointmentRequestStatusEnum.PENDING,
+                ],
             )
 
-            if self.selected_choice == KeyAction.BACK:
-                return
-            elif self.selected_choice == KeyAction.LEFT:
-                self.scroll_offset = (self.scroll_offset - 1) % (
-                    self.max_scroll_offset + 1
-                )
-            elif self.selected_choice == KeyAction.RIGHT:
-                self.scroll_offset = (self.scroll_offset + 1) % (
-                    self.max_scroll_offset + 1
-                )
-            else:
-                choice_id = self.selected_choice
-                return ReceptionistWorkOnAppointmentRequestPage(self.app, choice_id)
-
-    def _get_visible_window(self):
-        start = self.scroll_offset * self.items_per_scroll
-        end = start + self.items_per_scroll
-        return self.appointment_requests[start:end], start
-
-    def _display_all_pending_appointment_requests_in_specialty(self):
-        visible, start_index = self._get_visible_window()
-
-        title = f"Pending Appointment Requests for {self.specialty_name} ({start_index+1}-{start_index+len(visible)}/{len(self.appointment_requests)})"
+    def _display_all_pending_appointment_requests_in_specialty(
+        self, visible: Sequence[AppointmentRequest], pending_count: int
+    ):
+        title = f"Your Claimed Appointment Requests for {self.specialty_name} ({len(visible)} of {pending_count} pending)"
         table = Table(title=title, title_justify="left", show_lines=True)
         table.add_column("No.")
         table.add_column("Created")
@@ -110,10 +115,9 @@ class ReceptionistSelectFromAppointmentRequestsInSpecialty(BasePage):
         table.add_column("Preferred Doctor")
         table.add_column("Preferred Datetime")
 
-        for offset, request in enumerate(visible):
-            global_index = start_index + offset
+        for idx, request in enumerate(visible):
             table.add_row(
-                str(global_index + 1),
+                str(idx + 1),
                 request.created_datetime.strftime("%Y-%m-%d"),
                 request.patient.full_name,
                 request.reason,
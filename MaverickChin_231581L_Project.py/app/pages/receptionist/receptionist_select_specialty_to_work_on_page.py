@@ -1,9 +1,13 @@
-import math
+from datetime import datetime
+from typing import Sequence
 
+from app.database.models import Specialty
 from app.pages.core.base_page import BasePage
+from app.ui.paged_table import PagedTable
 from app.ui.prompts import KeyAction, prompt_choice, prompt_continue_message
 from rich.table import Table
 from rich.text import Text
+from sqlalchemy import Row
 
 
 class ReceptionistSelectSpecialtyToWorkOnPage(BasePage):
@@ -12,35 +16,35 @@ class ReceptionistSelectSpecialtyToWorkOnPage(BasePage):
         return "Select specialty to work on"
 
     items_per_scroll: int = 10
-    scroll_offset: int = 0
-    max_scroll_offset: int
+    table: PagedTable[Row[tuple[int, int, datetime | None, datetime]]] | None = None
 
     def run(self) -> BasePage | None:
         from app.pages.receptionist.receptionist_select_from_appointment_requests_in_specialty_page import (
             ReceptionistSelectFromAppointmentRequestsInSpecialty,
         )
 
-        with self.app.session_scope() as session:
-            self.details = (
-                self.app.repos.appointment_request.get_specialty_importance_details(
-                    session
-                )
+        if self.table is None:
+            self.table = PagedTable(
+                self._retrieve_details,
+                self._count_specialties,
+                page_size=self.items_per_scroll,
             )
-        self.max_scroll_offset = max(
-            0, math.ceil(len(self.details) / self.items_per_scroll) - 1
-        )
+        else:
+            self.table.refresh()
 
         while True:
             self.clear()
             self.display_logged_in_header(self.app)
 
-            if len(self.details) == 0:
+            if self.table.is_empty:
                 prompt_continue_message(self.console, "No specialties.")
                 return
 
-            self._display_all_specialties_pending_appointment_requests()
-
-            visible, start_index = self._get_visible_window()
+            visible = self.table.current_page()
+            start_index = self.table.start_index
+            self._display_all_specialties_pending_appointment_requests(
+                visible, start_index
+            )
 
             choices = [
                 (
@@ -55,35 +59,43 @@ class ReceptionistSelectSpecialtyToWorkOnPage(BasePage):
                 choices,
                 exitable=True,
                 clearable=False,
-                scrollable=len(self.details) > self.items_per_scroll,
+                scrollable=self.table.is_scrollable,
                 show_frame=True,
             )
 
             if self.selected_choice == KeyAction.BACK:
                 return
             elif self.selected_choice == KeyAction.LEFT:
-                self.scroll_offset = (self.scroll_offset - 1) % (
-                    self.max_scroll_offset + 1
-                )
+                self.table.scroll(-1)
             elif self.selected_choice == KeyAction.RIGHT:
-                self.scroll_offset = (self.scroll_offset + 1) % (
-                    self.max_scroll_offset + 1
-                )
+                self.table.scroll(1)
             else:
                 choice_id = self.selected_choice
                 return ReceptionistSelectFromAppointmentRequestsInSpecialty(
                     self.app, choice_id
                 )
 
-    def _get_visible_window(self):
-        start = self.scroll_offset * self.items_per_scroll
-        end = start + self.items_per_scroll
-        return self.details[start:end], start
+    def _retrieve_details(
+        self, offset: int, limit: int
+    ) -> Sequence[Row[tuple[int, int, datetime | None, datetime]]]:
+        with self.app.session_scope() as session:
+            return self.app.repos.appointment_request.get_specialty_importance_details(
+                session, offset=offset, limit=limit
+            )
 
-    def _display_all_specialties_pending_appointment_requests(self):
-        visible, start_index = self._get_visible_window()
+    def _count_specialties(self) -> int:
+        with self.app.session_scope() as session:
+            return self.app.repos.specialty.count(
+                session, conditions=[Specialty.is_in_service.is_(True)]
+            )
 
-        title = f"Pending Appointment Requests by Specialty ({start_index+1}-{start_index+len(visible)}/{len(self.details)})"
+    def _display_all_specialties_pending_appointment_requests(
+        self,
+        visible: Sequence[Row[tuple[int, int, datetime | None, datetime]]],
+        start_index: int,
+    ):
+        assert self.table is not None
+        title = f"Pending Appointment Requests by Specialty ({start_index+1}-{start_index+len(visible)}/{self.table.total_count})"
         table = Table(title=title, title_justify="left")
         table.add_column("No.")
         table.add_column("Specialty")
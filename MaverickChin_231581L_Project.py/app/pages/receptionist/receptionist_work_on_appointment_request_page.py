@@ -11,9 +11,10 @@ from app.pages.receptionist.receptionist_tables import (
 )
 from app.repositories.appointment_repository import AppointmentLoad
 from app.repositories.appointment_request_repository import AppointmentRequestLoad
+from app.services import StaleDataError
 from app.ui.inputs import TextInput
 from app.ui.menu_form import MenuField, MenuForm
-from app.ui.prompts import KeyAction, prompt_choice
+from app.ui.prompts import KeyAction, prompt_choice, prompt_error
 
 
 class PageChoice(Enum):
@@ -121,15 +122,18 @@ class ReceptionistWorkOnAppointmentRequestPage(BasePage):
 
                     handling_notes = data["Rejection Reason"]
 
-                    with self.app.session_scope() as session:
-                        assert self.app.current_person is not None
-                        self.app.services.appointment.update_appointment_request_rejected(
-                            session,
-                            request.appointment_request_id,
-                            self.app.current_person.profile_id,
-                            handling_notes,
-                        )
-                        break
+                    try:
+                        with self.app.session_scope() as session:
+                            assert self.app.current_person is not None
+                            self.app.services.appointment.update_appointment_request_rejected(
+                                session,
+                                request.appointment_request_id,
+                                self.app.current_person.profile_id,
+                                handling_notes,
+                            )
+                    except StaleDataError as e:
+                        prompt_error(self.console, str(e))
+                    break
 
     def _generate_choices(self):
         choices: list[tuple[PageChoice, str]] = []
@@ -6,6 +6,7 @@ from app.repositories.doctor_profile_repository import DoctorProfileRepository
 from app.repositories.appointment_request_repository import AppointmentRequestRepository
 from app.repositories.appointment_repository import AppointmentRepository
 from app.repositories.prescription_repository import PrescriptionRepository
+from app.repositories.table_change_repository import TableChangeRepository
 
 __all__ = [
     "BaseRepository",
@@ -16,4 +17,5 @@ __all__ = [
     "AppointmentRequestRepository",
     "AppointmentRepository",
     "PrescriptionRepository",
+    "TableChangeRepository",
 ]
@@ -1,16 +1,21 @@
 from datetime import datetime
-from typing import Sequence
+from typing import Any, Iterator, Sequence
 
+from app.database.archive_reads import reading_archives
+from app.database.functions import epoch_minutes
 from app.database.models import (
     Appointment,
+    AppointmentStatus,
     DoctorProfile,
     PatientProfile,
+    Person,
     Prescription,
     PrescriptionItem,
     Profile,
+    Specialty,
 )
-from sqlalchemy import Row, select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Result, Row, select, update
+from sqlalchemy.orm import Session, aliased, joinedload
 from sqlalchemy.orm.interfaces import LoaderOption
 
 from .base_repository import BaseRepository
@@ -60,6 +65,9 @@ class AppointmentRepository(BaseRepository[Appointment]):
         datetime_range: tuple[datetime, datetime] | None = None,
         order_by_created_datetime_desc: bool | None = None,
         loaders: Sequence[LoaderOption] = (),
+        offset: int | None = None,
+        limit: int | None = None,
+        include_archived: bool = False,
     ) -> Sequence[Appointment]:
         stmt = (
             select(Appointment)
@@ -77,13 +85,13 @@ class AppointmentRepository(BaseRepository[Appointment]):
                 Appointment.start_datetime >= start,
                 Appointment.end_datetime <= end,
             )
-        if order_by_created_datetime_desc is not None:
-            stmt = stmt.order_by(
-                Appointment.created_datetime.desc()
-                if order_by_created_datetime_desc
-                else Appointment.created_datetime.asc()
-            )
-        return session.scalars(stmt).all()
+        stmt = self._order_by_created_datetime(stmt, order_by_created_datetime_desc)
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        with reading_archives(session, include_archived):
+            return session.scalars(stmt).all()
 
     def list_by_doctor_profile_id(
         self,
@@ -94,6 +102,9 @@ class AppointmentRepository(BaseRepository[Appointment]):
         datetime_range: tuple[datetime, datetime] | None = None,
         order_by_created_datetime_desc: bool | None = None,
         loaders: Sequence[LoaderOption] = (),
+        offset: int | None = None,
+        limit: int | None = None,
+        include_archived: bool = False,
     ) -> Sequence[Appointment]:
         stmt = (
             select(Appointment)
@@ -111,13 +122,13 @@ class AppointmentRepository(BaseRepository[Appointment]):
                 Appointment.start_datetime >= start,
                 Appointment.end_datetime <= end,
             )
-        if order_by_created_datetime_desc is not None:
-            stmt = stmt.order_by(
-                Appointment.created_datetime.desc()
-                if order_by_created_datetime_desc
-                else Appointment.created_datetime.asc()
-            )
-        return session.scalars(stmt).all()
+        stmt = self._order_by_created_datetime(stmt, order_by_created_datetime_desc)
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        with reading_archives(session, include_archived):
+            return session.scalars(stmt).all()
 
     def list_appointment_details_by_doctor_profile_id(
         self,
@@ -208,6 +219,9 @@ class AppointmentRepository(BaseRepository[Appointment]):
         datetime_range: tuple[datetime, datetime] | None = None,
         order_by_created_datetime_desc: bool | None = None,
         loaders: Sequence[LoaderOption] = (),
+        offset: int | None = None,
+        limit: int | None = None,
+        include_archived: bool = False,
     ) -> Sequence[Appointment]:
         stmt = (
             select(Appointment)
@@ -225,10 +239,195 @@ class AppointmentRepository(BaseRepository[Appointment]):
                 Appointment.start_datetime >= start,
                 Appointment.end_datetime <= end,
             )
-        if order_by_created_datetime_desc is not None:
-            stmt = stmt.order_by(
-                Appointment.created_datetime.desc()
-                if order_by_created_datetime_desc
-                else Appointment.created_datetime.asc()
+        stmt = self._order_by_created_datetime(stmt, order_by_created_datetime_desc)
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        with reading_archives(session, include_archived):
+            return session.scalars(stmt).all()
+
+    def iter_schedule_rows(
+        self,
+        session: Session,
+        datetime_range: tuple[datetime, datetime],
+        *,
+        chunk_size: int = 500,
+        include_archived: bool = False,
+    ) -> Iterator[Row[tuple[datetime, datetime, str, str, str, str, int, str]]]:
+        """
+        Stream appointments starting in datetime_range, ordered by start then room.
+
+        :param include_archived: Also read archived appointments.
+        :return: (start_datetime, end_datetime, room_name, specialty_name,
+            doctor_full_name, patient_full_name, appointment_status_id, reason)
+        """
+        doctor_profile = aliased(Profile)
+        doctor_person = aliased(Person)
+        patient_profile = aliased(Profile)
+        patient_person = aliased(Person)
+        start, end = datetime_range
+        stmt = (
+            select(
+                Appointment.start_datetime,
+                Appointment.end_datetime,
+                Appointment.room_name,
+                Specialty.name,
+                doctor_person.first_name + " " + doctor_person.last_name,
+                patient_person.first_name + " " + patient_person.last_name,
+                Appointment.appointment_status_id,
+                Appointment.reason,
+            )
+            .join(Specialty, Specialty.specialty_id == Appointment.specialty_id)
+            .join(
+                doctor_profile,
+                doctor_profile.profile_id == Appointment.doctor_profile_id,
+            )
+            .join(doctor_person, doctor_person.person_id == doctor_profile.person_id)
+            .join(
+                patient_profile,
+                patient_profile.profile_id == Appointment.patient_profile_id,
+            )
+            .join(patient_person, patient_person.person_id == patient_profile.person_id)
+            .where(
+                Appointment.start_datetime >= start,
+                Appointment.start_datetime < end,
+            )
+            .order_by(
+                Appointment.start_datetime,
+                Appointment.room_name,
+                Appointment.appointment_id,
+            )
+            .execution_options(yield_per=chunk_size)
+        )
+        with reading_archives(session, include_archived):
+            result = session.execute(stmt)
+        yield from result
+
+    def stream_export_rows(
+        self,
+        session: Session,
+        *,
+        datetime_range: tuple[datetime, datetime] | None = None,
+        specialty_id: int | None = None,
+        chunk_size: int = 500,
+        include_archived: bool = False,
+    ) -> Result:
+        """
+        Appointments as flat export columns, streamed chunk_size rows at a time
+        (server-side cursor where the driver supports one).
+
+        :param datetime_range: Only appointments starting in [start, end).
+        :param include_archived: Also read archived appointments.
+        :return: A result whose keys() are the column names.
+        """
+        doctor_profile = aliased(Profile)
+        doctor_person = aliased(Person)
+        patient_profile = aliased(Profile)
+        patient_person = aliased(Person)
+        stmt = (
+            select(
+                Appointment.appointment_id.label("appointment_id"),
+                Appointment.start_datetime.label("start"),
+                Appointment.end_datetime.label("end"),
+                Appointment.room_name.label("room"),
+                Specialty.name.label("specialty"),
+                (doctor_person.first_name + " " + doctor_person.last_name).label(
+                    "doctor"
+                ),
+                (patient_person.first_name + " " + patient_person.last_name).label(
+                    "patient"
+                ),
+                AppointmentStatus.name.label("status"),
+                Appointment.reason.label("reason"),
+                Appointment.doctor_notes.label("doctor_notes"),
+                Appointment.created_datetime.label("created"),
+                Appointment.cancelled_datetime.label("cancelled"),
+                Appointment.cancellation_reason.label("cancellation_reason"),
+            )
+            .join(Specialty, Specialty.specialty_id == Appointment.specialty_id)
+            .join(
+                AppointmentStatus,
+                AppointmentStatus.appointment_status_id
+                == Appointment.appointment_status_id,
             )
-        return session.scalars(stmt).all()
+            .join(
+                doctor_profile,
+                doctor_profile.profile_id == Appointment.doctor_profile_id,
+            )
+            .join(doctor_person, doctor_person.person_id == doctor_profile.person_id)
+            .join(
+                patient_profile,
+                patient_profile.profile_id == Appointment.patient_profile_id,
+            )
+            .join(patient_person, patient_person.person_id == patient_profile.person_id)
+            .order_by(Appointment.start_datetime, Appointment.appointment_id)
+            .execution_options(yield_per=chunk_size)
+        )
+        if datetime_range:
+            start, end = datetime_range
+            stmt = stmt.where(
+                Appointment.start_datetime >= start,
+                Appointment.start_datetime < end,
+            )
+        if specialty_id is not None:
+            stmt = stmt.where(Appointment.specialty_id == specialty_id)
+        with reading_archives(session, include_archived):
+            return session.execute(stmt)
+
+    def list_booking_rows(
+        self,
+        session: Session,
+        datetime_range: tuple[datetime, datetime],
+        *,
+        include_archived: bool = False,
+    ) -> Sequence[Row[tuple[int, int, int, int]]]:
+        """
+        Every appointment starting in datetime_range, as bare integers for analytics.
+
+        :param include_archived: Also read archived appointments.
+        :return: (doctor_profile_id, start minutes since 1970-01-01,
+            end minutes since 1970-01-01, appointment_status_id)
+        """
+        start, end = datetime_range
+        stmt = select(
+            Appointment.doctor_profile_id,
+            epoch_minutes(Appointment.start_datetime),
+            epoch_minutes(Appointment.end_datetime),
+            Appointment.appointment_status_id,
+        ).where(
+            Appointment.start_datetime >= start,
+            Appointment.start_datetime < end,
+        )
+        with reading_archives(session, include_archived):
+            return session.execute(stmt).all()
+
+    # -------------------------------------------------------------------------
+    # UPDATE
+    # -------------------------------------------------------------------------
+    def update_status_by_ids(
+        self,
+        session: Session,
+        appointment_ids: Sequence[int],
+        appointment_status_id: int,
+        *,
+        conditions: Sequence[Any] = (),
+        **values: Any,
+    ) -> int:
+        """
+        Set the status (and any other given columns) of many appointments in one
+        UPDATE, skipping any that no longer meet conditions.
+
+        :return: Number of appointments updated.
+        """
+        stmt = (
+            update(Appointment)
+            .where(Appointment.appointment_id.in_(appointment_ids), *conditions)
+            .values(
+                appointment_status_id=appointment_status_id,
+                version_id=Appointment.version_id + 1,
+                **values,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return session.execute(stmt).rowcount
@@ -1,16 +1,19 @@
-from datetime import datetime
-from typing import Sequence
+from datetime import datetime, timedelta
+from typing import Any, Sequence
 
+from app.database.archive_reads import reading_archives
 from app.database.models import (
     AppointmentRequest,
+    AppointmentRequestStatus,
     DoctorProfile,
     PatientProfile,
+    Person,
     Profile,
     Specialty,
 )
 from app.lookups.enums import AppointmentRequestStatusEnum
-from sqlalchemy import Row, and_, case, func, select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Result, Row, and_, case, func, or_, select, update
+from sqlalchemy.orm import Session, aliased, joinedload
 from sqlalchemy.orm.interfaces import LoaderOption
 
 from .base_repository import BaseRepository
@@ -48,6 +51,9 @@ class AppointmentRequestRepository(BaseRepository[AppointmentRequest]):
         datetime_range: tuple[datetime, datetime] | None = None,
         order_by_created_datetime_desc: bool | None = None,
         loaders: Sequence[LoaderOption] = (),
+        offset: int | None = None,
+        limit: int | None = None,
+        include_archived: bool = False,
     ) -> Sequence[AppointmentRequest]:
 
         stmt = (
@@ -69,13 +75,13 @@ class AppointmentRequestRepository(BaseRepository[AppointmentRequest]):
                 AppointmentRequest.created_datetime >= start,
                 AppointmentRequest.created_datetime <= end,
             )
-        if order_by_created_datetime_desc is not None:
-            stmt = stmt.order_by(
-                AppointmentRequest.created_datetime.desc()
-                if order_by_created_datetime_desc
-                else AppointmentRequest.created_datetime.asc()
-            )
-        return session.scalars(stmt).all()
+        stmt = self._order_by_created_datetime(stmt, order_by_created_datetime_desc)
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        with reading_archives(session, include_archived):
+            return session.scalars(stmt).all()
 
     def list_by_specialty(
         self,
@@ -86,6 +92,8 @@ class AppointmentRequestRepository(BaseRepository[AppointmentRequest]):
         datetime_range: tuple[datetime, datetime] | None = None,
         order_by_created_datetime_desc: bool | None = None,
         loaders: Sequence[LoaderOption] = (),
+        offset: int | None = None,
+        limit: int | None = None,
     ) -> Sequence[AppointmentRequest]:
         stmt = (
             select(AppointmentRequest)
@@ -105,14 +113,116 @@ class AppointmentRequestRepository(BaseRepository[AppointmentRequest]):
                 AppointmentRequest.created_datetime >= start,
                 AppointmentRequest.created_datetime <= end,
             )
-        if order_by_created_datetime_desc is not None:
-            stmt = stmt.order_by(
-                AppointmentRequest.created_datetime.desc()
-                if order_by_created_datetime_desc
-                else AppointmentRequest.created_datetime.asc()
+        stmt = self._order_by_created_datetime(stmt, order_by_created_datetime_desc)
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return session.scalars(stmt).all()
+
+    def list_claimed(
+        self,
+        session: Session,
+        specialty_id: int,
+        receptionist_profile_id: int,
+        *,
+        loaders: Sequence[LoaderOption] = (),
+    ) -> Sequence[AppointmentRequest]:
+        """Pending requests in a specialty with a live claim by this receptionist."""
+        stmt = (
+            select(AppointmentRequest)
+            .where(
+                AppointmentRequest.specialty_id == specialty_id,
+                AppointmentRequest.appointment_request_status_id
+                == AppointmentRequestStatusEnum.PENDING,
+                AppointmentRequest.claimed_by_profile_id == receptionist_profile_id,
+                AppointmentRequest.claim_expires_datetime >= datetime.now(),
+            )
+            .options(*loaders)
+            .order_by(
+                AppointmentRequest.created_datetime,
+                AppointmentRequest.appointment_request_id,
             )
+        )
         return session.scalars(stmt).all()
 
+    def stream_export_rows(
+        self,
+        session: Session,
+        *,
+        datetime_range: tuple[datetime, datetime] | None = None,
+        specialty_id: int | None = None,
+        chunk_size: int = 500,
+        include_archived: bool = False,
+    ) -> Result:
+        """
+        Appointment requests as flat export columns, streamed chunk_size rows at a
+        time (server-side cursor where the driver supports one).
+
+        :param datetime_range: Only requests created in [start, end).
+        :param include_archived: Also read archived requests.
+        :return: A result whose keys() are the column names.
+        """
+        patient_profile = aliased(Profile)
+        patient_person = aliased(Person)
+        doctor_profile = aliased(Profile)
+        doctor_person = aliased(Person)
+        stmt = (
+            select(
+                AppointmentRequest.appointment_request_id.label(
+                    "appointment_request_id"
+                ),
+                AppointmentRequest.created_datetime.label("created"),
+                Specialty.name.label("specialty"),
+                (patient_person.first_name + " " + patient_person.last_name).label(
+                    "patient"
+                ),
+                (doctor_person.first_name + " " + doctor_person.last_name).label(
+                    "preferred_doctor"
+                ),
+                AppointmentRequest.preferred_datetime.label("preferred_datetime"),
+                AppointmentRequestStatus.name.label("status"),
+                AppointmentRequest.reason.label("reason"),
+                AppointmentRequest.appointment_id.label("appointment_id"),
+                AppointmentRequest.handled_datetime.label("handled"),
+                AppointmentRequest.handling_notes.label("handling_notes"),
+            )
+            .join(Specialty, Specialty.specialty_id == AppointmentRequest.specialty_id)
+            .join(
+                AppointmentRequestStatus,
+                AppointmentRequestStatus.appointment_request_status_id
+                == AppointmentRequest.appointment_request_status_id,
+            )
+            .join(
+                patient_profile,
+                patient_profile.profile_id == AppointmentRequest.patient_profile_id,
+            )
+            .join(patient_person, patient_person.person_id == patient_profile.person_id)
+            .outerjoin(
+                doctor_profile,
+                doctor_profile.profile_id
+                == AppointmentRequest.preferred_doctor_profile_id,
+            )
+            .outerjoin(
+                doctor_person, doctor_person.person_id == doctor_profile.person_id
+            )
+            .order_by(
+                AppointmentRequest.created_datetime,
+                AppointmentRequest.appointment_request_id,
+            )
+            .execution_options(yield_per=chunk_size)
+        )
+        if datetime_range:
+            start, end = datetime_range
+            stmt = stmt.where(
+                AppointmentRequest.created_datetime >= start,
+                AppointmentRequest.created_datetime < end,
+            )
+        if specialty_id is not None:
+            stmt = stmt.where(AppointmentRequest.specialty_id == specialty_id)
+        with reading_archives(session, include_archived):
+            return session.execute(stmt)
+
     def count_by_specialty(self, session: Session) -> Sequence[Row[tuple[int, int]]]:
         """
         :return: (specialty_id, count)
@@ -123,11 +233,14 @@ class AppointmentRequestRepository(BaseRepository[AppointmentRequest]):
             func.count(AppointmentRequest.appointment_request_id),
         ).group_by(AppointmentRequest.specialty_id)
 
-        results = session.execute(stmt).all()
-        return results
+        return self._execute_cached(session, stmt)
 
     def get_specialty_importance_details(
-        self, session: Session
+        self,
+        session: Session,
+        *,
+        offset: int | None = None,
+        limit: int | None = None,
     ) -> Sequence[Row[tuple[int, int, datetime | None, datetime]]]:
         """
         For receptionist use.
@@ -165,7 +278,157 @@ class AppointmentRequestRepository(BaseRepository[AppointmentRequest]):
                 case((earliest_created_datetime == None, 1), else_=0),
                 earliest_created_datetime,
                 appointment_request_count.desc(),
+                Specialty.specialty_id,
             )
         )
-        results = session.execute(stmt).all()
-        return results
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return self._execute_cached(session, stmt)
+
+    # -------------------------------------------------------------------------
+    # UPDATE
+    # -------------------------------------------------------------------------
+    def update_status_by_ids(
+        self,
+        session: Session,
+        appointment_request_ids: Sequence[int],
+        appointment_request_status_id: int,
+        *,
+        conditions: Sequence[Any] = (),
+        **values: Any,
+    ) -> int:
+        """
+        Set the status (and any other given columns) of many requests in one
+        UPDATE, skipping any that no longer meet conditions.
+
+        :return: Number of requests updated.
+        """
+        stmt = (
+            update(AppointmentRequest)
+            .where(
+                AppointmentRequest.appointment_request_id.in_(appointment_request_ids),
+                *conditions,
+            )
+            .values(
+                appointment_request_status_id=appointment_request_status_id,
+                version_id=AppointmentRequest.version_id + 1,
+                **values,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return session.execute(stmt).rowcount
+
+    # -------------------------------------------------------------------------
+    # WORK QUEUE
+    # -------------------------------------------------------------------------
+    def claim_next(
+        self,
+        session: Session,
+        specialty_id: int,
+        n: int,
+        receptionist_profile_id: int,
+        *,
+        lease: timedelta,
+    ) -> list[int]:
+        """
+        Claim up to n of the oldest pending requests in a specialty that nobody
+        holds a live claim on, until lease from now. Expired claims are up for
+        grabs again.
+
+        Concurrent callers get disjoint batches. MySQL skips rows that other
+        transactions are claiming (SELECT ... FOR UPDATE SKIP LOCKED). SQLite
+        claims in a single UPDATE, which its database write lock makes atomic.
+
+        :return: Claimed request IDs, oldest first.
+        """
+        now = datetime.now()
+        claimable = (
+            select(AppointmentRequest.appointment_request_id)
+            .where(
+                AppointmentRequest.specialty_id == specialty_id,
+                AppointmentRequest.appointment_request_status_id
+                == AppointmentRequestStatusEnum.PENDING,
+                or_(
+                    AppointmentRequest.claimed_by_profile_id.is_(None),
+                    AppointmentRequest.claim_expires_datetime < now,
+                ),
+            )
+            .order_by(
+                AppointmentRequest.created_datetime,
+                AppointmentRequest.appointment_request_id,
+            )
+            .limit(n)
+        )
+        claim = (
+            update(AppointmentRequest)
+            .values(
+                claimed_by_profile_id=receptionist_profile_id,
+                claim_expires_datetime=now + lease,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        if session.get_bind().dialect.name == "mysql":
+            # MySQL cannot LIMIT a subquery of the table being updated
+            ids = list(session.scalars(claimable.with_for_update(skip_locked=True)))
+            if ids:
+                session.execute(
+                    claim.where(AppointmentRequest.appointment_request_id.in_(ids))
+                )
+            return ids
+
+        claimed = session.execute(
+            claim.where(
+                AppointmentRequest.appointment_request_id.in_(claimable)
+            ).returning(
+                AppointmentRequest.created_datetime,
+                AppointmentRequest.appointment_request_id,
+            )
+        ).all()
+        return [request_id for _, request_id in sorted(claimed)]
+
+    def renew_claims(
+        self,
+        session: Session,
+        specialty_id: int,
+        receptionist_profile_id: int,
+        *,
+        lease: timedelta,
+    ) -> int:
+        """
+        Extend this receptionist's claims on pending requests in a specialty
+        until lease from now, including expired claims nobody has taken over.
+
+        :return: Number of claims renewed.
+        """
+        stmt = (
+            update(AppointmentRequest)
+            .where(
+                AppointmentRequest.specialty_id == specialty_id,
+                AppointmentRequest.appointment_request_status_id
+                == AppointmentRequestStatusEnum.PENDING,
+                AppointmentRequest.claimed_by_profile_id == receptionist_profile_id,
+            )
+            .values(claim_expires_datetime=datetime.now() + lease)
+            .execution_options(synchronize_session=False)
+        )
+        return session.execute(stmt).rowcount
+
+    def release_claims(
+        self,
+        session: Session,
+        receptionist_profile_id: int,
+        specialty_id: int | None = None,
+    ) -> int:
+        """Return this receptionist's claims, in one specialty if given, to the pool."""
+        stmt = (
+            update(AppointmentRequest)
+            .where(AppointmentRequest.claimed_by_profile_id == receptionist_profile_id)
+            .values(claimed_by_profile_id=None, claim_expires_datetime=None)
+            .execution_options(synchronize_session=False)
+        )
+        if specialty_id is not None:
+            stmt = stmt.where(AppointmentRequest.specialty_id == specialty_id)
+        return session.execute(stmt).rowcount
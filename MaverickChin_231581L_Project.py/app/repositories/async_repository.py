@@ -0,0 +1,153 @@
+from typing import Any, Callable, Concatenate, Generic, ParamSpec, Sequence, TypeVar
+
+from app.repositories.base_repository import BaseRepository
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.interfaces import LoaderOption
+
+T = TypeVar("T")
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class AsyncRepository(Generic[T]):
+    """
+    Async counterpart of a repository, built from the same statements.
+
+    The common reads and writes of BaseRepository are awaited directly; any
+    other method of the wrapped repository can be awaited through run().
+    Relationships cannot lazy load on an AsyncSession, so pass loaders for
+    everything the caller reads.
+    """
+
+    def __init__(self, repo: BaseRepository[T]):
+        self.repo = repo
+        self.model = repo.model
+
+    async def run(
+        self,
+        session: AsyncSession,
+        method: Callable[Concatenate[Session, P], R],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> R:
+        """
+        Await a sync repository method on the session, e.g.
+        run(session, repo.list_by_specialty, specialty_id, limit=10).
+        """
+        return await session.run_sync(method, *args, **kwargs)
+
+    # -------------------------------------------------------------------------
+    # CREATE
+    # -------------------------------------------------------------------------
+    async def add(self, session: AsyncSession, entity: T) -> T:
+        """Add a new entity; flush to get DB-generated fields (e.g. ID)."""
+        session.add(entity)
+        await session.flush()
+        await session.refresh(entity)
+        return entity
+
+    # -------------------------------------------------------------------------
+    # READ
+    # -------------------------------------------------------------------------
+    async def get(
+        self,
+        session: AsyncSession,
+        id: int,
+        *,
+        conditions: Sequence[Any] = (),
+        loaders: Sequence[LoaderOption] = (),
+    ) -> T | None:
+        return await session.scalar(self.repo._get_stmt(id, conditions, loaders))
+
+    async def get_all(
+        self,
+        session: AsyncSession,
+        *,
+        conditions: Sequence[Any] = (),
+        limit: int | None = None,
+        loaders: Sequence[LoaderOption] = (),
+        order_by: Sequence[Any] = (),
+        offset: int | None = None,
+    ) -> Sequence[T]:
+        stmt = self.repo._select_stmt(
+            conditions=conditions,
+            loaders=loaders,
+            order_by=order_by,
+            offset=offset,
+            limit=limit,
+        )
+        return (await session.scalars(stmt)).all()
+
+    async def get_first(
+        self,
+        session: AsyncSession,
+        *,
+        conditions: Sequence[Any] = (),
+        loaders: Sequence[LoaderOption] = (),
+        order_by: Sequence[Any] = (),
+    ) -> T | None:
+        stmt = self.repo._select_stmt(
+            conditions=conditions, loaders=loaders, order_by=order_by
+        )
+        return (await session.scalars(stmt)).first()
+
+    async def list_ids(
+        self,
+        session: AsyncSession,
+        *,
+        conditions: Sequence[Any] = (),
+        limit: int | None = None,
+    ) -> Sequence[int]:
+        """Primary keys of matching rows in key order, without loading the rows."""
+        stmt = self.repo._list_ids_stmt(conditions, limit)
+        return (await session.scalars(stmt)).all()
+
+    async def exists(
+        self, session: AsyncSession, id: int, *, conditions: Sequence[Any] = ()
+    ) -> bool:
+        return await self.get(session, id, conditions=conditions) is not None
+
+    async def count(
+        self,
+        session: AsyncSession,
+        *,
+        conditions: Sequence[Any] = (),
+    ) -> int:
+        """Count rows of this model with optional conditions (never result cached)."""
+        return await session.scalar(self.repo._count_stmt(conditions)) or 0
+
+    # -------------------------------------------------------------------------
+    # UPDATE
+    # -------------------------------------------------------------------------
+    async def update(self, session: AsyncSession, entity: T) -> T:
+        """Merge changes of a detached entity."""
+        merged = await session.merge(entity)
+        await session.flush()
+        await session.refresh(merged)
+        return merged
+
+    async def compare_and_set(
+        self,
+        session: AsyncSession,
+        id: Any,
+        conditions: Sequence[Any],
+        **values: Any,
+    ) -> bool:
+        """See BaseRepository.compare_and_set."""
+        stmt = self.repo._compare_and_set_stmt(id, conditions, values)
+        return (await session.execute(stmt)).rowcount == 1
+
+    # -------------------------------------------------------------------------
+    # DELETE
+    # -------------------------------------------------------------------------
+    async def delete(self, session: AsyncSession, entity: T) -> None:
+        await session.delete(entity)
+        await session.flush()
+
+    async def delete_by_id(self, session: AsyncSession, id: int) -> None:
+        entity = await self.get(session, id)
+        if not entity:
+            raise ValueError(f"Entity id {id} does not exist")
+        await session.delete(entity)
+        await session.flush()
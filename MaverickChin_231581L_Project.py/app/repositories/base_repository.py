@@ -1,22 +1,133 @@
-from typing import Any, Generic, Sequence, TypeVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Generic, Hashable, Sequence, TypeVar
 
-from sqlalchemy import and_, exists, func, inspect, select
+from app.database.archive_reads import INCLUDE_ARCHIVED_KEY, reading_archives
+from app.database.models import ARCHIVE_TABLES
+from app.database.models.archive import ARCHIVED_DATETIME_COLUMN
+from app.database.models.table_change import CHANGED_TABLES_KEY
+from sqlalchemy import (
+    DateTime,
+    Row,
+    Select,
+    Table,
+    Update,
+    and_,
+    delete,
+    exists,
+    func,
+    insert,
+    inspect,
+    literal,
+    select,
+    update,
+)
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.sql.util import find_tables
+
+if TYPE_CHECKING:
+    from app.core.data_cache import DataCache
 
 T = TypeVar("T")
 
 
+@dataclass(frozen=True)
+class ResultCacheStats:
+    hits: int
+    misses: int
+    bypassed: int
+
+
 class BaseRepository(Generic[T]):
     """Base repository with condition-based querying only."""
 
     def __init__(self, model: type[T]):
         self.model = model
+        self._result_cache: DataCache | None = None
+        self._result_cache_ttl: float | None = None
+        self._result_cache_hits = 0
+        self._result_cache_misses = 0
+        self._result_cache_bypassed = 0
+
+    # -------------------------------------------------------------------------
+    # RESULT CACHE
+    # -------------------------------------------------------------------------
+    def enable_result_cache(self, cache: DataCache, *, ttl: float | None = None):
+        """
+        Serve this repository's cacheable reads from cache.
+
+        Entries are keyed on the compiled SQL and its parameters and tagged with
+        every table the statement reads, so a write to any of them (through a
+        bound cache) invalidates them. Off by default.
+        """
+        self._result_cache = cache
+        self._result_cache_ttl = ttl
+
+    def disable_result_cache(self) -> None:
+        self._result_cache = None
+
+    @property
+    def result_cache_stats(self) -> ResultCacheStats:
+        return ResultCacheStats(
+            self._result_cache_hits,
+            self._result_cache_misses,
+            self._result_cache_bypassed,
+        )
 
     # -------------------------------------------------------------------------
     # INTERNAL
     # -------------------------------------------------------------------------
-    def _get_pk_column(self, session: Session):
+    def _execute_cached(self, session: Session, stmt: Select) -> Sequence[Row]:
+        """
+        session.execute(stmt).all(), through the result cache if enabled.
+
+        Only for statements selecting columns: cached rows are shared between
+        sessions, so they must not hold ORM instances. The cache is bypassed
+        while the session's transaction has written anything, so uncommitted
+        data is never stored or read back, and for history reads, which also
+        read the archive tables.
+        """
+        cache = self._result_cache
+        if cache is None:
+            return session.execute(stmt).all()
+        if any(d["expr"] is d["entity"] for d in stmt.column_descriptions):
+            raise ValueError("Only column selects can be result cached.")
+        if (
+            session.new
+            or session.dirty
+            or session.deleted
+            or session.info.get(CHANGED_TABLES_KEY)
+            or session.info.get(INCLUDE_ARCHIVED_KEY)
+        ):
+            self._result_cache_bypassed += 1
+            return session.execute(stmt).all()
+
+        compiled = stmt.compile(dialect=session.get_bind().dialect)
+        key = ("query_result", str(compiled), _hashable(compiled.params))
+        tables = {
+            table.name
+            for table in find_tables(stmt, check_columns=True)
+            if isinstance(table, Table)
+        }
+
+        missed = False
+
+        def load() -> tuple[Row, ...]:
+            nonlocal missed
+            missed = True
+            return tuple(session.execute(stmt).all())
+
+        rows = cache.get_or_load(
+            key, load, tags=sorted(tables), ttl=self._result_cache_ttl
+        )
+        if missed:
+            self._result_cache_misses += 1
+        else:
+            self._result_cache_hits += 1
+        return rows
+
+    def _get_pk_column(self):
         mapper = inspect(self.model)
         if mapper is None:
             raise RuntimeError("Could not inspect model.")
@@ -25,6 +136,87 @@ class BaseRepository(Generic[T]):
             raise ValueError("Composite primary keys not supported.")
         return pk_cols[0]
 
+    # -------------------------------------------------------------------------
+    # STATEMENTS (shared with AsyncRepository)
+    # -------------------------------------------------------------------------
+    def _get_stmt(
+        self, id: int, conditions: Sequence[Any], loaders: Sequence[LoaderOption]
+    ) -> Select:
+        pk = self._get_pk_column()
+        return select(self.model).where(and_(pk == id, *conditions)).options(*loaders)
+
+    def _select_stmt(
+        self,
+        *,
+        conditions: Sequence[Any] = (),
+        loaders: Sequence[LoaderOption] = (),
+        order_by: Sequence[Any] = (),
+        offset: int | None = None,
+        limit: int | None = None,
+    ) -> Select:
+        stmt = select(self.model).options(*loaders)
+
+        if conditions:
+            stmt = stmt.where(*conditions)
+
+        if order_by:
+            stmt = stmt.order_by(*order_by)
+
+        if offset:
+            stmt = stmt.offset(offset)
+
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        return stmt
+
+    def _order_by_created_datetime(
+        self, stmt: Select, descending: bool | None
+    ) -> Select:
+        """
+        Order stmt by the model's created_datetime, newest first if descending,
+        or leave it as it is if None. The primary key breaks ties so offset
+        pages are stable.
+        """
+        if descending is None:
+            return stmt
+        created = inspect(self.model).columns["created_datetime"]
+        pk = self._get_pk_column()
+        if descending:
+            return stmt.order_by(created.desc(), pk.desc())
+        return stmt.order_by(created.asc(), pk.asc())
+
+    def _list_ids_stmt(self, conditions: Sequence[Any], limit: int | None) -> Select:
+        pk = self._get_pk_column()
+        stmt = select(pk).order_by(pk)
+
+        if conditions:
+            stmt = stmt.where(*conditions)
+
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        return stmt
+
+    def _count_stmt(self, conditions: Sequence[Any]) -> Select:
+        stmt = select(func.count()).select_from(self.model)
+        if conditions:
+            stmt = stmt.where(*conditions)
+        return stmt
+
+    def _compare_and_set_stmt(
+        self, id: Any, conditions: Sequence[Any], values: dict[str, Any]
+    ) -> Update:
+        mapper = inspect(self.model)
+        version_id_col = mapper.version_id_col
+        if version_id_col is not None:
+            values = {**values, version_id_col.key: version_id_col + 1}
+        return (
+            update(self.model)
+            .where(self._get_pk_column() == id, *conditions)
+            .values(**values)
+        )
+
     # -------------------------------------------------------------------------
     # CREATE
     # -------------------------------------------------------------------------
@@ -46,10 +238,14 @@ class BaseRepository(Generic[T]):
         *,
         conditions: Sequence[Any] = (),
         loaders: Sequence[LoaderOption] = (),
+        include_archived: bool = False,
     ) -> T | None:
-        pk = self._get_pk_column(session)
-        stmt = select(self.model).where(and_(pk == id, *conditions)).options(*loaders)
-        return session.scalar(stmt)
+        """
+        :param include_archived: Also look in the model's archive table (and
+            load relationships from theirs). Archived entities are read-only.
+        """
+        with reading_archives(session, include_archived):
+            return session.scalar(self._get_stmt(id, conditions, loaders))
 
     def get_all(
         self,
@@ -61,20 +257,13 @@ class BaseRepository(Generic[T]):
         order_by: Sequence[Any] = (),
         offset: int | None = None,
     ) -> Sequence[T]:
-        stmt = select(self.model).options(*loaders)
-
-        if conditions:
-            stmt = stmt.where(*conditions)
-
-        if order_by:
-            stmt = stmt.order_by(*order_by)
-
-        if offset:
-            stmt = stmt.offset(offset)
-
-        if limit is not None:
-            stmt = stmt.limit(limit)
-
+        stmt = self._select_stmt(
+            conditions=conditions,
+            loaders=loaders,
+            order_by=order_by,
+            offset=offset,
+            limit=limit,
+        )
         return session.scalars(stmt).all()
 
     def get_first(
@@ -85,14 +274,9 @@ class BaseRepository(Generic[T]):
         loaders: Sequence[LoaderOption] = (),
         order_by: Sequence[Any] = (),
     ) -> T | None:
-        stmt = select(self.model).options(*loaders)
-
-        if conditions:
-            stmt = stmt.where(*conditions)
-
-        if order_by:
-            stmt = stmt.order_by(*order_by)
-
+        stmt = self._select_stmt(
+            conditions=conditions, loaders=loaders, order_by=order_by
+        )
         return session.scalars(stmt).first()
 
     def list(
@@ -103,16 +287,21 @@ class BaseRepository(Generic[T]):
         loaders: Sequence[LoaderOption] = (),
         order_by: Sequence[Any] = (),
     ) -> list[T]:
-        stmt = select(self.model).options(*loaders)
-
-        if conditions:
-            stmt = stmt.where(*conditions)
-
-        if order_by:
-            stmt = stmt.order_by(*order_by)
-
+        stmt = self._select_stmt(
+            conditions=conditions, loaders=loaders, order_by=order_by
+        )
         return list(session.scalars(stmt))
 
+    def list_ids(
+        self,
+        session: Session,
+        *,
+        conditions: Sequence[Any] = (),
+        limit: int | None = None,
+    ) -> Sequence[int]:
+        """Primary keys of matching rows in key order, without loading the rows."""
+        return session.scalars(self._list_ids_stmt(conditions, limit)).all()
+
     def exists(
         self, session: Session, id: int, *, conditions: Sequence[Any] = ()
     ) -> bool:
@@ -131,15 +320,15 @@ class BaseRepository(Generic[T]):
         session: Session,
         *,
         conditions: Sequence[Any] = (),
+        include_archived: bool = False,
     ) -> int:
         """
-        Count rows of this model with optional conditions.
+        Count rows of this model with optional conditions, including archived
+        rows if include_archived.
         """
-        stmt = select(func.count()).select_from(self.model)
-        if conditions:
-            stmt = stmt.where(*conditions)
-
-        return session.scalar(stmt) or 0
+        with reading_archives(session, include_archived):
+            stmt = self._count_stmt(conditions)
+            return self._execute_cached(session, stmt)[0][0] or 0
 
     # -------------------------------------------------------------------------
     # UPDATE
@@ -151,6 +340,69 @@ class BaseRepository(Generic[T]):
         session.refresh(merged)
         return merged
 
+    def compare_and_set(
+        self,
+        session: Session,
+        id: Any,
+        conditions: Sequence[Any],
+        **values: Any,
+    ) -> bool:
+        """
+        Set values on one row in a single UPDATE, only if conditions still hold
+        for it, so concurrent writers cannot both succeed. Also bumps the
+        version column of versioned models.
+
+        :return: False if the row does not exist or conditions no longer hold.
+        """
+        stmt = self._compare_and_set_stmt(id, conditions, values)
+        return session.execute(stmt).rowcount == 1
+
+    # -------------------------------------------------------------------------
+    # ARCHIVE
+    # -------------------------------------------------------------------------
+    def is_archived(self, session: Session, id: int) -> bool:
+        """Whether the row has been moved to the model's archive table."""
+        archive = ARCHIVE_TABLES.get(inspect(self.model).local_table.name)
+        if archive is None:
+            return False
+        pk = self._get_pk_column()
+        stmt = select(exists().where(archive.c[pk.name] == id))
+        return session.scalar(stmt) or False
+
+    def archive_by_ids(
+        self, session: Session, ids: Sequence[int], archived_datetime: datetime
+    ) -> int:
+        """
+        Move rows from the model's table to its archive table, stamped with
+        archived_datetime, in one INSERT ... SELECT and one DELETE. Rows
+        referencing them must be archived or deleted first.
+
+        :return: Number of rows moved.
+        :raises ValueError: If the model has no archive table.
+        """
+        table = inspect(self.model).local_table
+        archive = ARCHIVE_TABLES.get(table.name)
+        if archive is None:
+            raise ValueError(f"Table {table.name} has no archive table.")
+        if not ids:
+            return 0
+        pk = self._get_pk_column()
+        columns = list(table.columns)
+        session.execute(
+            insert(archive).from_select(
+                [*(column.name for column in columns), ARCHIVED_DATETIME_COLUMN],
+                select(*columns, literal(archived_datetime, DateTime)).where(
+                    pk.in_(ids)
+                ),
+            )
+        )
+        result = session.execute(
+            delete(self.model)
+            .where(pk.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     # -------------------------------------------------------------------------
     # DELETE
     # -------------------------------------------------------------------------
@@ -164,3 +416,13 @@ class BaseRepository(Generic[T]):
             raise ValueError(f"Entity id {id} does not exist")
         session.delete(entity)
         session.flush()
+
+
+def _hashable(params: dict[str, Any]) -> Hashable:
+    # Expanding IN parameters arrive as lists
+    return tuple(
+        sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in params.items()
+        )
+    )
@@ -1,7 +1,8 @@
 from typing import Sequence
 
 from app.database.models import DoctorProfile, Person, Profile, Specialty
-from sqlalchemy import select
+from app.database.models.specialty import doctor_specialty
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.orm.interfaces import LoaderOption
 
@@ -102,3 +103,31 @@ class DoctorProfileRepository(BaseRepository[DoctorProfile]):
             .options(*loaders)
         )
         return list(session.scalars(stmt).unique())
+
+    def list_roster_rows(
+        self, session: Session
+    ) -> Sequence[Row[tuple[int, str, str, str | None, bool, int | None]]]:
+        """
+        One row per doctor-specialty link (one row with no specialty for doctors
+        without any), regardless of in-service flags.
+
+        :return: (doctor_profile_id, first_name, last_name, office_phone_number,
+            is_in_service, specialty_id)
+        """
+        stmt = (
+            select(
+                DoctorProfile.profile_id,
+                Person.first_name,
+                Person.last_name,
+                DoctorProfile.office_phone_number,
+                Profile.is_in_service,
+                doctor_specialty.c.specialty_id,
+            )
+            .join(Profile, DoctorProfile.profile_id == Profile.profile_id)
+            .join(Person, Profile.person_id == Person.person_id)
+            .outerjoin(
+                doctor_specialty,
+                doctor_specialty.c.doctor_profile_id == DoctorProfile.profile_id,
+            )
+        )
+        return session.execute(stmt).all()
@@ -1,9 +1,23 @@
-from app.database.models import Appointment, Prescription, PrescriptionItem
-from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload, selectinload
+from datetime import datetime
+from typing import Sequence
+
+from app.database.archive_reads import reading_archives
+from app.database.models import (
+    Appointment,
+    Medication,
+    Person,
+    Prescription,
+    PrescriptionItem,
+    Profile,
+    Specialty,
+)
+from sqlalchemy import Result, delete, select
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 
 from .base_repository import BaseRepository
 
+_prescription_item_repo = BaseRepository(PrescriptionItem)
+
 
 class PrescriptionLoad:
     PRESCRIPTION_ITEMS = selectinload(Prescription.items)
@@ -96,3 +110,129 @@ class PrescriptionRepository(BaseRepository[Prescription]):
         if mark_prescription_for_deletion:
             session.delete(prescription)
         session.flush()
+
+    def delete_by_appointment_ids(
+        self, session: Session, appointment_ids: Sequence[int]
+    ) -> int:
+        """Delete every prescription (and its items) of the given appointments."""
+        prescription_ids = select(Prescription.prescription_id).where(
+            Prescription.appointment_id.in_(appointment_ids)
+        )
+        session.execute(
+            delete(PrescriptionItem)
+            .where(PrescriptionItem.prescription_id.in_(prescription_ids))
+            .execution_options(synchronize_session=False)
+        )
+        result = session.execute(
+            delete(Prescription)
+            .where(Prescription.appointment_id.in_(appointment_ids))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    # -------------------------------------------------------------------------
+    # ARCHIVE
+    # -------------------------------------------------------------------------
+    def archive_by_appointment_ids(
+        self,
+        session: Session,
+        appointment_ids: Sequence[int],
+        archived_datetime: datetime,
+    ) -> int:
+        """Archive every prescription (and its items) of the given appointments."""
+        prescription_ids = session.scalars(
+            select(Prescription.prescription_id).where(
+                Prescription.appointment_id.in_(appointment_ids)
+            )
+        ).all()
+        if not prescription_ids:
+            return 0
+        item_ids = session.scalars(
+            select(PrescriptionItem.prescription_item_id).where(
+                PrescriptionItem.prescription_id.in_(prescription_ids)
+            )
+        ).all()
+        _prescription_item_repo.archive_by_ids(session, item_ids, archived_datetime)
+        return self.archive_by_ids(session, prescription_ids, archived_datetime)
+
+    # -------------------------------------------------------------------------
+    # EXPORT
+    # -------------------------------------------------------------------------
+    def stream_export_item_rows(
+        self,
+        session: Session,
+        *,
+        datetime_range: tuple[datetime, datetime] | None = None,
+        specialty_id: int | None = None,
+        chunk_size: int = 500,
+        include_archived: bool = False,
+    ) -> Result:
+        """
+        One row per prescription item as flat export columns, streamed
+        chunk_size rows at a time (server-side cursor where the driver supports
+        one).
+
+        :param datetime_range: Only prescriptions created in [start, end).
+        :param specialty_id: Only prescriptions written during an appointment
+            of this specialty.
+        :param include_archived: Also read archived prescriptions.
+        :return: A result whose keys() are the column names.
+        """
+        doctor_profile = aliased(Profile)
+        doctor_person = aliased(Person)
+        patient_profile = aliased(Profile)
+        patient_person = aliased(Person)
+        stmt = (
+            select(
+                Prescription.prescription_id.label("prescription_id"),
+                PrescriptionItem.prescription_item_id.label("prescription_item_id"),
+                Prescription.created_datetime.label("created"),
+                Prescription.appointment_id.label("appointment_id"),
+                Specialty.name.label("specialty"),
+                (doctor_person.first_name + " " + doctor_person.last_name).label(
+                    "doctor"
+                ),
+                (patient_person.first_name + " " + patient_person.last_name).label(
+                    "patient"
+                ),
+                Medication.generic_name.label("medication"),
+                PrescriptionItem.instructions.label("instructions"),
+            )
+            .join(
+                PrescriptionItem,
+                PrescriptionItem.prescription_id == Prescription.prescription_id,
+            )
+            .join(
+                Medication, Medication.medication_id == PrescriptionItem.medication_id
+            )
+            .outerjoin(
+                Appointment, Appointment.appointment_id == Prescription.appointment_id
+            )
+            .outerjoin(Specialty, Specialty.specialty_id == Appointment.specialty_id)
+            .join(
+                doctor_profile,
+                doctor_profile.profile_id == Prescription.doctor_profile_id,
+            )
+            .join(doctor_person, doctor_person.person_id == doctor_profile.person_id)
+            .join(
+                patient_profile,
+                patient_profile.profile_id == Prescription.patient_profile_id,
+            )
+            .join(patient_person, patient_person.person_id == patient_profile.person_id)
+            .order_by(
+                Prescription.created_datetime,
+                Prescription.prescription_id,
+                PrescriptionItem.prescription_item_id,
+            )
+            .execution_options(yield_per=chunk_size)
+        )
+        if datetime_range:
+            start, end = datetime_range
+            stmt = stmt.where(
+                Prescription.created_datetime >= start,
+                Prescription.created_datetime < end,
+            )
+        if specialty_id is not None:
+            stmt = stmt.where(Appointment.specialty_id == specialty_id)
+        with reading_archives(session, include_archived):
+            return session.execute(stmt)
@@ -0,0 +1,78 @@
+from datetime import datetime
+from typing import Iterable, Sequence
+
+from app.database.models import TableChange
+from sqlalchemy import Row, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .base_repository import BaseRepository
+
+
+class TableChangeRepository(BaseRepository[TableChange]):
+    def __init__(self):
+        super().__init__(TableChange)
+
+    # -------------------------------------------------------------------------
+    # READ
+    # -------------------------------------------------------------------------
+    def list_changes(
+        self, session: Session, *, since: datetime | None = None
+    ) -> Sequence[Row[tuple[str, int, datetime]]]:
+        """
+        Tables changed at or after since (all tables ever written if None).
+
+        :return: (table_name, version, updated_at)
+        """
+        stmt = select(
+            TableChange.table_name, TableChange.version, TableChange.updated_at
+        )
+        if since is not None:
+            stmt = stmt.where(TableChange.updated_at >= since)
+        return session.execute(stmt).all()
+
+    # -------------------------------------------------------------------------
+    # UPDATE
+    # -------------------------------------------------------------------------
+    def bump(self, session: Session, table_names: Iterable[str]) -> dict[str, int]:
+        """
+        Increment the version of each table, adding rows for tables never bumped.
+
+        The rows stay locked until the session's transaction ends, so bump in a
+        short transaction of its own (see track_table_changes).
+
+        :return: The new version of each table.
+        """
+        table_names = sorted(set(table_names))
+        stmt = (
+            update(TableChange)
+            .where(TableChange.table_name.in_(table_names))
+            .values(version=TableChange.version + 1, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        if session.execute(stmt).rowcount < len(table_names):
+            existing = set(
+                session.scalars(
+                    select(TableChange.table_name).where(
+                        TableChange.table_name.in_(table_names)
+                    )
+                )
+            )
+            for table_name in table_names:
+                if table_name in existing:
+                    continue
+                try:
+                    # Another writer may insert the same first row concurrently
+                    with session.begin_nested():
+                        session.execute(
+                            insert(TableChange).values(
+                                table_name=table_name, version=1, updated_at=func.now()
+                            )
+                        )
+                except IntegrityError:
+                    session.execute(stmt.where(TableChange.table_name == table_name))
+
+        stmt = select(TableChange.table_name, TableChange.version).where(
+            TableChange.table_name.in_(table_names)
+        )
+        return {table_name: version for table_name, version in session.execute(stmt)}
@@ -0,0 +1,4 @@
+from app.search.fuzzy import FuzzyMatch, FuzzySearcher, substring_edit_distance
+from app.search.ngram_index import NGramIndex
+
+__all__ = ["FuzzyMatch", "FuzzySearcher", "NGramIndex", "substring_edit_distance"]
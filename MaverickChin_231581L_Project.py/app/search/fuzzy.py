@@ -0,0 +1,153 @@
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+
+from app.search.ngram_index import NGramIndex
+
+
+@dataclass(frozen=True)
+class FuzzyMatch:
+    id: int
+    distance: int
+    similarity: float
+
+
+class FuzzySearcher:
+    """
+    Typo-tolerant ranked search over an NGramIndex.
+
+    Candidates are gathered by trigram overlap with the query, skipping
+    trigrams so common that they say little about the match. The best
+    candidates by trigram similarity are then re-ranked by the edit distance
+    between the query and the closest substring of each text.
+    """
+
+    def __init__(
+        self,
+        index: NGramIndex,
+        *,
+        max_posting_fraction: float = 0.05,
+        min_posting_limit: int = 500,
+    ):
+        self.index = index
+        self._gram_counts = [len(index.grams(text)) for text in index.texts]
+        self._posting_limit = max(
+            min_posting_limit, int(len(index) * max_posting_fraction)
+        )
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        max_distance: int | None = None,
+        candidate_pool: int | None = None,
+    ) -> list[FuzzyMatch]:
+        """
+        Return up to k matches ordered by (edit distance, trigram similarity).
+
+        :param max_distance: Defaults to a third of the query length (at least 1).
+        :param candidate_pool: How many trigram candidates to re-rank (default 5 * k).
+        """
+        query = query.lower().strip()
+        query_grams = self.index.grams(query)
+        if not query_grams or k < 1:
+            return []
+        if max_distance is None:
+            max_distance = max(1, len(query) // 3)
+        if candidate_pool is None:
+            candidate_pool = 5 * k
+
+        postings = sorted(
+            (p for p in (self.index.postings(g) for g in query_grams) if p), key=len
+        )
+        if not postings:
+            return []
+        selective = [p for p in postings if len(p) <= self._posting_limit]
+        # Every trigram is common: fall back to the rarest ones only
+        if not selective:
+            selective = postings[:2]
+
+        hits: Counter[int] = Counter()
+        for posting in selective:
+            hits.update(posting)
+
+        query_gram_count = len(query_grams)
+        gram_counts = self._gram_counts
+
+        def similarity(doc_id: int) -> float:
+            shared = hits[doc_id]
+            return shared / (query_gram_count + gram_counts[doc_id] - shared)
+
+        candidates = heapq.nlargest(candidate_pool, hits, key=similarity)
+
+        texts = self.index.texts
+        matches: list[FuzzyMatch] = []
+        # Candidates arrive in similarity order, so once k matches are held a
+        # later one only ranks if it is strictly closer: tighten the bound.
+        bound = max_distance
+        for doc_id in candidates:
+            text = texts[doc_id]
+            if query in text:
+                distance = 0
+            else:
+                distance = substring_edit_distance(query, text, bound)
+                if distance is None:
+                    continue
+            matches.append(FuzzyMatch(doc_id, distance, similarity(doc_id)))
+            if len(matches) >= k:
+                matches.sort(key=lambda m: (m.distance, -m.similarity, m.id))
+                del matches[k:]
+                bound = matches[-1].distance - 1
+                if bound < 0:
+                    break
+
+        matches.sort(key=lambda m: (m.distance, -m.similarity, m.id))
+        return matches
+
+
+def substring_edit_distance(query: str, text: str, max_distance: int) -> int | None:
+    """
+    Levenshtein distance between query and its best-matching substring of text,
+    or None if it exceeds max_distance.
+
+    Uses Myers' bit-parallel algorithm: one column of the edit-distance matrix
+    is packed into an int, so each text character costs a handful of integer
+    operations rather than len(query) cell updates.
+    """
+    m = len(query)
+    if m == 0:
+        return 0
+
+    match_masks: dict[str, int] = {}
+    for i, char in enumerate(query):
+        match_masks[char] = match_masks.get(char, 0) | (1 << i)
+
+    all_ones = (1 << m) - 1
+    last_bit = 1 << (m - 1)
+    positive = all_ones
+    negative = 0
+    score = best = m
+
+    for char in text:
+        eq = match_masks.get(char, 0)
+        x_vertical = eq | negative
+        x_horizontal = (((eq & positive) + positive) ^ positive) | eq
+        horizontal_positive = negative | (~(x_horizontal | positive) & all_ones)
+        horizontal_negative = positive & x_horizontal
+
+        if horizontal_positive & last_bit:
+            score += 1
+        elif horizontal_negative & last_bit:
+            score -= 1
+        if score < best:
+            best = score
+
+        # No carry-in at the top row: a match may start at any text position
+        horizontal_positive = (horizontal_positive << 1) & all_ones
+        horizontal_negative = (horizontal_negative << 1) & all_ones
+        positive = horizontal_negative | (
+            ~(x_vertical | horizontal_positive) & all_ones
+        )
+        negative = horizontal_positive & x_vertical
+
+    return best if best <= max_distance else None
@@ -0,0 +1,81 @@
+from typing import Iterable, Sequence
+
+# Joins a record's fields so a query cannot match across two of them
+FIELD_SEPARATOR = "\x1f"
+
+
+class NGramIndex:
+    """
+    Lower-cased character n-gram inverted index for substring search.
+
+    Each text is indexed once; a query is answered by intersecting the posting
+    sets of its n-grams (smallest first) and confirming the surviving
+    candidates with a substring check.
+    """
+
+    def __init__(self, texts: Iterable[str], n: int = 3):
+        if n < 1:
+            raise ValueError("n must be at least 1.")
+        self.n = n
+        self._texts: list[str] = [text.lower() for text in texts]
+        self._postings: dict[str, set[int]] = {}
+        for doc_id, text in enumerate(self._texts):
+            for gram in self._grams(text):
+                self._postings.setdefault(gram, set()).add(doc_id)
+
+    @classmethod
+    def from_fields(
+        cls, records: Iterable[Sequence[str | None]], n: int = 3
+    ) -> "NGramIndex":
+        """Index each record's fields as one text, skipping None fields."""
+        return cls(
+            (
+                FIELD_SEPARATOR.join(field for field in fields if field is not None)
+                for fields in records
+            ),
+            n,
+        )
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    @property
+    def texts(self) -> list[str]:
+        """The indexed texts, lower-cased, in insertion order."""
+        return self._texts
+
+    def postings(self, gram: str) -> set[int]:
+        return self._postings.get(gram, set())
+
+    def grams(self, text: str) -> set[str]:
+        return self._grams(text.lower())
+
+    def _grams(self, text: str) -> set[str]:
+        n = self.n
+        return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+    def search(self, query: str) -> list[int]:
+        """Return the ids (insertion order) of all texts containing query."""
+        query = query.lower()
+        if not query:
+            return list(range(len(self._texts)))
+
+        # Too short to form an n-gram: scan the pre-lowered texts instead
+        if len(query) < self.n:
+            return [i for i, text in enumerate(self._texts) if query in text]
+
+        posting_sets = sorted(
+            (self._postings.get(gram) for gram in self._grams(query)),
+            key=lambda s: len(s) if s else 0,
+        )
+        if not posting_sets[0]:
+            return []
+
+        candidates = posting_sets[0]
+        for posting in posting_sets[1:]:
+            candidates = candidates & posting
+            if not candidates:
+                return []
+
+        texts = self._texts
+        return sorted(i for i in candidates if query in texts[i])
@@ -1,5 +1,6 @@
-from app.services.appointment_service import AppointmentService
+from app.services.appointment_service import AppointmentService, BulkChunk
 from app.services.doctor_service import DoctorService
+from app.services.exceptions import StaleDataError
 from app.services.patient_service import PatientService
 from app.services.person_service import PersonService
 from app.services.security_service import SecurityService
@@ -12,4 +13,6 @@ __all__ = [
     "PatientService",
     "DoctorService",
     "AppointmentService",
+    "BulkChunk",
+    "StaleDataError",
 ]
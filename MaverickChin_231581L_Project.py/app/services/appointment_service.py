@@ -1,4 +1,6 @@
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Sequence
 
 from app.database.models import (
     Appointment,
@@ -18,7 +20,21 @@ from app.repositories import (
     UserRepository,
 )
 from app.services.base_service import BaseService
+from app.services.exceptions import StaleDataError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.interfaces import LoaderOption
+
+EXPIRED_REQUEST_HANDLING_NOTES = "Preferred date passed before the request was handled."
+
+
+@dataclass(frozen=True)
+class BulkChunk:
+    """One chunk of a set-based bulk update."""
+
+    # Rows that met the conditions when listed; 0 once none are left
+    found: int
+    # Of those, rows that still met them when changed
+    changed: int
 
 
 class AppointmentService(BaseService[Appointment]):
@@ -96,6 +112,36 @@ class AppointmentService(BaseService[Appointment]):
     # -------------------------------------------------------------------------
     # READ
     # -------------------------------------------------------------------------
+    def claim_appointment_requests(
+        self,
+        session: Session,
+        specialty_id: int,
+        receptionist_profile_id: int,
+        batch_size: int,
+        *,
+        lease: timedelta,
+        loaders: Sequence[LoaderOption] = (),
+    ) -> Sequence[AppointmentRequest]:
+        """
+        Renew the receptionist's claimed batch of pending requests in a
+        specialty and top it up to batch_size from the unclaimed pool.
+
+        :return: The batch, oldest first.
+        """
+        held = self.appointment_request_repo.renew_claims(
+            session, specialty_id, receptionist_profile_id, lease=lease
+        )
+        if held < batch_size:
+            self.appointment_request_repo.claim_next(
+                session,
+                specialty_id,
+                batch_size - held,
+                receptionist_profile_id,
+                lease=lease,
+            )
+        return self.appointment_request_repo.list_claimed(
+            session, specialty_id, receptionist_profile_id, loaders=loaders
+        )
 
     # -------------------------------------------------------------------------
     # UPDATE
@@ -109,34 +155,30 @@ class AppointmentService(BaseService[Appointment]):
         handled_by_profile_id: int,
         handling_notes: str | None,
     ) -> AppointmentRequest:
-        appointment_request = self.appointment_request_repo.get(
-            session, appointment_request_id
+        """:raises StaleDataError: If the request is no longer pending."""
+        self._update_pending_request(
+            session,
+            appointment_request_id,
+            "approved",
+            AppointmentRequest.approval_values(
+                appointment_id, handled_by_profile_id, handling_notes
+            ),
         )
-        if not appointment_request:
-            raise ValueError(
-                f"Appointment request id {appointment_request_id} does not exist."
-            )
-        appointment_request.approve(
-            appointment_id=appointment_id,
-            handled_by_profile_id=handled_by_profile_id,
-            handling_notes=handling_notes,
-        )
-        return self.appointment_request_repo.update(session, appointment_request)
+        return self._get_appointment_request(session, appointment_request_id)
 
     def update_appointment_request_cancelled(
         self,
         session: Session,
         appointment_request_id: int,
     ) -> AppointmentRequest:
-        appointment_request = self.appointment_request_repo.get(
-            session, appointment_request_id
+        """:raises StaleDataError: If the request is no longer pending."""
+        self._update_pending_request(
+            session,
+            appointment_request_id,
+            "cancelled",
+            AppointmentRequest.cancellation_values(),
         )
-        if not appointment_request:
-            raise ValueError(
-                f"Appointment request id {appointment_request_id} does not exist."
-            )
-        appointment_request.cancel()
-        return self.appointment_request_repo.update(session, appointment_request)
+        return self._get_appointment_request(session, appointment_request_id)
 
     def update_appointment_request_rejected(
         self,
@@ -145,26 +187,47 @@ class AppointmentService(BaseService[Appointment]):
         handled_by_profile_id: int,
         handling_notes: str,
     ) -> AppointmentRequest:
-        appointment_request = self.appointment_request_repo.get(
-            session, appointment_request_id
+        """:raises StaleDataError: If the request is no longer pending."""
+        self._update_pending_request(
+            session,
+            appointment_request_id,
+            "rejected",
+            AppointmentRequest.rejection_values(handled_by_profile_id, handling_notes),
         )
-        if not appointment_request:
-            raise ValueError(
-                f"Appointment request id {appointment_request_id} does not exist."
+        return self._get_appointment_request(session, appointment_request_id)
+
+    def update_appointment_request_preferred_datetime(
+        self,
+        session: Session,
+        appointment_request_id: int,
+        preferred_datetime: datetime | None,
+        version_id: int,
+    ) -> AppointmentRequest:
+        """
+        :param version_id: Version of the request the change was based on.
+        :raises StaleDataError: If the request changed since that version.
+        """
+        if not self.appointment_request_repo.compare_and_set(
+            session,
+            appointment_request_id,
+            [AppointmentRequest.version_id == version_id],
+            preferred_datetime=preferred_datetime,
+        ):
+            self._get_appointment_request(session, appointment_request_id)
+            raise StaleDataError(
+                f"Appointment request id {appointment_request_id} was changed by "
+                "someone else. Review it and try again."
             )
-        appointment_request.reject(
-            handled_by_profile_id=handled_by_profile_id, handling_notes=handling_notes
-        )
-        return self.appointment_request_repo.update(session, appointment_request)
+        return self._get_appointment_request(session, appointment_request_id)
 
     def update_appointment_completed(
         self, session: Session, appointment_id: int
     ) -> Appointment:
-        appointment = self.appointment_repo.get(session, appointment_id)
-        if not appointment:
-            raise ValueError(f"Appointment id {appointment_id} does not exist.")
-        appointment.complete()
-        return self.appointment_repo.update(session, appointment)
+        """:raises StaleDataError: If the appointment is no longer scheduled."""
+        self._update_scheduled_appointment(
+            session, appointment_id, "completed", Appointment.completion_values()
+        )
+        return self._get_appointment(session, appointment_id)
 
     def update_appointment_cancelled(
         self,
@@ -173,26 +236,276 @@ class AppointmentService(BaseService[Appointment]):
         cancelled_by_profile_id: int,
         cancellation_reason: str,
     ) -> Appointment:
-        appointment = self.appointment_repo.get(session, appointment_id)
-        if not appointment:
-            raise ValueError(f"Appointment id {appointment_id} does not exist.")
-        appointment.cancel(
-            cancelled_by_profile_id=cancelled_by_profile_id,
-            cancellation_reason=cancellation_reason,
+        """:raises StaleDataError: If the appointment is no longer scheduled."""
+        self._update_scheduled_appointment(
+            session,
+            appointment_id,
+            "cancelled",
+            Appointment.cancellation_values(
+                cancelled_by_profile_id, cancellation_reason
+            ),
         )
-        return self.appointment_repo.update(session, appointment)
+        return self._get_appointment(session, appointment_id)
 
     def update_appointment_missed(
         self, session: Session, appointment_id: int
     ) -> Appointment:
-        appointment = self.appointment_repo.get(session, appointment_id)
-        if not appointment:
-            raise ValueError(f"Appointment id {appointment_id} does not exist.")
-        for prescription in appointment.prescriptions:
-            session.delete(prescription)
-        appointment.miss()
-        return self.appointment_repo.update(session, appointment)
+        """:raises StaleDataError: If the appointment is no longer scheduled."""
+        self._update_scheduled_appointment(
+            session, appointment_id, "missed", Appointment.missed_values()
+        )
+        self.prescription_repo.delete_by_appointment_ids(session, [appointment_id])
+        return self._get_appointment(session, appointment_id)
+
+    def update_appointment_doctor_notes(
+        self,
+        session: Session,
+        appointment_id: int,
+        doctor_notes: str | None,
+        version_id: int,
+    ) -> Appointment:
+        """
+        :param version_id: Version of the appointment the notes were based on.
+        :raises StaleDataError: If the appointment changed since that version.
+        """
+        if not self.appointment_repo.compare_and_set(
+            session,
+            appointment_id,
+            [Appointment.version_id == version_id],
+            doctor_notes=doctor_notes,
+        ):
+            self._get_appointment(session, appointment_id)
+            raise StaleDataError(
+                f"Appointment id {appointment_id} was changed by someone else. "
+                "Review it and try again."
+            )
+        return self._get_appointment(session, appointment_id)
+
+    def update_appointments_missed_before(
+        self, session: Session, before: datetime, *, limit: int
+    ) -> BulkChunk:
+        """
+        Mark up to limit scheduled appointments starting before `before` as
+        missed and remove their prescriptions, using set-based statements.
+
+        The UPDATE checks the conditions again, so an appointment completed or
+        cancelled after it was listed keeps its status and its prescriptions.
+
+        :return: Appointments listed and marked. Call again in a new transaction
+            until none are found; a chunk may mark none that were found.
+        """
+        conditions = [Appointment.is_scheduled, Appointment.start_datetime < before]
+        appointment_ids = self.appointment_repo.list_ids(
+            session, conditions=conditions, limit=limit
+        )
+        if not appointment_ids:
+            return BulkChunk(0, 0)
+        marked = self.appointment_repo.update_status_by_ids(
+            session,
+            appointment_ids,
+            conditions=conditions,
+            **Appointment.missed_values(),
+        )
+        if marked:
+            missed_ids = self.appointment_repo.list_ids(
+                session,
+                conditions=[
+                    Appointment.appointment_id.in_(appointment_ids),
+                    Appointment.is_missed,
+                ],
+            )
+            self.prescription_repo.delete_by_appointment_ids(session, missed_ids)
+        return BulkChunk(len(appointment_ids), marked)
+
+    def update_doctor_appointments_cancelled(
+        self,
+        session: Session,
+        doctor_profile_id: int,
+        after: datetime,
+        cancelled_by_profile_id: int,
+        cancellation_reason: str,
+        *,
+        limit: int,
+    ) -> BulkChunk:
+        """
+        Cancel up to limit of the doctor's scheduled appointments starting at or
+        after `after`, using one set-based UPDATE. An appointment completed or
+        missed since it was listed keeps its status.
+
+        :return: Appointments listed and cancelled. Call again in a new
+            transaction until none are found.
+        """
+        conditions = [
+            Appointment.doctor_profile_id == doctor_profile_id,
+            Appointment.is_scheduled,
+            Appointment.start_datetime >= after,
+        ]
+        appointment_ids = self.appointment_repo.list_ids(
+            session, conditions=conditions, limit=limit
+        )
+        if not appointment_ids:
+            return BulkChunk(0, 0)
+        cancelled = self.appointment_repo.update_status_by_ids(
+            session,
+            appointment_ids,
+            conditions=conditions,
+            **Appointment.cancellation_values(
+                cancelled_by_profile_id, cancellation_reason
+            ),
+        )
+        return BulkChunk(len(appointment_ids), cancelled)
+
+    def update_appointment_requests_expired_before(
+        self, session: Session, before: datetime, *, limit: int
+    ) -> BulkChunk:
+        """
+        Reject up to limit pending requests whose preferred datetime is before
+        `before`, releasing any claims on them, using one set-based UPDATE.
+        Requests without a preferred datetime never expire.
+
+        :return: Requests listed and rejected. Call again in a new transaction
+            until none are found.
+        """
+        conditions = [
+            AppointmentRequest.is_pending,
+            AppointmentRequest.preferred_datetime < before,
+        ]
+        appointment_request_ids = self.appointment_request_repo.list_ids(
+            session, conditions=conditions, limit=limit
+        )
+        if not appointment_request_ids:
+            return BulkChunk(0, 0)
+        # Checked again: a request approved since it was listed stays approved
+        rejected = self.appointment_request_repo.update_status_by_ids(
+            session,
+            appointment_request_ids,
+            conditions=conditions,
+            **AppointmentRequest.rejection_values(None, EXPIRED_REQUEST_HANDLING_NOTES),
+            claimed_by_profile_id=None,
+            claim_expires_datetime=None,
+        )
+        return BulkChunk(len(appointment_request_ids), rejected)
+
+    # -------------------------------------------------------------------------
+    # ARCHIVE
+    # -------------------------------------------------------------------------
+    def archive_appointment_requests_before(
+        self, session: Session, before: datetime, *, limit: int
+    ) -> BulkChunk:
+        """
+        Move up to limit handled (non-pending) requests created before `before`
+        to the archive.
+
+        :return: Requests listed and archived. Call again in a new transaction
+            until none are found.
+        """
+        appointment_request_ids = self.appointment_request_repo.list_ids(
+            session,
+            conditions=[
+                AppointmentRequest.appointment_request_status_id
+                != AppointmentRequestStatusEnum.PENDING,
+                AppointmentRequest.created_datetime < before,
+            ],
+            limit=limit,
+        )
+        archived = self.appointment_request_repo.archive_by_ids(
+            session, appointment_request_ids, datetime.now()
+        )
+        return BulkChunk(len(appointment_request_ids), archived)
+
+    def archive_appointments_before(
+        self, session: Session, before: datetime, *, limit: int
+    ) -> BulkChunk:
+        """
+        Move up to limit completed, cancelled or missed appointments that ended
+        before `before` to the archive, with their prescriptions. Appointments
+        still referenced by an unarchived request are kept, so archive requests
+        first.
+
+        :return: Appointments listed and archived. Call again in a new
+            transaction until none are found.
+        """
+        appointment_ids = self.appointment_repo.list_ids(
+            session,
+            conditions=[
+                Appointment.appointment_status_id.in_(
+                    (
+                        AppointmentStatusEnum.COMPLETED,
+                        AppointmentStatusEnum.CANCELLED,
+                        AppointmentStatusEnum.MISSED,
+                    )
+                ),
+                Appointment.end_datetime < before,
+                ~Appointment.appointment_requests.any(),
+            ],
+            limit=limit,
+        )
+        if not appointment_ids:
+            return BulkChunk(0, 0)
+        archived_datetime = datetime.now()
+        self.prescription_repo.archive_by_appointment_ids(
+            session, appointment_ids, archived_datetime
+        )
+        archived = self.appointment_repo.archive_by_ids(
+            session, appointment_ids, archived_datetime
+        )
+        return BulkChunk(len(appointment_ids), archived)
 
     # -------------------------------------------------------------------------
     # DELETE
     # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # HELPERS
+    # -------------------------------------------------------------------------
+    def _update_pending_request(
+        self,
+        session: Session,
+        appointment_request_id: int,
+        action: str,
+        values: dict[str, Any],
+    ) -> None:
+        """Compare-and-set a pending request, so only one handler can win."""
+        if not self.appointment_request_repo.compare_and_set(
+            session, appointment_request_id, [AppointmentRequest.is_pending], **values
+        ):
+            self._get_appointment_request(session, appointment_request_id)
+            raise StaleDataError(
+                f"Appointment request id {appointment_request_id} is no longer "
+                f"pending and cannot be {action}."
+            )
+
+    def _update_scheduled_appointment(
+        self,
+        session: Session,
+        appointment_id: int,
+        action: str,
+        values: dict[str, Any],
+    ) -> None:
+        """Compare-and-set a scheduled appointment, so only one handler can win."""
+        if not self.appointment_repo.compare_and_set(
+            session, appointment_id, [Appointment.is_scheduled], **values
+        ):
+            self._get_appointment(session, appointment_id)
+            raise StaleDataError(
+                f"Appointment id {appointment_id} is no longer scheduled and "
+                f"cannot be {action}."
+            )
+
+    def _get_appointment_request(
+        self, session: Session, appointment_request_id: int
+    ) -> AppointmentRequest:
+        appointment_request = self.appointment_request_repo.get(
+            session, appointment_request_id
+        )
+        if not appointment_request:
+            raise ValueError(
+                f"Appointment request id {appointment_request_id} does not exist."
+            )
+        return appointment_request
+
+    def _get_appointment(self, session: Session, appointment_id: int) -> Appointment:
+        appointment = self.appointment_repo.get(session, appointment_id)
+        if not appointment:
+            raise ValueError(f"Appointment id {appointment_id} does not exist.")
+        return appointment
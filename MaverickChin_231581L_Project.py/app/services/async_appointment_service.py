@@ -0,0 +1,79 @@
+from typing import Awaitable, Callable, Concatenate, ParamSpec, TypeVar
+
+from app.services.appointment_service import AppointmentService
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def _awaitable(
+    method: Callable[Concatenate[Session, P], R],
+) -> Callable[Concatenate[AsyncSession, P], Awaitable[R]]:
+    async def run(session: AsyncSession, *args: P.args, **kwargs: P.kwargs) -> R:
+        return await session.run_sync(method, *args, **kwargs)
+
+    run.__name__ = method.__name__
+    run.__doc__ = method.__doc__
+    return run
+
+
+class AsyncAppointmentService:
+    """
+    Async counterpart of AppointmentService, taking an AsyncSession first.
+
+    Each method runs the sync service method through AsyncSession.run_sync, so
+    business rules and queries are shared, while database I/O is still awaited
+    on the async driver. Returned entities cannot lazy load.
+    """
+
+    def __init__(self, service: AppointmentService):
+        self.service = service
+
+        # CREATE
+        self.create_appointment_request = _awaitable(service.create_appointment_request)
+        self.create_appointment = _awaitable(service.create_appointment)
+
+        # READ
+        self.claim_appointment_requests = _awaitable(service.claim_appointment_requests)
+
+        # UPDATE
+        self.update_appointment_request_approved = _awaitable(
+            service.update_appointment_request_approved
+        )
+        self.update_appointment_request_cancelled = _awaitable(
+            service.update_appointment_request_cancelled
+        )
+        self.update_appointment_request_rejected = _awaitable(
+            service.update_appointment_request_rejected
+        )
+        self.update_appointment_request_preferred_datetime = _awaitable(
+            service.update_appointment_request_preferred_datetime
+        )
+        self.update_appointment_completed = _awaitable(
+            service.update_appointment_completed
+        )
+        self.update_appointment_cancelled = _awaitable(
+            service.update_appointment_cancelled
+        )
+        self.update_appointment_missed = _awaitable(service.update_appointment_missed)
+        self.update_appointment_doctor_notes = _awaitable(
+            service.update_appointment_doctor_notes
+        )
+        self.update_appointments_missed_before = _awaitable(
+            service.update_appointments_missed_before
+        )
+        self.update_doctor_appointments_cancelled = _awaitable(
+            service.update_doctor_appointments_cancelled
+        )
+        self.update_appointment_requests_expired_before = _awaitable(
+            service.update_appointment_requests_expired_before
+        )
+        # ARCHIVE
+        self.archive_appointment_requests_before = _awaitable(
+            service.archive_appointment_requests_before
+        )
+        self.archive_appointments_before = _awaitable(
+            service.archive_appointments_before
+        )
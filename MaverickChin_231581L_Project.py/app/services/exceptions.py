@@ -0,0 +1,5 @@
+class StaleDataError(ValueError):
+    """
+    A record changed after it was read (e.g. another receptionist already
+    processed the request), so the update was not applied. Reload and retry.
+    """
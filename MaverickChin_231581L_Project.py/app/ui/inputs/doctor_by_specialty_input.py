@@ -19,40 +19,32 @@ class DoctorBySpecialtyInput(BaseInput):
         """
 
         if consumed is None:
-            self.console.print("No specialty selected.")
-            input("Press ENTER to continue...")
+            prompt_continue_message(self.console, "No specialty selected.")
             return InputResult(value=None)
 
-        with self.app.session_scope() as session:
-            doctors = self.app.repos.doctor_profile.list_by_specialty(
-                session, consumed.value
+        doctors, doctor_index = (
+            self.app.lookup_cache.get_doctors_for_specialty_with_index(consumed.value)
+        )
+        if len(doctors) == 0:
+            prompt_continue_message(
+                self.console,
+                f"No doctors found for specialty {consumed.display_value}.",
             )
+            return InputResult(value=None)
 
-            if len(doctors) == 0:
-                prompt_continue_message(
-                    self.console,
-                    f"No doctors found for specialty {consumed.display_value}.",
-                )
-                return InputResult(value=None)
-
-            filter_items: list[FilterItem] = []
-            for doctor in doctors:
-                doctor_profile_id = doctor.profile_id
-                person = doctor.profile.person
-                full_name = person.full_name
-                phone_number = doctor.office_phone_number
-
-                filter_items.append(
-                    FilterItem(
-                        value=doctor_profile_id, filter_values=[full_name, phone_number]
-                    )
-                )
-
-            filter_items.sort(
-                key=lambda item: item.filter_values[0] if item.filter_values[0] else ""
+        # Roster is already sorted by name
+        filter_items = [
+            FilterItem(
+                value=doctor.doctor_profile_id,
+                filter_values=[doctor.full_name, doctor.office_phone_number],
             )
+            for doctor in doctors
+        ]
 
         filter_input = FilterInput(
-            self.app, f"Doctors in {consumed.display_value}", filter_items
+            self.app,
+            f"Doctors in {consumed.display_value}",
+            filter_items,
+            index=doctor_index,
         )
         return filter_input.prompt()
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import Any, Sequence
 
 from app.core.app import App
+from app.search import FuzzySearcher, NGramIndex
 from app.ui.inputs.base_input import BaseInput
 from app.ui.inputs.input_result import InputResult
 from app.ui.prompts import (
@@ -23,12 +24,61 @@ class FilterItem:
     def display(self):
         return self.filter_values[0]
 
+    @property
+    def joined_display(self) -> str:
+        return " | ".join(fv for fv in self.filter_values if fv is not None)
+
+
+FUZZY_RESULT_LIMIT = 10
+
 
 class FilterInput(BaseInput):
-    def __init__(self, app: App, label: str, items: Sequence[FilterItem]):
+    def __init__(
+        self,
+        app: App,
+        label: str,
+        items: Sequence[FilterItem],
+        index: NGramIndex | None = None,
+    ):
+        """
+        :param index: Prebuilt index over the items' filter values, in the same
+            order, e.g. from LookupCache. Built lazily on first prompt if not given.
+        """
         super().__init__(app)
         self.label = label
         self.items = list(items)
+        if index is not None and len(index) != len(self.items):
+            raise ValueError("index must cover exactly the given items.")
+        self._index = index
+        self._fuzzy: FuzzySearcher | None = None
+        self._joined_displays: list[str] | None = None
+        self._concat_text: Text | None = None
+
+    @staticmethod
+    def build_index(items: Sequence[FilterItem]) -> NGramIndex:
+        return NGramIndex.from_fields(item.filter_values for item in items)
+
+    @property
+    def index(self) -> NGramIndex:
+        if self._index is None:
+            self._index = self.build_index(self.items)
+        return self._index
+
+    @property
+    def joined_displays(self) -> list[str]:
+        if self._joined_displays is None:
+            self._joined_displays = [item.joined_display for item in self.items]
+        return self._joined_displays
+
+    def search(self, query: str) -> list[int]:
+        """Return the positions of the items whose filter values contain query."""
+        return self.index.search(query)
+
+    def fuzzy_search(self, query: str, k: int = FUZZY_RESULT_LIMIT) -> list[int]:
+        """Return the positions of the k closest items to query, best first."""
+        if self._fuzzy is None:
+            self._fuzzy = FuzzySearcher(self.index)
+        return [match.id for match in self._fuzzy.search(query, k)]
 
     def prompt(
         self, default: InputResult | None = None, consumed: InputResult | None = None
@@ -39,17 +89,12 @@ class FilterInput(BaseInput):
             prompt_continue_message(self.app.console, "No selectable options.")
             return InputResult(value=None)
 
-        while True:
-            value_strings_list = []
-            for item in items:
-                value_string = " | ".join(
-                    fv for fv in item.filter_values if fv is not None
-                )
-                value_strings_list.append(value_string)
-            concat_value_strings = ", ".join(value_strings_list)
-            concat_text = Text(concat_value_strings)
-            concat_text.truncate(5000, overflow="ellipsis")
+        if self._concat_text is None:
+            self._concat_text = Text(", ".join(self.joined_displays))
+            self._concat_text.truncate(5000, overflow="ellipsis")
+        concat_text = self._concat_text
 
+        while True:
             filtered = self.items
             if len(self.items) > 20:
                 self.console.print(
@@ -71,25 +116,24 @@ class FilterInput(BaseInput):
                 query = raw.strip().lower()
 
                 if query:
-                    filtered = [
-                        item
-                        for item in items
-                        if any(
-                            query in fv.lower()
-                            for fv in item.filter_values
-                            if fv is not None
-                        )
-                    ]
+                    filtered = [items[i] for i in self.search(query)]
+                    if not filtered:
+                        filtered = [items[i] for i in self.fuzzy_search(query)]
+                        if filtered:
+                            self.console.print(
+                                f"No exact matches for '{raw.strip()}'. Closest:",
+                                markup=False,
+                            )
                 else:
                     filtered = items
 
                 if not filtered:
-                    print("No matches. Try again.")
+                    self.console.print("No matches. Try again.")
                     continue
 
                 if len(filtered) == 1:
                     only = filtered[0]
-                    print(f"\nMatched: {only.display}")
+                    self.console.print(f"\nMatched: {only.display}", markup=False)
                     result = prompt_choice(
                         message="Match found. Select?",
                         options=[("Y", "Yes"), ("N", "No")],
@@ -109,13 +153,7 @@ class FilterInput(BaseInput):
 
             selected = prompt_choice(
                 message=f"{self.label}",
-                options=[
-                    (
-                        item,
-                        " | ".join(fv for fv in item.filter_values if fv is not None),
-                    )
-                    for item in filtered
-                ],
+                options=[(item, item.joined_display) for item in filtered],
                 exitable=True,
                 clearable=True,
                 scrollable=False,
@@ -0,0 +1,154 @@
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Callable, Generic, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# One background worker is shared by every table; prefetches are cheap and
+# only ever one page ahead of what the user is reading.
+_prefetch_executor: ThreadPoolExecutor | None = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _get_prefetch_executor() -> ThreadPoolExecutor:
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="paged-table-prefetch"
+            )
+        return _prefetch_executor
+
+
+class PagedTable(Generic[T]):
+    """
+    Scrolling window over a data source that is fetched a page at a time.
+
+    Only the current page and its neighbours are kept in memory. After a page
+    is shown, the next one is fetched in the background so scrolling right
+    does not wait on the database.
+
+    fetch_page(offset, limit) and fetch_count() are called from a worker
+    thread as well, so each must open its own session.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int, int], Sequence[T]],
+        fetch_count: Callable[[], int],
+        *,
+        page_size: int = 10,
+        cached_pages: int = 3,
+        prefetch: bool = True,
+    ):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1.")
+        if cached_pages < 1:
+            raise ValueError("cached_pages must be at least 1.")
+        self.fetch_page = fetch_page
+        self.fetch_count = fetch_count
+        self.page_size = page_size
+        self.cached_pages = cached_pages
+        self.prefetch = prefetch
+
+        self.page_index = 0
+        self._pages: OrderedDict[int, list[T]] = OrderedDict()
+        self._pending: dict[int, Future[list[T]]] = {}
+        self._lock = threading.Lock()
+        self.total_count = self.fetch_count()
+
+    # -------------------------------------------------------------------------
+    # STATE
+    # -------------------------------------------------------------------------
+    @property
+    def page_count(self) -> int:
+        return max(1, math.ceil(self.total_count / self.page_size))
+
+    @property
+    def start_index(self) -> int:
+        return self.page_index * self.page_size
+
+    @property
+    def is_empty(self) -> bool:
+        return self.total_count == 0
+
+    @property
+    def is_scrollable(self) -> bool:
+        return self.total_count > self.page_size
+
+    # -------------------------------------------------------------------------
+    # NAVIGATION
+    # -------------------------------------------------------------------------
+    def scroll(self, pages: int) -> None:
+        """Move by the given number of pages, wrapping around at either end."""
+        self.page_index = (self.page_index + pages) % self.page_count
+
+    def refresh(self) -> None:
+        """Drop every cached page and re-count, e.g. after a write."""
+        with self._lock:
+            self._pages.clear()
+            self._pending.clear()
+        self.total_count = self.fetch_count()
+        self.page_index = min(self.page_index, self.page_count - 1)
+
+    # -------------------------------------------------------------------------
+    # DATA
+    # -------------------------------------------------------------------------
+    def current_page(self) -> list[T]:
+        """Return the items on the current page, then prefetch the next one."""
+        items = self._get_page(self.page_index)
+        if self.prefetch and self.is_scrollable:
+            self._schedule_prefetch((self.page_index + 1) % self.page_count)
+        return items
+
+    def _get_page(self, page_index: int) -> list[T]:
+        with self._lock:
+            if page_index in self._pages:
+                self._pages.move_to_end(page_index)
+                return self._pages[page_index]
+            future = self._pending.get(page_index)
+
+        if future is not None and future.exception() is None:
+            items = future.result()
+        else:
+            items = self._load(page_index)
+
+        with self._lock:
+            self._pending.pop(page_index, None)
+            self._store(page_index, items)
+        return items
+
+    def _load(self, page_index: int) -> list[T]:
+        return list(self.fetch_page(page_index * self.page_size, self.page_size))
+
+    def _schedule_prefetch(self, page_index: int) -> None:
+        with self._lock:
+            if page_index in self._pages or page_index in self._pending:
+                return
+            # In the caller's context, so the load is seen as the current page's
+            future = _get_prefetch_executor().submit(
+                copy_context().run, self._load, page_index
+            )
+            self._pending[page_index] = future
+        future.add_done_callback(
+            lambda f, page_index=page_index: self._on_prefetched(page_index, f)
+        )
+
+    def _on_prefetched(self, page_index: int, future: Future[list[T]]) -> None:
+        with self._lock:
+            if self._pending.get(page_index) is not future:
+                # Superseded by refresh(); discard the stale result
+                return
+            del self._pending[page_index]
+            if future.exception() is None:
+                self._store(page_index, future.result())
+
+    def _store(self, page_index: int, items: list[T]) -> None:
+        """Cache a page, evicting the least recently used beyond the limit."""
+        self._pages[page_index] = items
+        self._pages.move_to_end(page_index)
+        while len(self._pages) > self.cached_pages:
+            self._pages.popitem(last=False)
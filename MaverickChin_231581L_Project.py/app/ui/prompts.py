@@ -1,8 +1,10 @@
 import os
 import sys
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
-from typing import Any, Literal, TypeVar, overload
+from typing import Any, Literal, Protocol, TypeVar, overload
 
 from prompt_toolkit import PromptSession
 from prompt_toolkit.formatted_text import HTML, AnyFormattedText, FormattedText
@@ -165,16 +167,14 @@ def prompt_choice(
     scrollable: bool = False,
     show_frame: bool = False,
 ) -> T | KeyAction:
-    return choice(
-        message=FormattedText([("underline", message)]),
-        options=options,
+    return _prompt_backend.get().choice(
+        message,
+        options,
         default=default,
-        bottom_toolbar=_bottom_toolbar_prompt_choice(
-            len(options), exitable, clearable, scrollable
-        ),
-        key_bindings=_get_keybindings(exitable, clearable, scrollable),
+        exitable=exitable,
+        clearable=clearable,
+        scrollable=scrollable,
         show_frame=show_frame,
-        style=PROMPT_STYLE,
     )
 
 
@@ -188,16 +188,14 @@ def prompt_choice_with_unrestricted_options(
     scrollable: bool = False,
     show_frame: bool = False,
 ) -> Any:
-    return choice(
-        message=FormattedText([("underline", message)]),
-        options=options,
+    return _prompt_backend.get().choice(
+        message,
+        options,
         default=default,
-        bottom_toolbar=_bottom_toolbar_prompt_choice(
-            len(options), exitable, clearable, scrollable
-        ),
-        key_bindings=_get_keybindings(exitable, clearable, scrollable),
+        exitable=exitable,
+        clearable=clearable,
+        scrollable=scrollable,
         show_frame=show_frame,
-        style=PROMPT_STYLE,
     )
 
 
@@ -258,22 +256,12 @@ def prompt_text(
     exitable: bool = True,
     clearable: bool = True,
 ) -> str | KeyAction:
-    session = PromptSession()
-    if default is None:
-        default = ""
-    prompt = FormattedText(
-        [
-            ("class:bold", f"{message}"),
-            ("", "\n > "),
-        ]
-    )
-    return session.prompt(
-        prompt,
+    return _prompt_backend.get().text(
+        message,
         is_password=is_password,
-        default=default if not is_password else "",
-        bottom_toolbar=prompt_text_bottom_toolbar(exitable, clearable),
-        key_bindings=_get_keybindings(exitable, clearable),
-        style=PROMPT_STYLE,
+        default="" if default is None else default,
+        exitable=exitable,
+        clearable=clearable,
     )
 
 
@@ -301,25 +289,129 @@ def prompt_enter_to_continue(console: Console):
 
 
 def _enter_to_continue():
-    if os.name == "nt":
-        import msvcrt
-
-        while True:
-            key = msvcrt.getwch()
-            if key == "\r":
-                return
-    else:
-        # POSIX (Linux/macOS)
-        import termios
-        import tty
-
-        fd = sys.stdin.fileno()
-        old = termios.tcgetattr(fd)
-        try:
-            tty.setraw(fd)
+    _prompt_backend.get().enter_to_continue()
+
+
+# ---- PROMPT BACKENDS ----
+class PromptSessionClosed(EOFError):
+    """Raised by a prompt backend that has no more input to give."""
+
+
+class PromptBackend(Protocol):
+    """Where the prompt_* functions get their answers from."""
+
+    def choice(
+        self,
+        message: str,
+        options: Sequence[tuple[Any, AnyFormattedText]],
+        *,
+        default: Any,
+        exitable: bool,
+        clearable: bool,
+        scrollable: bool,
+        show_frame: bool,
+    ) -> Any: ...
+
+    def text(
+        self,
+        message: str,
+        *,
+        is_password: bool,
+        default: str,
+        exitable: bool,
+        clearable: bool,
+    ) -> str | KeyAction: ...
+
+    def enter_to_continue(self) -> None: ...
+
+
+class TerminalPromptBackend:
+    """Interactive prompts on the current terminal."""
+
+    def choice(
+        self,
+        message: str,
+        options: Sequence[tuple[Any, AnyFormattedText]],
+        *,
+        default: Any,
+        exitable: bool,
+        clearable: bool,
+        scrollable: bool,
+        show_frame: bool,
+    ) -> Any:
+        return choice(
+            message=FormattedText([("underline", message)]),
+            options=options,
+            default=default,
+            bottom_toolbar=_bottom_toolbar_prompt_choice(
+                len(options), exitable, clearable, scrollable
+            ),
+            key_bindings=_get_keybindings(exitable, clearable, scrollable),
+            show_frame=show_frame,
+            style=PROMPT_STYLE,
+        )
+
+    def text(
+        self,
+        message: str,
+        *,
+        is_password: bool,
+        default: str,
+        exitable: bool,
+        clearable: bool,
+    ) -> str | KeyAction:
+        session = PromptSession()
+        prompt = FormattedText(
+            [
+                ("class:bold", f"{message}"),
+                ("", "\n > "),
+            ]
+        )
+        return session.prompt(
+            prompt,
+            is_password=is_password,
+            default=default if not is_password else "",
+            bottom_toolbar=prompt_text_bottom_toolbar(exitable, clearable),
+            key_bindings=_get_keybindings(exitable, clearable),
+            style=PROMPT_STYLE,
+        )
+
+    def enter_to_continue(self) -> None:
+        if os.name == "nt":
+            import msvcrt
+
             while True:
-                key = sys.stdin.read(1)
-                if key == "\r" or key == "\n":
+                key = msvcrt.getwch()
+                if key == "\r":
                     return
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old)
+        else:
+            # POSIX (Linux/macOS)
+            import termios
+            import tty
+
+            fd = sys.stdin.fileno()
+            old = termios.tcgetattr(fd)
+            try:
+                tty.setraw(fd)
+                while True:
+                    key = sys.stdin.read(1)
+                    if key == "\r" or key == "\n":
+                        return
+            finally:
+                termios.tcsetattr(fd, termios.TCSADRAIN, old)
+
+
+# Per thread/context, so scripted sessions can run side by side
+_prompt_backend: ContextVar[PromptBackend] = ContextVar(
+    "prompt_backend", default=TerminalPromptBackend()
+)
+
+
+@contextmanager
+def use_prompt_backend(backend: PromptBackend) -> Iterator[PromptBackend]:
+    """Route every prompt in the current context to backend until exit."""
+    token = _prompt_backend.set(backend)
+    try:
+        yield backend
+    finally:
+        _prompt_backend.reset(token)
@@ -0,0 +1,109 @@
+from collections import deque
+from collections.abc import Iterable, Sequence
+from enum import Enum
+from typing import Any
+
+from app.ui.prompts import KeyAction, PromptSessionClosed
+from prompt_toolkit.formatted_text import (
+    AnyFormattedText,
+    fragment_list_to_text,
+    to_formatted_text,
+)
+
+ScriptAnswer = str | KeyAction | None
+
+
+def option_text(label: AnyFormattedText) -> str:
+    """Plain text of an option label, without styling."""
+    return fragment_list_to_text(to_formatted_text(label))
+
+
+class ScriptedPromptBackend:
+    """
+    Answers prompts from a fixed script instead of the terminal.
+
+    Each prompt_choice/prompt_text call takes the next answer:
+    - a KeyAction is returned as if its key was pressed,
+    - None accepts the default (the default or first option for a choice),
+    - for a choice, a string selects the option whose value (or enum value) is
+      equal to it, else whose label is equal to it, else the only option whose
+      label contains it,
+    - for a text prompt, a string is typed in as is.
+
+    "Press ENTER to continue" pauses are skipped without using an answer.
+    Once the script runs out the next prompt raises PromptSessionClosed.
+    """
+
+    def __init__(self, script: Iterable[ScriptAnswer]):
+        self._answers: deque[ScriptAnswer] = deque(script)
+        self.prompts_answered = 0
+
+    @property
+    def remaining(self) -> int:
+        return len(self._answers)
+
+    def choice(
+        self,
+        message: str,
+        options: Sequence[tuple[Any, AnyFormattedText]],
+        *,
+        default: Any,
+        exitable: bool,
+        clearable: bool,
+        scrollable: bool,
+        show_frame: bool,
+    ) -> Any:
+        answer = self._next_answer(message)
+        if isinstance(answer, KeyAction):
+            return answer
+        if answer is None:
+            return default if default is not None else options[0][0]
+        return self._match_option(message, options, answer)
+
+    def text(
+        self,
+        message: str,
+        *,
+        is_password: bool,
+        default: str,
+        exitable: bool,
+        clearable: bool,
+    ) -> str | KeyAction:
+        answer = self._next_answer(message)
+        if answer is None:
+            return "" if is_password else default
+        return answer
+
+    def enter_to_continue(self) -> None:
+        return
+
+    def _next_answer(self, message: str) -> ScriptAnswer:
+        if not self._answers:
+            raise PromptSessionClosed(f"Script ended before prompt '{message}'.")
+        self.prompts_answered += 1
+        return self._answers.popleft()
+
+    @staticmethod
+    def _match_option(
+        message: str, options: Sequence[tuple[Any, AnyFormattedText]], answer: str
+    ) -> Any:
+        for value, _ in options:
+            raw = value.value if isinstance(value, Enum) else value
+            if isinstance(raw, str) and raw == answer:
+                return value
+
+        labels = [option_text(label) for _, label in options]
+        for (value, _), label in zip(options, labels):
+            if label == answer:
+                return value
+
+        partial = [
+            value for (value, _), label in zip(options, labels) if answer in label
+        ]
+        if len(partial) == 1:
+            return partial[0]
+
+        problem = "matches no option" if not partial else "matches several options"
+        raise ValueError(
+            f"Scripted answer '{answer}' {problem} of '{message}': {labels}"
+        )
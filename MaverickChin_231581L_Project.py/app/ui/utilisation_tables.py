@@ -0,0 +1,66 @@
+from collections.abc import Mapping
+
+import numpy as np
+from app.analytics import UtilisationReport
+from rich.table import Table
+from rich.text import Text
+
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+# Heatmap cell styles, from least to most booked
+HEAT_STYLES = ("dim", "green", "yellow", "bold red")
+
+
+def utilisation_table(
+    report: UtilisationReport, doctor_names: Mapping[int, str], limit: int = 20
+) -> Table:
+    """Busiest doctors first, with booked hours and working-hours utilisation."""
+    utilisation = report.utilisation
+    booked_total = report.booked_minutes.sum(axis=1)
+    active_days = (report.booked_minutes > 0).sum(axis=1)
+    order = np.argsort(-utilisation, kind="stable")[:limit]
+
+    title = (
+        f"Doctor Utilisation {report.first_day} to {report.last_day} "
+        f"({min(limit, len(order))}/{len(report.doctor_profile_ids)})"
+    )
+    table = Table(title=title, title_justify="left")
+    table.add_column("Doctor")
+    table.add_column("Booked hours", justify="right")
+    table.add_column("Days with bookings", justify="right")
+    table.add_column("Busiest day (hours)", justify="right")
+    table.add_column("Utilisation", justify="right")
+    for i in order:
+        doctor_profile_id = int(report.doctor_profile_ids[i])
+        table.add_row(
+            doctor_names.get(doctor_profile_id, f"Doctor #{doctor_profile_id}"),
+            f"{booked_total[i] / 60:.1f}",
+            str(active_days[i]),
+            f"{report.booked_minutes[i].max() / 60:.1f}",
+            f"{utilisation[i]:.1%}",
+        )
+    return table
+
+
+def heatmap_table(report: UtilisationReport) -> Table:
+    """Booked hours by hour of day and weekday, over every doctor."""
+    heatmap = report.heatmap_minutes
+    table = Table(title="Booked Hours by Time of Day", title_justify="left")
+    table.add_column("Hour")
+    for name in WEEKDAY_NAMES:
+        table.add_column(name, justify="right")
+
+    busy_hours = np.flatnonzero(heatmap.sum(axis=0))
+    if len(busy_hours) == 0:
+        return table
+    peak = heatmap.max()
+    for hour in range(busy_hours[0], busy_hours[-1] + 1):
+        cells: list[Text] = []
+        for weekday in range(len(WEEKDAY_NAMES)):
+            minutes = heatmap[weekday, hour]
+            if minutes == 0:
+                cells.append(Text("-", style="dim"))
+                continue
+            level = min(len(HEAT_STYLES) - 1, int(minutes / peak * len(HEAT_STYLES)))
+            cells.append(Text(f"{minutes / 60:.0f}", style=HEAT_STYLES[level]))
+        table.add_row(f"{hour:02d}:00", *cells)
+    return table
@@ -1,11 +1,18 @@
-import pyfiglet
 from rich.padding import Padding
 from rich.text import Text
 
+# Pre-rendered with pyfiglet.figlet_format("nyp HMS", font="larry3d") so that
+# pyfiglet and its font files are not loaded at startup
+APP_LOGO_TEXT = r"""
+                          __  __           ____       
+                         /\ \/\ \  /'\_/`\/\  _`\     
+  ___   __  __  _____    \ \ \_\ \/\      \ \,\L\_\   
+/' _ `\/\ \/\ \/\ '__`\   \ \  _  \ \ \__\ \/_\__ \   
+/\ \/\ \ \ \_\ \ \ \L\ \   \ \ \ \ \ \ \_/\ \/\ \L\ \ 
+\ \_\ \_\/`____ \ \ ,__/    \ \_\ \_\ \_\\ \_\ `\____\
+ \/_/\/_/`/___/> \ \ \/      \/_/\/_/\/_/ \/_/\/_____/
+            /\___/\ \_\                               
+            \/__/  \/_/                               
+"""[1:]
 
-app_logo = Padding(
-    Text.from_markup(
-        pyfiglet.figlet_format("nyp HMS", font="larry3d"), style="dodger_blue2"
-    ),
-    (0, 1),
-)
+app_logo = Padding(Text(APP_LOGO_TEXT, style="dodger_blue2"), (0, 1))
@@ -0,0 +1,295 @@
+"""
+Local load test of the JSON HTTP API's booking flow, locust style.
+
+Seeds a throwaway SQLite database, serves the API from this process on a free
+localhost port, then runs simulated users against it over keep-alive
+connections, each on its own thread:
+
+    patient       logs in once, then repeatedly lists specialties, lists a
+                  specialty's doctors, requests an appointment and lists their
+                  pending requests
+    receptionist  logs in once, then repeatedly claims a batch of pending
+                  requests in one of its specialties and approves the oldest
+
+Users wait --think-ms between requests. Reports requests per second and
+latency per endpoint, for --duration seconds after every user has logged in.
+
+    python benchmarks/bench_api_load.py [--patients 40] [--receptionists 4] [--duration 15]
+
+Exits with status 1 if any request failed.
+"""
+
+import argparse
+import http.client
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.api import ROUTES, ApiServer  # noqa: E402
+from app.core.bootstrap import build_repos, build_services  # noqa: E402
+from app.database.engine import SQLiteDatabase  # noqa: E402
+from app.database.models import Base  # noqa: E402
+from app.database.seed import seed_all  # noqa: E402
+
+
+class Stats:
+    """Latencies and failures per endpoint, shared by every user thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: defaultdict[str, list[float]] = defaultdict(list)
+        self.failures: defaultdict[str, list[str]] = defaultdict(list)
+
+    def record(self, name: str, seconds: float, failure: str | None) -> None:
+        with self._lock:
+            if failure is None:
+                self.latencies[name].append(seconds)
+            else:
+                self.failures[name].append(failure)
+
+
+class Client:
+    """One user's keep-alive connection to the API."""
+
+    def __init__(self, port: int, stats: Stats):
+        self._connection = http.client.HTTPConnection("127.0.0.1", port)
+        self._stats = stats
+        self.token: str | None = None
+        # Set once every user has logged in; only then are latencies kept
+        self.measure = False
+
+    def request(
+        self, method: str, path: str, name: str, body: dict | None = None
+    ) -> Any:
+        headers = {"Content-Type": "application/json"}
+        if self.token is not None:
+            headers["Authorization"] = f"Bearer {self.token}"
+        started = time.perf_counter()
+        self._connection.request(
+            method, path, json.dumps(body) if body is not None else None, headers
+        )
+        response = self._connection.getresponse()
+        payload = json.loads(response.read())
+        elapsed = time.perf_counter() - started
+
+        failure = None
+        if response.status >= 400:
+            failure = f"{response.status} {payload.get('error')}"
+        if self.measure or failure is not None:
+            self._stats.record(f"{method} {name}", elapsed, failure)
+        return payload if failure is None else None
+
+    def login(self, username: str, profile_type: str) -> None:
+        payload = self.request(
+            "POST",
+            "/login",
+            "/login",
+            {
+                "username": username,
+                "password": "password",
+                "profile_type": profile_type,
+            },
+        )
+        if payload is None:
+            raise ValueError(f"Could not log in as {username}.")
+        self.token = payload["token"]
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def patient_user(client: Client, rng: random.Random, think: float, stop) -> None:
+    while not stop.is_set():
+        specialties = client.request("GET", "/specialties", "/specialties")
+        if not specialties:
+            return
+        specialty_id = rng.choice(specialties)["specialty_id"]
+        time.sleep(think)
+        doctors = client.request(
+            "GET",
+            f"/specialties/{specialty_id}/doctors",
+            "/specialties/{id}/doctors",
+        )
+        time.sleep(think)
+        body: dict[str, Any] = {"specialty_id": specialty_id, "reason": "Load test"}
+        if doctors and rng.random() < 0.5:
+            body["preferred_doctor_profile_id"] = rng.choice(doctors)[
+                "doctor_profile_id"
+            ]
+        client.request("POST", "/appointment-requests", "/appointment-requests", body)
+        time.sleep(think)
+        client.request(
+            "GET",
+            "/appointment-requests?status=pending&limit=10",
+            "/appointment-requests",
+        )
+        time.sleep(think)
+
+
+def receptionist_user(
+    client: Client, rng: random.Random, think: float, stop, specialty_ids: list[int]
+) -> None:
+    start = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(
+        days=30
+    )
+    while not stop.is_set():
+        specialty_id = rng.choice(specialty_ids)
+        batch = client.request(
+            "POST",
+            f"/specialties/{specialty_id}/claims",
+            "/specialties/{id}/claims",
+            {"batch_size": 5},
+        )
+        time.sleep(think)
+        if not batch:
+            continue
+        doctors = client.request(
+            "GET",
+            f"/specialties/{specialty_id}/doctors",
+            "/specialties/{id}/doctors",
+        )
+        time.sleep(think)
+        if not doctors:
+            continue
+        slot = start + timedelta(minutes=30 * rng.randrange(2000))
+        client.request(
+            "POST",
+            f"/appointment-requests/{batch[0]['appointment_request_id']}/approve",
+            "/appointment-requests/{id}/approve",
+            {
+                "doctor_profile_id": rng.choice(doctors)["doctor_profile_id"],
+                "start_datetime": slot.isoformat(),
+                "end_datetime": (slot + timedelta(minutes=30)).isoformat(),
+                "room_name": "Load 1",
+            },
+        )
+        time.sleep(think)
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--patients", type=int, default=40)
+    parser.add_argument("--receptionists", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds")
+    parser.add_argument("--think-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = SQLiteDatabase(db_path=Path(tmp) / "api_load.db")
+        Base.metadata.create_all(db.engine)
+        repos = build_repos()
+        services = build_services(repos)
+        seed_all(db, repos, services, seed=0)
+
+        server = ApiServer(("127.0.0.1", 0), db, repos, services, ROUTES)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        port = server.server_address[1]
+        specialty_ids = [
+            specialty_id
+            for specialty_id, _ in server.lookup_cache.get_all_specialties(
+                in_service_only=True
+            )
+        ]
+
+        stats = Stats()
+        stop = threading.Event()
+        think = args.think_ms / 1000
+        users = args.patients + args.receptionists
+        logged_in = threading.Barrier(users + 1)
+        clients: list[Client] = []
+
+        def run_user(index: int) -> None:
+            client = Client(port, stats)
+            clients.append(client)
+            rng = random.Random(index)
+            try:
+                if index < args.patients:
+                    client.login("patient", "patient")
+                else:
+                    client.login("receptionist", "receptionist")
+            finally:
+                logged_in.wait()
+            try:
+                if index < args.patients:
+                    patient_user(client, rng, think, stop)
+                else:
+                    # Receptionists share one login, so they share claims too;
+                    # give each its own specialties instead
+                    receptionist_user(
+                        client,
+                        rng,
+                        think,
+                        stop,
+                        specialty_ids[index - args.patients :: args.receptionists],
+                    )
+            finally:
+                client.close()
+
+        threads = [
+            threading.Thread(target=run_user, args=(i,), daemon=True)
+            for i in range(users)
+        ]
+        for thread in threads:
+            thread.start()
+        logged_in.wait()
+        for client in clients:
+            client.measure = True
+        started = time.perf_counter()
+        time.sleep(args.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - started
+
+        server.shutdown()
+        server.server_close()
+        db.close()
+
+    print(
+        f"{args.patients} patients, {args.receptionists} receptionists, "
+        f"{args.think_ms:.0f} ms think time, {seconds:.1f} s\n"
+    )
+    print(
+        f"{'endpoint':<42} {'requests':>9} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'failed':>7}"
+    )
+    names = sorted(set(stats.latencies) | set(stats.failures))
+    for name in names:
+        ordered = sorted(stats.latencies[name]) or [0.0]
+        count = len(stats.latencies[name])
+        print(
+            f"{name:<42} {count:>9} {count / seconds:>8.1f} "
+            f"{percentile(ordered, 0.5) * 1000:>8.1f} "
+            f"{percentile(ordered, 0.95) * 1000:>8.1f} "
+            f"{len(stats.failures[name]):>7}"
+        )
+    total = sum(len(v) for v in stats.latencies.values())
+    failed = sum(len(v) for v in stats.failures.values())
+    print(
+        f"{'total':<42} {total:>9} {total / seconds:>8.1f} "
+        f"{'':>8} {'':>8} {failed:>7}"
+    )
+
+    for name in names:
+        for failure in stats.failures[name][:3]:
+            print(f"FAIL: {name}: {failure}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
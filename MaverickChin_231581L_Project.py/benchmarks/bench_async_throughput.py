@@ -0,0 +1,228 @@
+"""
+Async vs thread-per-client throughput benchmark.
+
+Seeds a throwaway SQLite database, then runs the same simulated clients twice:
+
+    sync   one thread per client on SQLiteDatabase and the sync services
+    async  one task per client on AsyncSQLiteDatabase and the async counterparts
+
+Each client runs --ops operations with --think-ms of simulated client time
+between them. Most are reads (a page of pending requests in a specialty plus
+their count); --write-ratio of them create an appointment request.
+
+    python benchmarks/bench_async_throughput.py [--clients 100] [--ops 20] [--think-ms 20]
+
+Exits with status 1 if any operation failed.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.app import Repos, Services  # noqa: E402
+from app.core.bootstrap import build_repos, build_services  # noqa: E402
+from app.database.async_engine import AsyncSQLiteDatabase  # noqa: E402
+from app.database.engine import SQLiteDatabase  # noqa: E402
+from app.database.models import AppointmentRequest, Base, Specialty  # noqa: E402
+from app.database.seed import seed_all  # noqa: E402
+from app.lookups.enums import AppointmentRequestStatusEnum  # noqa: E402
+from app.repositories.appointment_request_repository import (  # noqa: E402
+    AppointmentRequestLoad,
+)
+from app.repositories.async_repository import AsyncRepository  # noqa: E402
+from app.services.async_appointment_service import (  # noqa: E402
+    AsyncAppointmentService,
+)
+
+PAGE_SIZE = 10
+PENDING = [AppointmentRequestStatusEnum.PENDING]
+LOADERS = [AppointmentRequestLoad.PATIENT_WITH_PERSON]
+
+
+class Workload:
+    """The operations every client picks from, decided up front per client."""
+
+    def __init__(self, args: argparse.Namespace, specialty_ids, patient_profile_ids):
+        self.think = args.think_ms / 1000
+        rng = random.Random(0)
+        self.plans = [
+            [
+                (
+                    rng.random() < args.write_ratio,
+                    rng.choice(specialty_ids),
+                    rng.choice(patient_profile_ids),
+                )
+                for _ in range(args.ops)
+            ]
+            for _ in range(args.clients)
+        ]
+
+    @property
+    def total_ops(self) -> int:
+        return sum(len(plan) for plan in self.plans)
+
+
+def pending_conditions(specialty_id: int):
+    return [
+        AppointmentRequest.specialty_id == specialty_id,
+        AppointmentRequest.appointment_request_status_id
+        == AppointmentRequestStatusEnum.PENDING,
+    ]
+
+
+def run_sync(db: SQLiteDatabase, repos: Repos, services: Services, workload: Workload):
+    latencies: list[float] = []
+    errors: list[Exception] = []
+    lock = threading.Lock()
+
+    def client(plan) -> None:
+        for is_write, specialty_id, patient_profile_id in plan:
+            time.sleep(workload.think)
+            started = time.perf_counter()
+            try:
+                with db.session_scope() as session:
+                    if is_write:
+                        services.appointment.create_appointment_request(
+                            session, patient_profile_id, specialty_id, "Benchmark"
+                        )
+                    else:
+                        repos.appointment_request.list_by_specialty(
+                            session,
+                            specialty_id,
+                            only_include_status_ids=PENDING,
+                            order_by_created_datetime_desc=True,
+                            loaders=LOADERS,
+                            limit=PAGE_SIZE,
+                        )
+                        repos.appointment_request.count(
+                            session, conditions=pending_conditions(specialty_id)
+                        )
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(workload.plans)) as executor:
+        list(executor.map(client, workload.plans))
+    return time.perf_counter() - started, latencies, errors
+
+
+async def run_async(
+    db_path: Path, repos: Repos, services: Services, workload: Workload
+):
+    db = AsyncSQLiteDatabase(db_path)
+    requests = AsyncRepository(repos.appointment_request)
+    appointment_service = AsyncAppointmentService(services.appointment)
+    latencies: list[float] = []
+    errors: list[Exception] = []
+
+    async def client(plan) -> None:
+        for is_write, specialty_id, patient_profile_id in plan:
+            await asyncio.sleep(workload.think)
+            started = time.perf_counter()
+            try:
+                async with db.session_scope() as session:
+                    if is_write:
+                        await appointment_service.create_appointment_request(
+                            session, patient_profile_id, specialty_id, "Benchmark"
+                        )
+                    else:
+                        await requests.run(
+                            session,
+                            repos.appointment_request.list_by_specialty,
+                            specialty_id,
+                            only_include_status_ids=PENDING,
+                            order_by_created_datetime_desc=True,
+                            loaders=LOADERS,
+                            limit=PAGE_SIZE,
+                        )
+                        await requests.count(
+                            session, conditions=pending_conditions(specialty_id)
+                        )
+            except Exception as e:
+                errors.append(e)
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(plan) for plan in workload.plans))
+        return time.perf_counter() - started, latencies, errors
+    finally:
+        await db.close()
+
+
+def print_row(label: str, seconds: float, latencies: list[float], errors: list) -> None:
+    ordered = sorted(latencies) or [0.0]
+    p50 = ordered[len(ordered) // 2]
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{label:<6} {len(latencies) / seconds:>10.1f} {seconds:>9.2f} "
+        f"{p50 * 1000:>9.1f} {p95 * 1000:>9.1f} {len(errors):>7}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--ops", type=int, default=20, help="Operations per client")
+    parser.add_argument("--think-ms", type=float, default=20.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "throughput.db"
+        db = SQLiteDatabase(db_path=db_path)
+        try:
+            Base.metadata.create_all(db.engine)
+            repos = build_repos()
+            services = build_services(repos)
+            seed_all(db, repos, services, seed=0)
+            with db.session_scope() as session:
+                specialty_ids = repos.specialty.list_ids(
+                    session, conditions=[Specialty.is_in_service]
+                )
+                patient_profile_ids = [
+                    p.profile_id for p in repos.patient_profile.get_all(session)
+                ]
+            workload = Workload(args, specialty_ids, patient_profile_ids)
+
+            print(
+                f"{args.clients} clients x {args.ops} ops, "
+                f"{args.think_ms:.0f} ms think time, "
+                f"{args.write_ratio:.0%} writes\n"
+            )
+            print(
+                f"{'mode':<6} {'ops/s':>10} {'wall s':>9} "
+                f"{'p50 ms':>9} {'p95 ms':>9} {'errors':>7}"
+            )
+            results = {"sync": run_sync(db, repos, services, workload)}
+        finally:
+            db.close()
+        results["async"] = asyncio.run(run_async(db_path, repos, services, workload))
+
+    for label, (seconds, latencies, errors) in results.items():
+        print_row(label, seconds, latencies, errors)
+
+    failed = False
+    for label, (_, _, errors) in results.items():
+        for error in errors[:3]:
+            print(f"FAIL: {label}: {type(error).__name__}: {error}")
+        failed = failed or bool(errors)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Fuzzy search benchmark.
+
+Builds a 100k-entry corpus from the medication catalogue plus synthetic
+doctor/patient names, then times misspelt queries against FuzzySearcher.
+
+    python benchmarks/bench_fuzzy_search.py [--entries 100000] [--budget-ms 10]
+
+Exits with status 1 if the p95 query time is over budget.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.search import FuzzySearcher, NGramIndex  # noqa: E402
+
+MEDICATIONS_PATH = (
+    PROJECT_ROOT / "app" / "database" / "seed" / "data" / "medications.json"
+)
+
+FIRST_NAMES = [
+    "Aiden",
+    "Beatrice",
+    "Chen",
+    "Divya",
+    "Elijah",
+    "Farah",
+    "Gabriel",
+    "Hui Min",
+    "Isaac",
+    "Jasmine",
+    "Kumar",
+    "Liang",
+    "Mei Ling",
+    "Nur",
+    "Oliver",
+    "Priya",
+    "Qian",
+    "Rachel",
+    "Siti",
+    "Thomas",
+    "Umar",
+    "Vanessa",
+    "Wei Jie",
+    "Xavier",
+]
+LAST_NAMES = [
+    "Tan",
+    "Lim",
+    "Lee",
+    "Ng",
+    "Wong",
+    "Goh",
+    "Chua",
+    "Koh",
+    "Teo",
+    "Ong",
+    "Rahman",
+    "Abdullah",
+    "Kaur",
+    "Singh",
+    "Pillai",
+    "Fernandez",
+    "Smith",
+    "Jones",
+]
+
+
+def build_corpus(size: int, rng: random.Random) -> list[str]:
+    with open(MEDICATIONS_PATH, encoding="utf-8") as f:
+        corpus = [med["generic_name"] for med in json.load(f)]
+    while len(corpus) < size:
+        corpus.append(
+            f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} "
+            f"| +65 {rng.randint(6000, 9999)} {rng.randint(1000, 9999)}"
+        )
+    return corpus[:size]
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    i = rng.randrange(1, len(word) - 1)
+    match rng.choice(("drop", "swap", "replace")):
+        case "drop":
+            return word[:i] + word[i + 1 :]
+        case "swap":
+            return word[: i - 1] + word[i] + word[i - 1] + word[i + 1 :]
+        case _:
+            return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[i + 1 :]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = build_corpus(args.entries, rng)
+
+    start = time.perf_counter()
+    index = NGramIndex(corpus)
+    searcher = FuzzySearcher(index)
+    build_s = time.perf_counter() - start
+
+    words = [
+        word
+        for text in rng.sample(corpus, args.queries * 4)
+        for word in text.split()
+        if len(word) >= 6 and word.isalpha()
+    ]
+    queries = [misspell(word, rng) for word in rng.sample(words, args.queries)]
+
+    timings_ms = []
+    found = 0
+    for query in queries:
+        start = time.perf_counter()
+        results = searcher.search(query, k=args.k)
+        timings_ms.append((time.perf_counter() - start) * 1000)
+        found += bool(results)
+
+    timings_ms.sort()
+    p50 = statistics.median(timings_ms)
+    p95 = timings_ms[int(len(timings_ms) * 0.95) - 1]
+    print(f"entries={len(corpus)} build={build_s:.2f}s queries={len(queries)}")
+    print(f"p50={p50:.2f}ms p95={p95:.2f}ms max={timings_ms[-1]:.2f}ms")
+    print(f"queries with results: {found}/{len(queries)}")
+
+    if p95 > args.budget_ms:
+        print(f"FAIL: p95 {p95:.2f}ms is over the {args.budget_ms}ms budget.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
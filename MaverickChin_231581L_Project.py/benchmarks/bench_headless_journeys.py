@@ -0,0 +1,216 @@
+"""
+Headless end-to-end journey benchmark.
+
+Seeds a throwaway SQLite database, then runs scripted sessions in parallel
+through the real pages. Each round of a session is one full journey:
+
+    patient logs in and requests an appointment
+    -> receptionist logs in and approves it
+    -> doctor logs in and marks it completed
+
+Every session gets its own specialty and doctor so parallel journeys do not
+pick up each other's requests. Reports latency per page transition.
+
+    python benchmarks/bench_headless_journeys.py [--sessions 8] [--rounds 3]
+
+Exits with status 1 if any session failed to run its script to the end.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.bootstrap import build_repos, build_services  # noqa: E402
+from app.core.headless import SessionReport, run_scripted_sessions  # noqa: E402
+from app.database.engine import SQLiteDatabase  # noqa: E402
+from app.database.models import (  # noqa: E402
+    Base,
+    DoctorProfile,
+    Profile,
+    Specialty,
+)
+from app.database.seed import seed_all  # noqa: E402
+from app.lookups.enums import ProfileTypeEnum  # noqa: E402
+from app.ui.prompts import KeyAction  # noqa: E402
+from app.ui.scripted_prompts import ScriptAnswer  # noqa: E402
+
+# One per session; none is a substring of another specialty's name, so the
+# filter search narrows to exactly one match
+JOURNEY_SPECIALTIES = [
+    "Cardiology",
+    "Dermatology",
+    "Endocrinology",
+    "Gastroenterology",
+    "Haematology",
+    "Neurology",
+    "Ophthalmology",
+    "Pathology",
+    "Psychiatry",
+    "Rheumatology",
+]
+PASSWORD = "password"
+
+
+def create_journey_doctors(db, repos, services, count: int) -> None:
+    """Add doctor journeydoc<i> practising only JOURNEY_SPECIALTIES[i]."""
+    with db.session_scope() as session:
+        for i in range(count):
+            user = services.user.create_user_and_person(
+                session=session,
+                username=f"journeydoc{i}",
+                plain_password=PASSWORD,
+                first_name="Journey",
+                last_name=f"Doctor {i}",
+                date_of_birth=date(1980, 1, 1),
+                primary_email=f"journeydoc{i}@hospital.com",
+                primary_phone_number=f"+65 6100 {i:04d}",
+                primary_home_address="NYP Hospital",
+            )
+            profile = repos.profile.add(
+                session,
+                Profile(
+                    person_id=user.person_id, profile_type_id=ProfileTypeEnum.DOCTOR
+                ),
+            )
+            doctor = repos.doctor_profile.add(
+                session,
+                DoctorProfile(
+                    profile_id=profile.profile_id,
+                    office_phone_number=f"+65 6200 {i:04d}",
+                ),
+            )
+            specialty = repos.specialty.get_first(
+                session, conditions=[Specialty.name == JOURNEY_SPECIALTIES[i]]
+            )
+            doctor.specialties.append(specialty)
+
+
+def login(profile: str, username: str) -> list[ScriptAnswer]:
+    return [profile, "Username", username, "Password", PASSWORD, "[Login]"]
+
+
+def journey_script(session_index: int, rounds: int) -> list[ScriptAnswer]:
+    specialty = JOURNEY_SPECIALTIES[session_index]
+    script: list[ScriptAnswer] = []
+    for round_index in range(rounds):
+        appointment_date = date.today() + timedelta(days=1 + round_index)
+        script += [
+            # Patient: request an appointment with this session's doctor
+            *login("Patient", "patient"),
+            "Create appointment request",
+            "Specialty",
+            specialty,
+            "Yes",
+            "Reason",
+            f"Journey {session_index}.{round_index}",
+            "Preferred Doctor",
+            "Journey Doctor",
+            "[Submit]",
+            "Logout",
+            # Receptionist: approve it
+            *login("Receptionist", "receptionist"),
+            "Select specialty to work on",
+            f": {specialty}",
+            "No. 1",
+            "Process appointment request",
+            "Date",
+            appointment_date.isoformat(),
+            "Start Time",
+            "09:00",
+            "End Time",
+            "09:30",
+            "Room Name",
+            "A.01.001",
+            "[Submit]",
+            "Back",
+            KeyAction.BACK,
+            "Logout",
+            # Doctor: complete it
+            *login("Doctor", f"journeydoc{session_index}"),
+            "View all appointments",
+            "No. 1",
+            "Mark as completed",
+            KeyAction.BACK,
+            KeyAction.BACK,
+            "Logout",
+        ]
+    script.append("Exit application")
+    return script
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def print_report(reports: list[SessionReport], wall_seconds: float) -> None:
+    by_transition: dict[tuple[str, str | None], list[float]] = defaultdict(list)
+    for report in reports:
+        for t in report.transitions:
+            by_transition[(t.from_title, t.to_title)].append(t.seconds)
+
+    print(f"{'transition':<78} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for (from_title, to_title), seconds in sorted(
+        by_transition.items(), key=lambda item: -statistics.median(item[1])
+    ):
+        name = f"{from_title} -> {to_title or '(exit)'}"
+        print(
+            f"{name[:78]:<78} {len(seconds):>5} "
+            f"{statistics.median(seconds) * 1000:>8.1f} "
+            f"{percentile(seconds, 0.95) * 1000:>8.1f} "
+            f"{max(seconds) * 1000:>8.1f}"
+        )
+
+    session_seconds = [r.total_seconds for r in reports]
+    print(
+        f"\n{len(reports)} sessions in {wall_seconds:.2f} s wall time; "
+        f"per session p50 {statistics.median(session_seconds):.2f} s, "
+        f"max {max(session_seconds):.2f} s"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    if not 1 <= args.sessions <= len(JOURNEY_SPECIALTIES):
+        parser.error(f"--sessions must be between 1 and {len(JOURNEY_SPECIALTIES)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = SQLiteDatabase(db_path=Path(tmp) / "journeys.db")
+        try:
+            Base.metadata.create_all(db.engine)
+            repos = build_repos()
+            services = build_services(repos)
+            seed_all(db, repos, services, seed=0)
+            create_journey_doctors(db, repos, services, args.sessions)
+
+            scripts = [journey_script(i, args.rounds) for i in range(args.sessions)]
+            started = time.perf_counter()
+            reports = run_scripted_sessions(
+                db, repos, services, scripts, max_workers=args.sessions
+            )
+            wall_seconds = time.perf_counter() - started
+        finally:
+            db.close()
+
+    print_report(reports, wall_seconds)
+
+    failed = [(i, r) for i, r in enumerate(reports) if not r.ok]
+    for i, report in failed:
+        reason = report.error or f"{report.unanswered} scripted answers left unused"
+        print(f"FAIL: session {i}: {reason}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1024 @@
+"""
+Repository benchmark suite.
+
+Builds a SQLite database for each size with the seed generators, then times
+every public method of AppointmentRepository, AppointmentRequestRepository,
+DoctorProfileRepository, PrescriptionRepository and BaseRepository against it.
+Each method is called --repeat times, every call in its own transaction that is
+rolled back afterwards, so writes leave the data as they found it. Reports p50
+and p95 latency and the SQL statements each call ran.
+
+Sizes count appointment requests; patients, appointments and prescriptions
+scale with them. The generators simulate patients one request at a time, so at
+most --seed-patients patients are generated and bigger sizes are reached by
+copying them, with everything they did, under new IDs.
+
+    python benchmarks/bench_repositories.py [--sizes 10000 100000 1000000]
+        [--data-dir DIR] [--output results.json] [--baseline old.json]
+
+Databases are kept in --data-dir (default: a temporary directory) and reused by
+later runs with the same size and seed. Results go to --output as JSON. With
+--baseline, a method is a regression if its p50 is --threshold times the
+baseline's and at least --min-ms slower, or it runs more statements.
+
+Exits with status 1 on any regression, or if a public method has no case.
+"""
+
+import argparse
+import json
+import math
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import sqlalchemy  # noqa: E402
+from app.core.app import Repos  # noqa: E402
+from app.core.bootstrap import build_repos, build_services  # noqa: E402
+from app.database.engine import Database, SQLiteDatabase  # noqa: E402
+from app.database.models import (  # noqa: E402
+    Appointment,
+    AppointmentRequest,
+    Base,
+    PrescriptionItem,
+)
+from app.database.seed.lookups import seed_lookups  # noqa: E402
+from app.database.seed.medications import seed_medications  # noqa: E402
+from app.database.seed.users_default import seed_default_users  # noqa: E402
+from app.database.seed.users_random import seed_users_random  # noqa: E402
+from app.lookups.enums import (  # noqa: E402
+    AppointmentRequestStatusEnum,
+    AppointmentStatusEnum,
+    ProfileTypeEnum,
+)
+from app.repositories import (  # noqa: E402
+    AppointmentRepository,
+    AppointmentRequestRepository,
+    BaseRepository,
+    DoctorProfileRepository,
+    PrescriptionRepository,
+)
+from app.repositories.appointment_repository import AppointmentLoad  # noqa: E402
+from app.repositories.appointment_request_repository import (  # noqa: E402
+    AppointmentRequestLoad,
+)
+from app.repositories.doctor_profile_repository import DoctorProfileLoad  # noqa: E402
+from sqlalchemy import (  # noqa: E402
+    ColumnElement,
+    Table,
+    case,
+    event,
+    func,
+    insert,
+    literal,
+    select,
+)
+from sqlalchemy.engine import Connection  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+RESULTS_FORMAT = "bench_repositories"
+RESULTS_VERSION = 1
+
+# Roughly what the generators average per patient
+REQUESTS_PER_PATIENT = 18
+
+BENCHMARKED_CLASSES = (
+    BaseRepository,
+    AppointmentRepository,
+    AppointmentRequestRepository,
+    DoctorProfileRepository,
+    PrescriptionRepository,
+)
+# Public, but configuration rather than data access
+NOT_BENCHMARKED = {"enable_result_cache", "disable_result_cache", "result_cache_stats"}
+
+# -------------------------------------------------------------------------
+# DATABASES
+# -------------------------------------------------------------------------
+
+
+def database_path(data_dir: Path, size: int, seed: int) -> Path:
+    return data_dir / f"repositories_{size}_seed{seed}.db"
+
+
+def build_database(path: Path, size: int, seed: int, seed_patients: int) -> None:
+    """Seed a database at path with about size appointment requests."""
+    # Build under another name, so an interrupted build is never reused
+    building = path.with_suffix(".building")
+    building.unlink(missing_ok=True)
+    db = SQLiteDatabase(db_path=building)
+    try:
+        repos = build_repos()
+        services = build_services(repos)
+        patients = min(seed_patients, math.ceil(size / REQUESTS_PER_PATIENT))
+        with db.session_scope() as session:
+            seed_lookups(session)
+            seed_medications(session)
+            seed_users_random(
+                session,
+                seed,
+                patients_count=patients,
+                doctors_count=max(10, patients // 10),
+                receptionists_count=max(2, patients // 100),
+                admins_count=0,
+            )
+            seed_default_users(session, seed, repos, services)
+        with db.session_scope() as session:
+            generated = session.scalar(
+                select(func.count()).select_from(AppointmentRequest)
+            )
+        copies = math.ceil(size / max(generated or 0, 1)) - 1
+        if copies > 0:
+            print(f"[bench] Copying every patient {copies} times...")
+            copy_patients(db, copies)
+    finally:
+        db.close()
+    building.replace(path)
+
+
+def copy_patients(db: Database, copies: int) -> None:
+    """
+    Append copies of every patient, with their requests, appointments and
+    prescriptions, in set-based INSERT ... SELECTs. Copies share the doctors,
+    receptionists and specialties of the originals.
+    """
+    tables = Base.metadata.tables
+    person, user, profile = tables["person"], tables["user"], tables["profile"]
+    patient_profile = tables["patient_profile"]
+    appointment = tables["appointment"]
+    appointment_request = tables["appointment_request"]
+    prescription = tables["prescription"]
+    prescription_item = tables["prescription_item"]
+
+    with db.session_scope() as session:
+        connection = session.connection()
+        # Only rows that existed before copying are copied
+        last_id = {
+            table.name: connection.scalar(select(func.max(_pk(table)))) or 0
+            for table in (
+                person,
+                user,
+                profile,
+                appointment,
+                appointment_request,
+                prescription,
+                prescription_item,
+            )
+        }
+        patient_person_ids = select(profile.c.person_id).where(
+            profile.c.profile_type_id == ProfileTypeEnum.PATIENT,
+            profile.c.profile_id <= last_id["profile"],
+        )
+        for copy in range(1, copies + 1):
+            offset = {name: copy * last for name, last in last_id.items()}
+            person_offset = offset["person"]
+            profile_offset = offset["profile"]
+            appointment_offset = offset["appointment"]
+            _copy_rows(
+                connection,
+                person,
+                person.c.person_id.in_(patient_person_ids),
+                person_id=person.c.person_id + person_offset,
+                primary_email=literal(f"{copy}.") + person.c.primary_email,
+            )
+            _copy_rows(
+                connection,
+                user,
+                user.c.person_id.in_(patient_person_ids),
+                user_id=user.c.user_id + offset["user"],
+                person_id=user.c.person_id + person_offset,
+                username=user.c.username + literal(f".{copy}"),
+            )
+            _copy_rows(
+                connection,
+                profile,
+                (profile.c.profile_type_id == ProfileTypeEnum.PATIENT)
+                & (profile.c.profile_id <= last_id["profile"]),
+                profile_id=profile.c.profile_id + profile_offset,
+                person_id=profile.c.person_id + person_offset,
+            )
+            _copy_rows(
+                connection,
+                patient_profile,
+                patient_profile.c.profile_id <= last_id["profile"],
+                profile_id=patient_profile.c.profile_id + profile_offset,
+            )
+            _copy_rows(
+                connection,
+                appointment,
+                appointment.c.appointment_id <= last_id["appointment"],
+                appointment_id=appointment.c.appointment_id + appointment_offset,
+                patient_profile_id=appointment.c.patient_profile_id + profile_offset,
+                # Patients cancel their own appointments
+                cancelled_by_profile_id=case(
+                    (
+                        appointment.c.cancelled_by_profile_id
+                        == appointment.c.patient_profile_id,
+                        appointment.c.cancelled_by_profile_id + profile_offset,
+                    ),
+                    else_=appointment.c.cancelled_by_profile_id,
+                ),
+            )
+            _copy_rows(
+                connection,
+                appointment_request,
+                appointment_request.c.appointment_request_id
+                <= last_id["appointment_request"],
+                appointment_request_id=appointment_request.c.appointment_request_id
+                + offset["appointment_request"],
+                patient_profile_id=appointment_request.c.patient_profile_id
+                + profile_offset,
+                appointment_id=appointment_request.c.appointment_id
+                + appointment_offset,
+            )
+            _copy_rows(
+                connection,
+                prescription,
+                prescription.c.prescription_id <= last_id["prescription"],
+                prescription_id=prescription.c.prescription_id + offset["prescription"],
+                patient_profile_id=prescription.c.patient_profile_id + profile_offset,
+                appointment_id=prescription.c.appointment_id + appointment_offset,
+            )
+            _copy_rows(
+                connection,
+                prescription_item,
+                prescription_item.c.prescription_item_id
+                <= last_id["prescription_item"],
+                prescription_item_id=prescription_item.c.prescription_item_id
+                + offset["prescription_item"],
+                prescription_id=prescription_item.c.prescription_id
+                + offset["prescription"],
+            )
+
+
+def _pk(table: Table) -> Any:
+    (column,) = table.primary_key.columns
+    return column
+
+
+def _copy_rows(
+    connection: Connection,
+    table: Table,
+    where: ColumnElement[bool],
+    **values: ColumnElement[Any],
+) -> None:
+    """INSERT ... SELECT the rows matching where, replacing the given columns."""
+    connection.execute(
+        insert(table).from_select(
+            [column.name for column in table.columns],
+            select(*(values.get(c.name, c) for c in table.columns)).where(where),
+        )
+    )
+
+
+# -------------------------------------------------------------------------
+# CASES
+# -------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Fixture:
+    """IDs picked from a benchmark database for the cases to work on."""
+
+    patient_profile_id: int
+    doctor_profile_id: int
+    doctor_person_id: int
+    receptionist_profile_id: int
+    specialty_id: int
+    medication_id: int
+    pending_appointment_request_id: int
+    # Non-pending requests, for archiving
+    handled_appointment_request_ids: list[int]
+    # Closed appointments with prescriptions and no request pointing at them
+    closed_appointment_ids: list[int]
+    scheduled_appointment_ids: list[int]
+    appointment_id: int
+    prescription_id: int
+    prescription_item_id: int
+    # The month before now
+    month: tuple[datetime, datetime]
+
+
+def load_fixture(db: Database) -> Fixture:
+    with db.session_scope() as session:
+
+        def busiest(column: Any, *where: Any) -> int:
+            value = session.scalar(
+                select(column)
+                .where(*where)
+                .group_by(column)
+                .order_by(func.count().desc(), column)
+                .limit(1)
+            )
+            if value is None:
+                raise ValueError(f"Benchmark database has no {column}.")
+            return value
+
+        def ids(column: Any, *where: Any, limit: int = 100) -> list[int]:
+            stmt = select(column).where(*where).order_by(column).limit(limit)
+            return list(session.scalars(stmt))
+
+        doctor_profile_id = busiest(Appointment.doctor_profile_id)
+        closed = Appointment.appointment_status_id.in_(
+            (AppointmentStatusEnum.COMPLETED, AppointmentStatusEnum.CANCELLED)
+        )
+        closed_appointment_ids = ids(
+            Appointment.appointment_id,
+            closed,
+            Appointment.prescriptions.any(),
+            ~Appointment.appointment_requests.any(),
+        ) or ids(Appointment.appointment_id, closed, Appointment.prescriptions.any())
+        prescription_item = session.scalars(
+            select(PrescriptionItem).order_by(PrescriptionItem.prescription_item_id)
+        ).first()
+        if prescription_item is None:
+            raise ValueError("Benchmark database has no prescriptions.")
+        now = datetime.now()
+        return Fixture(
+            patient_profile_id=busiest(Appointment.patient_profile_id),
+            doctor_profile_id=doctor_profile_id,
+            doctor_person_id=session.scalar(
+                select(Base.metadata.tables["profile"].c.person_id).where(
+                    Base.metadata.tables["profile"].c.profile_id == doctor_profile_id
+                )
+            ),
+            receptionist_profile_id=busiest(Appointment.created_by_profile_id),
+            specialty_id=busiest(
+                AppointmentRequest.specialty_id,
+                AppointmentRequest.appointment_request_status_id
+                == AppointmentRequestStatusEnum.PENDING,
+            ),
+            medication_id=prescription_item.medication_id,
+            pending_appointment_request_id=ids(
+                AppointmentRequest.appointment_request_id,
+                AppointmentRequest.appointment_request_status_id
+                == AppointmentRequestStatusEnum.PENDING,
+                limit=1,
+            )[0],
+            handled_appointment_request_ids=ids(
+                AppointmentRequest.appointment_request_id,
+                AppointmentRequest.appointment_request_status_id
+                != AppointmentRequestStatusEnum.PENDING,
+            ),
+            closed_appointment_ids=closed_appointment_ids,
+            scheduled_appointment_ids=ids(
+                Appointment.appointment_id,
+                Appointment.appointment_status_id == AppointmentStatusEnum.SCHEDULED,
+            ),
+            appointment_id=closed_appointment_ids[0],
+            prescription_id=prescription_item.prescription_id,
+            prescription_item_id=prescription_item.prescription_item_id,
+            month=(now - timedelta(days=30), now),
+        )
+
+
+@dataclass(frozen=True)
+class Case:
+    # "Class.method" of the method timed
+    name: str
+    # Runs untimed in the call's transaction; returns the call to time
+    prepare: Callable[[Session, Fixture], Callable[[], Any]]
+
+
+def build_cases(repos: Repos) -> list[Case]:
+    appointment = repos.appointment
+    appointment_request = repos.appointment_request
+    doctor_profile = repos.doctor_profile
+    prescription = repos.prescription
+    delete_item_with_cleanup = (
+        prescription.delete_by_prescription_item_by_id_with_prescription_cleanup
+    )
+    lease = timedelta(minutes=15)
+    page = dict(order_by_created_datetime_desc=True, offset=20, limit=20)
+    pending = (
+        AppointmentRequest.appointment_request_status_id
+        == AppointmentRequestStatusEnum.PENDING
+    )
+
+    def claimed(session: Session, f: Fixture) -> None:
+        appointment_request.claim_next(
+            session, f.specialty_id, 10, f.receptionist_profile_id, lease=lease
+        )
+
+    def detached_request(session: Session, f: Fixture) -> AppointmentRequest:
+        entity = appointment_request.get(session, f.pending_appointment_request_id)
+        assert entity is not None
+        session.expunge(entity)
+        entity.reason = "Benchmark"
+        return entity
+
+    def detached_item(session: Session, f: Fixture) -> PrescriptionItem:
+        entity = prescription.get_prescription_item(session, f.prescription_item_id)
+        assert entity is not None
+        session.expunge(entity)
+        entity.instructions = "Benchmark"
+        return entity
+
+    def new_request(f: Fixture) -> AppointmentRequest:
+        return AppointmentRequest(
+            patient_profile_id=f.patient_profile_id,
+            specialty_id=f.specialty_id,
+            reason="Benchmark",
+            appointment_request_status_id=AppointmentRequestStatusEnum.PENDING,
+        )
+
+    return [
+        # BaseRepository, through the appointment request table
+        Case(
+            "BaseRepository.add",
+            lambda s, f: lambda: appointment_request.add(s, new_request(f)),
+        ),
+        Case(
+            "BaseRepository.get",
+            lambda s, f: lambda: appointment_request.get(
+                s,
+                f.pending_appointment_request_id,
+                loaders=[AppointmentRequestLoad.SPECIALTY],
+            ),
+        ),
+        Case(
+            "BaseRepository.get_all",
+            lambda s, f: lambda: appointment_request.get_all(
+                s,
+                conditions=[pending],
+                order_by=[AppointmentRequest.created_datetime],
+                offset=20,
+                limit=20,
+            ),
+        ),
+        Case(
+            "BaseRepository.get_first",
+            lambda s, f: lambda: appointment_request.get_first(
+                s,
+                conditions=[AppointmentRequest.specialty_id == f.specialty_id, pending],
+                order_by=[AppointmentRequest.created_datetime],
+            ),
+        ),
+        Case(
+            "BaseRepository.list",
+            lambda s, f: lambda: appointment_request.list(
+                s,
+                conditions=[
+                    AppointmentRequest.patient_profile_id == f.patient_profile_id
+                ],
+            ),
+        ),
+        Case(
+            "BaseRepository.list_ids",
+            lambda s, f: lambda: appointment_request.list_ids(
+                s, conditions=[pending], limit=500
+            ),
+        ),
+        Case(
+            "BaseRepository.exists",
+            lambda s, f: lambda: appointment_request.exists(
+                s, f.pending_appointment_request_id
+            ),
+        ),
+        Case(
+            "BaseRepository.exists_with_conditions",
+            lambda s, f: lambda: appointment_request.exists_with_conditions(
+                s,
+                [
+                    AppointmentRequest.patient_profile_id == f.patient_profile_id,
+                    pending,
+                ],
+            ),
+        ),
+        Case(
+            "BaseRepository.count",
+            lambda s, f: lambda: appointment_request.count(s, conditions=[pending]),
+        ),
+        Case(
+            "BaseRepository.update",
+            lambda s, f: (lambda entity: lambda: appointment_request.update(s, entity))(
+                detached_request(s, f)
+            ),
+        ),
+        Case(
+            "BaseRepository.compare_and_set",
+            lambda s, f: lambda: appointment_request.compare_and_set(
+                s, f.pending_appointment_request_id, [pending], reason="Benchmark"
+            ),
+        ),
+        Case(
+            "BaseRepository.is_archived",
+            lambda s, f: lambda: appointment_request.is_archived(
+                s, f.pending_appointment_request_id
+            ),
+        ),
+        Case(
+            "BaseRepository.archive_by_ids",
+            lambda s, f: lambda: appointment_request.archive_by_ids(
+                s, f.handled_appointment_request_ids, datetime.now()
+            ),
+        ),
+        Case(
+            "BaseRepository.delete",
+            lambda s, f: (lambda entity: lambda: appointment_request.delete(s, entity))(
+                appointment_request.get(s, f.pending_appointment_request_id)
+            ),
+        ),
+        Case(
+            "BaseRepository.delete_by_id",
+            lambda s, f: lambda: appointment_request.delete_by_id(
+                s, f.pending_appointment_request_id
+            ),
+        ),
+        # AppointmentRepository
+        Case(
+            "AppointmentRepository.list_by_patient_profile_id",
+            lambda s, f: lambda: appointment.list_by_patient_profile_id(
+                s,
+                f.patient_profile_id,
+                loaders=(
+                    AppointmentLoad.SPECIALTY,
+                    AppointmentLoad.DOCTOR_WITH_PERSON,
+                    AppointmentLoad.CREATED_BY_PROFILE,
+                ),
+                **page,
+            ),
+        ),
+        Case(
+            "AppointmentRepository.list_by_doctor_profile_id",
+            lambda s, f: lambda: appointment.list_by_doctor_profile_id(
+                s,
+                f.doctor_profile_id,
+                loaders=(
+                    AppointmentLoad.SPECIALTY,
+                    AppointmentLoad.PATIENT_WITH_PERSON,
+                    AppointmentLoad.CREATED_BY_PROFILE,
+                ),
+                **page,
+            ),
+        ),
+        Case(
+            "AppointmentRepository.list_appointment_details_by_doctor_profile_id",
+            lambda s, f: lambda: (
+                appointment.list_appointment_details_by_doctor_profile_id(
+                    s,
+                    f.doctor_profile_id,
+                    only_include_status_ids=[AppointmentStatusEnum.SCHEDULED],
+                    order_by_start_datetime_asc=True,
+                )
+            ),
+        ),
+        Case(
+            "AppointmentRepository.list_appointment_details_by_patient_profile_id",
+            lambda s, f: lambda: (
+                appointment.list_appointment_details_by_patient_profile_id(
+                    s,
+                    f.patient_profile_id,
+                    only_include_status_ids=[AppointmentStatusEnum.SCHEDULED],
+                    order_by_start_datetime_asc=True,
+                )
+            ),
+        ),
+        Case(
+            "AppointmentRepository.list_by_created_by_profile_id",
+            lambda s, f: lambda: appointment.list_by_created_by_profile_id(
+                s,
+                f.receptionist_profile_id,
+                loaders=(
+                    AppointmentLoad.SPECIALTY,
+                    AppointmentLoad.DOCTOR_WITH_PERSON,
+                    AppointmentLoad.CANCELLED_BY_PROFILE,
+                ),
+                **page,
+            ),
+        ),
+        Case(
+            "AppointmentRepository.iter_schedule_rows",
+            lambda s, f: lambda: list(appointment.iter_schedule_rows(s, f.month)),
+        ),
+        Case(
+            "AppointmentRepository.stream_export_rows",
+            lambda s, f: lambda: appointment.stream_export_rows(
+                s, datetime_range=f.month
+            ).all(),
+        ),
+        Case(
+            "AppointmentRepository.list_booking_rows",
+            lambda s, f: lambda: appointment.list_booking_rows(s, f.month),
+        ),
+        Case(
+            "AppointmentRepository.update_status_by_ids",
+            lambda s, f: lambda: appointment.update_status_by_ids(
+                s, f.scheduled_appointment_ids, AppointmentStatusEnum.MISSED
+            ),
+        ),
+        # AppointmentRequestRepository
+        Case(
+            "AppointmentRequestRepository.list_by_patient_profile_id",
+            lambda s, f: lambda: appointment_request.list_by_patient_profile_id(
+                s,
+                f.patient_profile_id,
+                loaders=[
+                    AppointmentRequestLoad.SPECIALTY,
+                    AppointmentRequestLoad.PREFERRED_DOCTOR_WITH_PERSON,
+                ],
+                **page,
+            ),
+        ),
+        Case(
+            "AppointmentRequestRepository.list_by_specialty",
+            lambda s, f: lambda: appointment_request.list_by_specialty(
+                s,
+                f.specialty_id,
+                only_include_status_ids=[AppointmentRequestStatusEnum.PENDING],
+                loaders=[
+                    AppointmentRequestLoad.PATIENT_WITH_PERSON,
+                    AppointmentRequestLoad.PREFERRED_DOCTOR_WITH_PERSON,
+                ],
+                **page,
+            ),
+        ),
+        Case(
+            "AppointmentRequestRepository.list_claimed",
+            lambda s, f: (
+                claimed(s, f),
+                lambda: appointment_request.list_claimed(
+                    s, f.specialty_id, f.receptionist_profile_id
+                ),
+            )[1],
+        ),
+        Case(
+            "AppointmentRequestRepository.stream_export_rows",
+            lambda s, f: lambda: appointment_request.stream_export_rows(
+                s, datetime_range=f.month
+            ).all(),
+        ),
+        Case(
+            "AppointmentRequestRepository.count_by_specialty",
+            lambda s, f: lambda: appointment_request.count_by_specialty(s),
+        ),
+        Case(
+            "AppointmentRequestRepository.get_specialty_importance_details",
+            lambda s, f: lambda: appointment_request.get_specialty_importance_details(
+                s, limit=20
+            ),
+        ),
+        Case(
+            "AppointmentRequestRepository.update_status_by_ids",
+            lambda s, f: lambda: appointment_request.update_status_by_ids(
+                s,
+                f.handled_appointment_request_ids,
+                AppointmentRequestStatusEnum.REJECTED,
+            ),
+        ),
+        Case(
+            "AppointmentRequestRepository.claim_next",
+            lambda s, f: lambda: appointment_request.claim_next(
+                s, f.specialty_id, 10, f.receptionist_profile_id, lease=lease
+            ),
+        ),
+        Case(
+            "AppointmentRequestRepository.renew_claims",
+            lambda s, f: (
+                claimed(s, f),
+                lambda: appointment_request.renew_claims(
+                    s, f.specialty_id, f.receptionist_profile_id, lease=lease
+                ),
+            )[1],
+        ),
+        Case(
+            "AppointmentRequestRepository.release_claims",
+            lambda s, f: (
+                claimed(s, f),
+                lambda: appointment_request.release_claims(
+                    s, f.receptionist_profile_id
+                ),
+            )[1],
+        ),
+        # DoctorProfileRepository
+        Case(
+            "DoctorProfileRepository.get_by_id",
+            lambda s, f: lambda: doctor_profile.get_by_id(
+                s,
+                f.doctor_profile_id,
+                loaders=[DoctorProfileLoad.PROFILE_WITH_PERSON_WITH_USER],
+            ),
+        ),
+        Case(
+            "DoctorProfileRepository.get_by_person_id",
+            lambda s, f: lambda: doctor_profile.get_by_person_id(s, f.doctor_person_id),
+        ),
+        Case(
+            "DoctorProfileRepository.list_by_specialty",
+            lambda s, f: lambda: doctor_profile.list_by_specialty(
+                s, f.specialty_id, loaders=[DoctorProfileLoad.PROFILE_WITH_PERSON]
+            ),
+        ),
+        Case(
+            "DoctorProfileRepository.list_all_active",
+            lambda s, f: lambda: doctor_profile.list_all_active(
+                s,
+                loaders=[
+                    DoctorProfileLoad.PROFILE_WITH_PERSON,
+                    DoctorProfileLoad.SPECIALTIES,
+                ],
+            ),
+        ),
+        Case(
+            "DoctorProfileRepository.list_roster_rows",
+            lambda s, f: lambda: doctor_profile.list_roster_rows(s),
+        ),
+        # PrescriptionRepository
+        Case(
+            "PrescriptionRepository.add_prescription_for_appointment_id",
+            lambda s, f: lambda: prescription.add_prescription_for_appointment_id(
+                s, f.appointment_id
+            ),
+        ),
+        Case(
+            "PrescriptionRepository.add_prescription_item",
+            lambda s, f: lambda: prescription.add_prescription_item(
+                s, f.prescription_id, f.medication_id, "Benchmark"
+            ),
+        ),
+        Case(
+            "PrescriptionRepository.get_prescription_item",
+            lambda s, f: lambda: prescription.get_prescription_item(
+                s, f.prescription_item_id
+            ),
+        ),
+        Case(
+            "PrescriptionRepository.update_prescription_item",
+            lambda s, f: (
+                lambda entity: lambda: prescription.update_prescription_item(s, entity)
+            )(detached_item(s, f)),
+        ),
+        Case(
+            "PrescriptionRepository."
+            "delete_by_prescription_item_by_id_with_prescription_cleanup",
+            lambda s, f: lambda: delete_item_with_cleanup(s, f.prescription_item_id),
+        ),
+        Case(
+            "PrescriptionRepository.delete_by_appointment_ids",
+            lambda s, f: lambda: prescription.delete_by_appointment_ids(
+                s, f.closed_appointment_ids
+            ),
+        ),
+        Case(
+            "PrescriptionRepository.archive_by_appointment_ids",
+            lambda s, f: lambda: prescription.archive_by_appointment_ids(
+                s, f.closed_appointment_ids, datetime.now()
+            ),
+        ),
+        Case(
+            "PrescriptionRepository.stream_export_item_rows",
+            lambda s, f: lambda: prescription.stream_export_item_rows(
+                s, datetime_range=f.month
+            ).all(),
+        ),
+    ]
+
+
+def uncovered_methods(cases: list[Case]) -> list[str]:
+    """Public methods of the benchmarked classes that no case times."""
+    covered = {bench_case.name for bench_case in cases}
+    missing = []
+    for cls in BENCHMARKED_CLASSES:
+        for name, member in vars(cls).items():
+            if name.startswith("_") or name in NOT_BENCHMARKED:
+                continue
+            if callable(member) and f"{cls.__name__}.{name}" not in covered:
+                missing.append(f"{cls.__name__}.{name}")
+    return missing
+
+
+# -------------------------------------------------------------------------
+# RUNNING
+# -------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class CaseResult:
+    p50_ms: float
+    p95_ms: float
+    statements: int
+
+
+def run_case(
+    db: Database, bench_case: Case, fixture: Fixture, *, warmup: int, repeat: int
+) -> CaseResult:
+    statements = 0
+
+    def count_statement(*args: Any) -> None:
+        nonlocal statements
+        statements += 1
+
+    seconds: list[float] = []
+    most_statements = 0
+    for i in range(warmup + repeat):
+        session = db.session_factory()
+        try:
+            call = bench_case.prepare(session, fixture)
+            statements = 0
+            event.listen(db.engine, "before_cursor_execute", count_statement)
+            try:
+                started = time.perf_counter()
+                call()
+                elapsed = time.perf_counter() - started
+            finally:
+                event.remove(db.engine, "before_cursor_execute", count_statement)
+        finally:
+            session.rollback()
+            session.close()
+        if i >= warmup:
+            seconds.append(elapsed)
+            most_statements = max(most_statements, statements)
+    ordered = sorted(seconds)
+    return CaseResult(
+        p50_ms=percentile(ordered, 0.5) * 1000,
+        p95_ms=percentile(ordered, 0.95) * 1000,
+        statements=most_statements,
+    )
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def table_rows(db: Database) -> dict[str, int]:
+    with db.session_scope() as session:
+        return {
+            name: session.scalar(
+                select(func.count()).select_from(Base.metadata.tables[name])
+            )
+            or 0
+            for name in (
+                "patient_profile",
+                "appointment_request",
+                "appointment",
+                "prescription",
+                "prescription_item",
+            )
+        }
+
+
+def run_size(
+    path: Path, cases: list[Case], *, warmup: int, repeat: int
+) -> dict[str, Any]:
+    db = SQLiteDatabase(db_path=path)
+    try:
+        fixture = load_fixture(db)
+        rows = table_rows(db)
+        print(", ".join(f"{count} {name}" for name, count in rows.items()))
+        print(f"{'method':<84} {'p50 ms':>8} {'p95 ms':>8} {'stmts':>6}")
+        results: dict[str, CaseResult] = {}
+        for bench_case in cases:
+            result = run_case(db, bench_case, fixture, warmup=warmup, repeat=repeat)
+            results[bench_case.name] = result
+            print(
+                f"{bench_case.name[:84]:<84} {result.p50_ms:>8.2f} {result.p95_ms:>8.2f} "
+                f"{result.statements:>6}"
+            )
+    finally:
+        db.close()
+    return {
+        "rows": rows,
+        "cases": {name: vars(result) for name, result in results.items()},
+    }
+
+
+# -------------------------------------------------------------------------
+# RESULTS
+# -------------------------------------------------------------------------
+
+
+def git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def find_regressions(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    threshold: float,
+    min_ms: float,
+) -> list[str]:
+    """Cases slower or running more statements than in baseline, as messages."""
+    if baseline.get("format") != RESULTS_FORMAT:
+        raise ValueError("Baseline is not a bench_repositories result file.")
+    if baseline.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Unsupported baseline version {baseline.get('version')}.")
+    regressions = []
+    for size, measured in results["sizes"].items():
+        before = baseline["sizes"].get(size)
+        if before is None:
+            continue
+        for name, now in measured["cases"].items():
+            then = before["cases"].get(name)
+            if then is None:
+                continue
+            if (
+                now["p50_ms"] > then["p50_ms"] * threshold
+                and now["p50_ms"] - then["p50_ms"] >= min_ms
+            ):
+                regressions.append(
+                    f"{size} rows: {name} p50 {then['p50_ms']:.2f} ms -> "
+                    f"{now['p50_ms']:.2f} ms"
+                )
+            if now["statements"] > then["statements"]:
+                regressions.append(
+                    f"{size} rows: {name} statements {then['statements']} -> "
+                    f"{now['statements']}"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000],
+        help="Appointment requests per database, e.g. 10000 100000 1000000",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--seed-patients",
+        type=int,
+        default=1000,
+        help="Most patients to generate; bigger sizes copy them",
+    )
+    parser.add_argument("--data-dir", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", type=Path, default=None, help="Write results JSON")
+    parser.add_argument("--baseline", type=Path, default=None, help="Results JSON")
+    parser.add_argument(
+        "--threshold", type=float, default=1.5, help="Slowdown ratio that fails"
+    )
+    parser.add_argument(
+        "--min-ms", type=float, default=0.5, help="Smallest slowdown that fails"
+    )
+    args = parser.parse_args()
+
+    cases = build_cases(build_repos())
+    missing = uncovered_methods(cases)
+
+    results: dict[str, Any] = {
+        "format": RESULTS_FORMAT,
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "repeat": args.repeat,
+        "sizes": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir: Path = args.data_dir or Path(tmp)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        for size in args.sizes:
+            path = database_path(data_dir, size, args.seed)
+            if not path.exists():
+                print(f"[bench] Building {path.name}...")
+                build_database(path, size, args.seed, args.seed_patients)
+            print(f"\n{size} requests ({path.name})")
+            results["sizes"][str(size)] = run_size(
+                path, cases, warmup=args.warmup, repeat=args.repeat
+            )
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nWrote {args.output}")
+
+    regressions = []
+    if args.baseline is not None:
+        regressions = find_regressions(
+            results,
+            json.loads(args.baseline.read_text()),
+            threshold=args.threshold,
+            min_ms=args.min_ms,
+        )
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    for name in missing:
+        print(f"FAIL: no benchmark case for {name}")
+    return 1 if regressions or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Doctor utilisation analytics benchmark.
+
+Builds a synthetic year of bookings for a few hundred doctors, checks the
+vectorised report against a plain-Python recount on a sample, then times:
+
+    arrays  compute_utilisation on ready-made NumPy arrays
+    rows    compute_utilisation_from_rows on integer tuples, as fetched from the DB
+
+    python benchmarks/bench_utilisation.py [--doctors 300] [--per-day 10] [--budget-ms 1000]
+
+Exits with status 1 if the recount disagrees or rows takes over the budget.
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.analytics import (  # noqa: E402
+    compute_utilisation,
+    compute_utilisation_from_rows,
+)
+from app.analytics.utilisation import (  # noqa: E402
+    BOOKED_STATUSES,
+    MINUTES_PER_DAY,
+    WORKING_HOURS,
+    WORKING_WEEKDAYS,
+)
+
+FIRST_DAY = date(2025, 1, 1)
+LAST_DAY = date(2025, 12, 31)
+EPOCH = datetime(1970, 1, 1)
+SLOTS = 28  # half hours from 07:00 to 21:00
+
+
+def synthetic_rows(
+    doctors: int, per_day: int, seed: int
+) -> list[tuple[int, int, int, int]]:
+    """
+    per_day non-overlapping half-hour bookings per doctor per day between 07:00
+    and 21:00, mostly in working hours, as list_booking_rows returns them.
+    """
+    rng = np.random.default_rng(seed)
+    days = (LAST_DAY - FIRST_DAY).days + 1
+    slot_hours = np.arange(SLOTS) / 2 + 7
+    # Random sort keys biased towards working hours pick distinct slots
+    bias = np.where((slot_hours >= 9) & (slot_hours < 17), 0.0, 1.5)
+    keys = rng.random((doctors * days, SLOTS)) + bias
+    slots = np.argsort(keys, axis=1)[:, :per_day]
+
+    pair = np.repeat(np.arange(doctors * days), per_day)
+    doctor_ids = pair // days + 1
+    first_minute = (FIRST_DAY - date(1970, 1, 1)).days * MINUTES_PER_DAY
+    starts = (
+        first_minute + (pair % days) * MINUTES_PER_DAY + 7 * 60 + slots.ravel() * 30
+    )
+    status_ids = rng.choice([1, 2, 2, 2, 3, 4], len(pair))
+    return list(
+        zip(
+            doctor_ids.tolist(),
+            starts.tolist(),
+            (starts + 30).tolist(),
+            status_ids.tolist(),
+        )
+    )
+
+
+def naive_working_minutes(rows) -> dict[int, int]:
+    """Per-doctor booked minutes inside working hours, one appointment at a time."""
+    work_start, work_end = WORKING_HOURS
+    booked = {int(s) for s in BOOKED_STATUSES}
+    totals: dict[int, int] = defaultdict(int)
+    for doctor_id, start_minute, end_minute, status_id in rows:
+        start = EPOCH + timedelta(minutes=start_minute)
+        end = EPOCH + timedelta(minutes=end_minute)
+        if status_id not in booked or start.weekday() not in WORKING_WEEKDAYS:
+            continue
+        window_start = datetime.combine(start.date(), work_start)
+        window_end = datetime.combine(start.date(), work_end)
+        overlap = min(end, window_end) - max(start, window_start)
+        totals[doctor_id] += max(0, int(overlap.total_seconds() // 60))
+    return totals
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--doctors", type=int, default=300)
+    parser.add_argument("--per-day", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.doctors, args.per_day, args.seed)
+    print(f"{len(rows)} bookings, {args.doctors} doctors, {FIRST_DAY} to {LAST_DAY}")
+
+    failed = False
+    sample = rows[:20_000]
+    report = compute_utilisation_from_rows(sample, FIRST_DAY, LAST_DAY)
+    expected = naive_working_minutes(sample)
+    got = dict(
+        zip(report.doctor_profile_ids.tolist(), report.working_booked_minutes.tolist())
+    )
+    if any(got.get(doctor_id, 0) != minutes for doctor_id, minutes in expected.items()):
+        print("FAIL: vectorised working minutes differ from the plain recount.")
+        failed = True
+
+    doctor_ids, starts, ends, status_ids = np.array(rows, dtype=np.int64).T
+    starts = starts.astype("datetime64[m]")
+    ends = ends.astype("datetime64[m]")
+
+    started = time.perf_counter()
+    compute_utilisation(doctor_ids, starts, ends, status_ids, FIRST_DAY, LAST_DAY)
+    arrays_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    report = compute_utilisation_from_rows(rows, FIRST_DAY, LAST_DAY)
+    rows_ms = (time.perf_counter() - started) * 1000
+
+    print(f"arrays: {arrays_ms:8.1f} ms")
+    print(f"rows:   {rows_ms:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(
+        f"mean utilisation {report.utilisation.mean():.1%}, "
+        f"peak heatmap cell {report.heatmap_minutes.max() / 60:.0f} h"
+    )
+    if rows_ms > args.budget_ms:
+        print("FAIL: over the budget.")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
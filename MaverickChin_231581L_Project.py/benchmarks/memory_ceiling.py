@@ -0,0 +1,224 @@
+"""
+Memory ceiling check for page navigation.
+
+Seeds a throwaway SQLite database with the default users, gives "patient"
+--rows scheduled appointments with "doctor", each booked from an approved
+appointment request, then walks both users through the list and detail pages
+in a headless session, --rounds times, scrolling further into every list each
+round:
+
+    patient  appointments -> appointment
+             requests -> request -> linked appointment
+    doctor   appointments -> work on appointment -> manage prescription
+
+A PageMemoryTracker snapshots tracemalloc after every page transition. Fails
+if the memory retained after any transition is over --ceiling-mib, as happens
+when a page on the stack holds every row of a list instead of the page shown.
+
+    python benchmarks/memory_ceiling.py [--rows 20000] [--rounds 4] [--ceiling-mib 16]
+
+Exits with status 1 if the ceiling was exceeded or the session failed to run
+its script to the end.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.bootstrap import build_repos, build_services  # noqa: E402
+from app.core.headless import run_scripted_session  # noqa: E402
+from app.core.page_memory import PageMemoryTracker  # noqa: E402
+from app.database.engine import Database, SQLiteDatabase  # noqa: E402
+from app.database.models import (  # noqa: E402
+    Appointment,
+    AppointmentRequest,
+    Base,
+    Profile,
+    Specialty,
+    User,
+)
+from app.database.seed import seed_all  # noqa: E402
+from app.lookups.enums import (  # noqa: E402
+    AppointmentRequestStatusEnum,
+    AppointmentStatusEnum,
+    ProfileTypeEnum,
+)
+from app.pages.doctor.doctor_view_all_appointments_page import (  # noqa: E402
+    DoctorViewAllAppointmentsPage,
+)
+from app.pages.patient.patient_view_all_appointment_requests_page import (  # noqa: E402
+    PatientViewAllAppointmentRequestsPage,
+)
+from app.pages.patient.patient_view_all_appointments_page import (  # noqa: E402
+    PatientViewAllAppointmentsPage,
+)
+from app.ui.prompts import KeyAction  # noqa: E402
+from app.ui.scripted_prompts import ScriptAnswer  # noqa: E402
+from rich.console import Console  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+PASSWORD = "password"
+
+
+def profile_id(session, username: str, profile_type: ProfileTypeEnum) -> int:
+    return session.scalar(
+        select(Profile.profile_id)
+        .join(User, User.person_id == Profile.person_id)
+        .where(User.username == username, Profile.profile_type_id == profile_type)
+    )
+
+
+def add_history(db: Database, rows: int) -> None:
+    """Book rows appointments for patient with doctor, each from its own request."""
+    with db.session_scope() as session:
+        patient_id = profile_id(session, "patient", ProfileTypeEnum.PATIENT)
+        doctor_id = profile_id(session, "doctor", ProfileTypeEnum.DOCTOR)
+        receptionist_id = profile_id(
+            session, "receptionist", ProfileTypeEnum.RECEPTIONIST
+        )
+        specialty_id = session.scalar(select(Specialty.specialty_id).limit(1))
+        now = datetime.now().replace(second=0, microsecond=0)
+        first_slot = now.replace(minute=0) + timedelta(days=1)
+        appointment_ids = session.scalars(
+            insert(Appointment).returning(Appointment.appointment_id),
+            [
+                {
+                    "start_datetime": first_slot + timedelta(minutes=30 * i),
+                    "end_datetime": first_slot + timedelta(minutes=30 * i + 30),
+                    "patient_profile_id": patient_id,
+                    "doctor_profile_id": doctor_id,
+                    "specialty_id": specialty_id,
+                    "room_name": "A.01.001",
+                    "reason": f"Memory ceiling {i}",
+                    "appointment_status_id": AppointmentStatusEnum.SCHEDULED,
+                    "created_by_profile_id": receptionist_id,
+                    "created_datetime": now - timedelta(minutes=i),
+                }
+                for i in range(rows)
+            ],
+        ).all()
+        session.execute(
+            insert(AppointmentRequest),
+            [
+                {
+                    "patient_profile_id": patient_id,
+                    "specialty_id": specialty_id,
+                    "reason": f"Memory ceiling {i}",
+                    "created_datetime": now - timedelta(minutes=i, hours=1),
+                    "appointment_request_status_id": (
+                        AppointmentRequestStatusEnum.APPROVED
+                    ),
+                    "appointment_id": appointment_id,
+                    "handled_by_profile_id": receptionist_id,
+                    "handled_datetime": now - timedelta(minutes=i),
+                }
+                for i, appointment_id in enumerate(appointment_ids)
+            ],
+        )
+
+
+def login(profile: str, username: str) -> list[ScriptAnswer]:
+    return [profile, "Username", username, "Password", PASSWORD, "[Login]"]
+
+
+def scroll_and_pick(page_class, scrolls: int) -> list[ScriptAnswer]:
+    """Scroll a list page right, then pick the first row shown."""
+    row = scrolls * page_class.items_per_scroll + 1
+    return [*[KeyAction.RIGHT] * scrolls, f"No. {row}"]
+
+
+def navigation_script(rounds: int) -> list[ScriptAnswer]:
+    script: list[ScriptAnswer] = []
+    for round_index in range(rounds):
+        scrolls = round_index + 1
+        script += [
+            *login("Patient", "patient"),
+            "View all appointments",
+            *scroll_and_pick(PatientViewAllAppointmentsPage, scrolls),
+            "Back",
+            KeyAction.BACK,
+            "View all appointment requests",
+            *scroll_and_pick(PatientViewAllAppointmentRequestsPage, scrolls),
+            "View linked appointment",
+            "Back",
+            KeyAction.BACK,
+            KeyAction.BACK,
+            "Logout",
+            *login("Doctor", "doctor"),
+            "View all appointments",
+            *scroll_and_pick(DoctorViewAllAppointmentsPage, scrolls),
+            "Manage prescription",
+            KeyAction.BACK,
+            KeyAction.BACK,
+            KeyAction.BACK,
+            "Logout",
+        ]
+    script.append("Exit application")
+    return script
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=4)
+    parser.add_argument("--ceiling-mib", type=float, default=16.0)
+    parser.add_argument(
+        "--frames", type=int, default=64, help="Traceback depth per allocation"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = SQLiteDatabase(db_path=Path(tmp) / "memory_ceiling.db")
+        try:
+            Base.metadata.create_all(db.engine)
+            repos = build_repos()
+            services = build_services(repos)
+            seed_all(db, repos, services, seed=0)
+            add_history(db, args.rows)
+
+            tracker = PageMemoryTracker(frames=args.frames)
+            tracker.start()
+            started = time.perf_counter()
+            try:
+                report = run_scripted_session(
+                    db,
+                    repos,
+                    services,
+                    navigation_script(args.rounds),
+                    page_listeners=[tracker],
+                )
+            finally:
+                tracker.stop()
+            seconds = time.perf_counter() - started
+        finally:
+            db.close()
+
+    tracker.report(Console(width=160))
+    print(
+        f"\n{len(report.transitions)} transitions over {args.rows} rows "
+        f"in {seconds:.1f} s (with tracing)"
+    )
+
+    failed = False
+    if not report.ok:
+        reason = report.error or f"{report.unanswered} scripted answers left unused"
+        print(f"FAIL: session: {reason}")
+        failed = True
+    peak = tracker.peak
+    if peak is not None and peak.retained_bytes > args.ceiling_mib * 1024 * 1024:
+        print(
+            f"FAIL: {peak.retained_bytes / 1024 / 1024:.1f} MiB retained, over the "
+            f"{args.ceiling_mib:.0f} MiB ceiling."
+        )
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
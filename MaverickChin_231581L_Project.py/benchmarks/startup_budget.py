@@ -0,0 +1,129 @@
+"""
+Startup-time budget check.
+
+Starts a fresh interpreter with -X importtime, builds everything launch_app.py
+builds before the first prompt (imports, database, App, start page), and fails
+if that takes longer than the budget or if a module that should load lazily
+(seeding/Faker, NumPy, pyfiglet, pages past the start page) was imported.
+
+    python benchmarks/startup_budget.py [--budget-ms 1500] [--top 15]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Anything matching these must not be imported before the first prompt
+LAZY_MODULE_PREFIXES = (
+    "faker",
+    "numpy",
+    "pyfiglet",
+    "app.analytics",
+    "app.api",
+    "app.database.seed",
+    "app.database.async_engine",
+    "app.database.bulk_import",
+    "app.pages.admin",
+    "app.pages.doctor",
+    "app.pages.patient",
+    "app.pages.receptionist",
+    "app.pages.core.login_page",
+    "app.pages.core.create_user_account_page",
+)
+
+# launch_app parses sys.argv on import, so the database path goes via the env
+CHILD_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+import launch_app
+from app.core.app import App
+from app.core.bootstrap import build_repos, build_services
+from app.database.engine import SQLiteDatabase
+
+db = SQLiteDatabase(db_path=os.environ["STARTUP_BUDGET_DB"])
+repos = build_repos()
+app = App(db=db, repos=repos, services=build_services(repos))
+elapsed = time.perf_counter() - start
+db.close()
+print(json.dumps({"startup_s": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """Return (self_us, cumulative_us, module) for each -X importtime line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                CHILD_SCRIPT,
+            ],
+            cwd=PROJECT_ROOT,
+            env={**os.environ, "STARTUP_BUDGET_DB": str(Path(tmp) / "startup.db")},
+            capture_output=True,
+            text=True,
+        )
+    if result.returncode != 0:
+        print(result.stderr)
+        print("FAIL: startup script crashed.")
+        return 1
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    startup_ms = report["startup_s"] * 1000
+    imports = parse_importtime(result.stderr)
+    import_ms = sum(self_us for self_us, _, _ in imports) / 1000
+
+    print(
+        f"startup to first prompt: {startup_ms:.0f} ms "
+        f"(budget {args.budget_ms:.0f} ms)"
+    )
+    print(f"of which imports: {import_ms:.0f} ms across {len(imports)} modules")
+    print("\nslowest top-level imports (cumulative):")
+    top_level = [row for row in imports if "." not in row[2]]
+    top_level.sort(key=lambda row: row[1], reverse=True)
+    for _, cumulative_us, name in top_level[: args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    eager = [
+        name
+        for name in report["modules"]
+        if any(
+            name == prefix or name.startswith(prefix + ".")
+            for prefix in LAZY_MODULE_PREFIXES
+        )
+    ]
+    if eager:
+        print(f"\nFAIL: imported before the first prompt: {', '.join(eager)}")
+        failed = True
+    if startup_ms > args.budget_ms:
+        print(f"\nFAIL: startup took {startup_ms:.0f} ms, over the budget.")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,37 +3,15 @@ import sys
 import traceback
 from pathlib import Path
 
-from app.core.app import App, Repos, Services
+from app.cli import register_commands
+from app.core.app import App
+from app.core.bootstrap import build_repos, build_services
+from app.core.maintenance import MaintenanceScheduler
 from app.database.engine import MySQLDatabase, SQLiteDatabase
-from app.database.models import (
-    AdminProfile,
-    Base,
-    Medication,
-    Profile,
-    ReceptionistProfile,
-    Specialty,
-)
-from app.database.seed import seed_all, seed_all_with_random_users
-from app.repositories import (
-    AppointmentRepository,
-    AppointmentRequestRepository,
-    BaseRepository,
-    DoctorProfileRepository,
-    PatientProfileRepository,
-    PersonRepository,
-    PrescriptionRepository,
-    UserRepository,
-)
-from app.services import (
-    AppointmentService,
-    DoctorService,
-    PatientService,
-    PersonService,
-    SecurityService,
-    UserService,
-)
+from app.database.models import Base
 
 SQLITE_DB_PATH = (Path(sys.argv[0]).parent / "app.db").resolve()
+PROFILE_DIR = (Path(sys.argv[0]).parent / "profiles").resolve()
 MY_SQL_SCHEMA_NAME = "nyp_hms"
 SEEDING_NUMBER = 10
 
@@ -45,6 +23,38 @@ parser.add_argument("--reset", action="store_true")
 parser.add_argument("--no-seed", action="store_true")
 parser.add_argument("--seed", action="store_true")
 parser.add_argument("--seed-random-users", action="store_true")
+parser.add_argument(
+    "--maintenance",
+    action="store_true",
+    help="Mark past appointments missed, expire past requests and archive old ones "
+    "in the background",
+)
+parser.add_argument(
+    "--profile",
+    nargs="?",
+    const=PROFILE_DIR,
+    type=Path,
+    metavar="DIR",
+    help="Write a cProfile .prof file per page visit to DIR (default: profiles/ "
+    "next to the app) and print a summary on exit",
+)
+parser.add_argument(
+    "--trace-memory",
+    action="store_true",
+    help="Snapshot memory with tracemalloc after every page transition and print "
+    "what was retained, by page and allocation site, on exit",
+)
+parser.add_argument(
+    "--call-log",
+    type=Path,
+    metavar="FILE",
+    help="Append a JSON line per repository and service call to FILE; summarise "
+    "it with the calls command",
+)
+# Subcommands that only read files set needs_database=False
+parser.set_defaults(needs_database=True)
+subparsers = parser.add_subparsers(dest="command")
+register_commands(subparsers)
 
 args = parser.parse_args()
 mysql: bool = args.mysql
@@ -65,18 +75,56 @@ OVERRIDE_RESET = None
 OVERRIDE_SEED_TYPE = None
 
 
-def main():
+def select_db_type() -> str:
+    if OVERRIDE_DB_TYPE:
+        print("[app] OVERRIDE_DB_TYPE set to MySQL.")
+        return OVERRIDE_DB_TYPE
+    elif mysql:
+        return "mysql"
+    elif sqlite:
+        return "sqlite"
+    print("[app] --sqlite / --mysql was not provided. Defaulting to MySQL.")
+    return "mysql"
+
+
+def run_command() -> int:
+    """
+    Run a CLI subcommand against the existing database (no reset, no seeding),
+    or with no database at all if it was registered with needs_database=False.
+    Commands run unattended, e.g. from cron: an error is printed to stderr and
+    exits non-zero instead of waiting for ENTER.
+    """
     try:
-        if OVERRIDE_DB_TYPE:
-            db_type = OVERRIDE_DB_TYPE
-            print("[app] OVERRIDE_DB_TYPE set to MySQL.")
-        elif mysql:
-            db_type = "mysql"
-        elif sqlite:
-            db_type = "sqlite"
+        if not args.needs_database:
+            return args.handler(args)
+
+        db_type = select_db_type()
+        if db_type == "sqlite":
+            db = SQLiteDatabase(db_path=SQLITE_DB_PATH)
+        elif db_type == "mysql":
+            db = MySQLDatabase(password="!password", database=MY_SQL_SCHEMA_NAME)
         else:
-            print("[app] --sqlite / --mysql was not provided. Defaulting to MySQL.")
-            db_type = "mysql"
+            raise Exception("db_type was set to an invalid value.")
+
+        try:
+            Base.metadata.create_all(db.engine)
+            repos = build_repos()
+            services = build_services(repos)
+            return args.handler(args, db, repos, services)
+        finally:
+            db.close()
+    except Exception as e:
+        print(f"[{args.command}] Failed: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return 1
+
+
+def main():
+    if args.command:
+        return run_command()
+
+    try:
+        db_type = select_db_type()
 
         if OVERRIDE_RESET:
             perform_reset = OVERRIDE_RESET
@@ -115,84 +163,56 @@ def main():
         else:
             raise Exception("db_type was set to an invalid value.")
 
-        # Repositories
-        user_repo = UserRepository()
-        person_repo = PersonRepository()
-        profile_repo = BaseRepository(Profile)
-        patient_profile_repo = PatientProfileRepository()
-        doctor_profile_repo = DoctorProfileRepository()
-        receptionist_profile_repo = BaseRepository(ReceptionistProfile)
-        admin_profile_repo = BaseRepository(AdminProfile)
-        specialty_repo = BaseRepository(Specialty)
-        appointment_request = AppointmentRequestRepository()
-        appointment_repo = AppointmentRepository()
-        prescription_repo = PrescriptionRepository()
-        medication_repo = BaseRepository(Medication)
-
-        repos = Repos(
-            user=user_repo,
-            person=person_repo,
-            profile=profile_repo,
-            patient_profile=patient_profile_repo,
-            doctor_profile=doctor_profile_repo,
-            receptionist_profile=receptionist_profile_repo,
-            admin_profile=admin_profile_repo,
-            specialty=specialty_repo,
-            appointment_request=appointment_request,
-            appointment=appointment_repo,
-            prescription=prescription_repo,
-            medication=medication_repo,
-        )
-
-        # Services
-        security_service = SecurityService()
-        user_service = UserService(
-            user_repo=user_repo,
-            person_repo=person_repo,
-            security_service=security_service,
-        )
-        person_service = PersonService(person_repo=person_repo, user_repo=user_repo)
-        patient_service = PatientService(
-            patient_profile_repo=patient_profile_repo,
-            profile_repo=profile_repo,
-            person_repo=person_repo,
-        )
-        doctor_service = DoctorService(
-            doctor_profile_repo=doctor_profile_repo,
-            profile_repo=profile_repo,
-            person_repo=person_repo,
-        )
-        appointment_service = AppointmentService(
-            appointment_repo=appointment_repo,
-            appointment_request_repo=appointment_request,
-            profile_repo=profile_repo,
-            patient_profile_repo=patient_profile_repo,
-            doctor_profile_repo=doctor_profile_repo,
-            receptionist_profile_repo=receptionist_profile_repo,
-            user_repo=user_repo,
-            person_repo=person_repo,
-            prescription_repo=prescription_repo,
-        )
-
-        services = Services(
-            security=security_service,
-            user=user_service,
-            person=person_service,
-            patient=patient_service,
-            doctor=doctor_service,
-            appointment=appointment_service,
-        )
+        repos = build_repos()
+        services = build_services(repos)
 
+        # Seed modules pull in Faker, so only import them when seeding
         if seed_type == "seed_random_users":
+            from app.database.seed import seed_all_with_random_users
+
             seed_all_with_random_users(db, repos, services, SEEDING_NUMBER)
         elif seed_type == "seed":
+            from app.database.seed import seed_all
+
             seed_all(db, repos, services, SEEDING_NUMBER)
         elif seed_type == "no_seed":
             pass
         else:
             raise Exception("seed_type was set to an invalid value.")
 
-        app = App(db=db, repos=repos, services=services)
+        maintenance = None
+        if args.maintenance:
+            maintenance = MaintenanceScheduler(db.session_scope, services)
+
+        call_log = None
+        if args.call_log is not None:
+            from app.core.call_log import CallLog
+
+            call_log = CallLog(args.call_log)
+            call_log.bind(db.engine)
+            call_log.instrument(repos, services)
+
+        profiler = None
+        if args.profile is not None:
+            # cProfile and pstats are only needed when profiling
+            from app.core.page_profiler import PageProfiler
+
+            profiler = PageProfiler(args.profile)
+
+        app = App(
+            db=db,
+            repos=repos,
+            services=services,
+            maintenance=maintenance,
+            profiler=profiler,
+        )
+
+        memory = None
+        if args.trace_memory:
+            from app.core.page_memory import PageMemoryTracker
+
+            memory = PageMemoryTracker()
+            app.add_page_listener(memory)
 
     except Exception as e:
         print(f"Unhandled exception during app startup: {e}")
@@ -201,13 +221,21 @@ def main():
         return
 
     try:
+        if memory is not None:
+            memory.start()
         app.run()
     except Exception as e:
         print(f"Unhandled exception during app runtime: {e}")
         traceback.print_exc()
         input("Press ENTER to exit.")
         return
+    finally:
+        if memory is not None:
+            memory.report(app.console)
+            memory.stop()
+        if call_log is not None:
+            call_log.close()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())